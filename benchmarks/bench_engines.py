@@ -0,0 +1,89 @@
+import argparse
+import os
+import time
+from functools import partial
+
+from core.logic.sudoku_solver import STRATEGY_BITMASK, STRATEGY_DLX, SudokuSolver
+from core.logic.units import board_layout
+from puzzles.io import read_puzzles
+from utils.board_codec import decode_board
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus", "reference.txt")
+
+ENGINES = {
+    "candidates": SudokuSolver._solve_with_candidates,
+    STRATEGY_BITMASK: partial(SudokuSolver.solve, strategy=STRATEGY_BITMASK),
+    STRATEGY_DLX: partial(SudokuSolver.solve, strategy=STRATEGY_DLX),
+}
+
+
+def load_corpus(path):
+    """
+    Load a corpus stored one puzzle per line.
+    :param path: Path to the corpus file.
+    :return: List of 2D boards.
+    """
+    return [decode_board(puzzle) for puzzle in read_puzzles(path)]
+
+
+def is_complete_solution(board):
+    """
+    Check that every row, column and box of a board holds the digits 1-N.
+    :param board: 2D list representing the Sudoku board.
+    :return: True if the board is a full, valid solution.
+    """
+    layout = board_layout(len(board))
+    digits = set(range(1, layout.size + 1))
+    cells = [value for row in board for value in row]
+    return all({cells[cell] for cell in unit} == digits for unit in layout.units)
+
+
+def run_engine(solve, puzzles, repeat):
+    """
+    Time an engine over the corpus.
+    :param solve: Solve function taking a 2D board and filling it in place.
+    :param puzzles: List of 2D boards.
+    :param repeat: Number of passes over the corpus.
+    :return: Tuple (per-puzzle best times in seconds, number of correctly solved puzzles, solved boards).
+    """
+    best_times = [float("inf")] * len(puzzles)
+    solved = 0
+    boards = []
+    for _ in range(repeat):
+        solved = 0
+        boards = []
+        for index, puzzle in enumerate(puzzles):
+            board = [row[:] for row in puzzle]
+            start = time.perf_counter()
+            solve(board)
+            best_times[index] = min(best_times[index], time.perf_counter() - start)
+            solved += is_complete_solution(board)
+            boards.append(board)
+    return best_times, solved, boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Sudoku solver engines on a fixed corpus.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Puzzle file, one puzzle per line.")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus; the best time is kept.")
+    args = parser.parse_args()
+
+    puzzles = load_corpus(args.corpus)
+    print(f"{len(puzzles)} puzzles from {args.corpus}")
+    print(f"{'engine':<12}{'solved':>8}{'matches':>9}{'total ms':>12}{'mean ms':>10}{'max ms':>10}")
+    reference = None
+    for name, solve in ENGINES.items():
+        times, solved, boards = run_engine(solve, puzzles, args.repeat)
+        if name == STRATEGY_BITMASK:
+            reference = boards
+        # Solutions are compared against the default backend; the corpus puzzles are all unique.
+        matches = sum(board == expected for board, expected in zip(boards, reference)) if reference else "-"
+        total = sum(times) * 1000
+        print(
+            f"{name:<12}{solved:>5}/{len(puzzles):<2}{matches:>9}{total:>12.2f}"
+            f"{total / len(puzzles):>10.2f}{max(times) * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
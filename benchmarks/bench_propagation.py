@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from benchmarks.bench_engines import DEFAULT_CORPUS, is_complete_solution, load_corpus
+from core.logic.bitmask_engine import BitmaskEngine
+from core.logic.propagation import ALL_TECHNIQUES, Propagator
+
+# Each configuration adds one technique to the previous one, so the table shows
+# what every technique contributes on its own.
+CONFIGURATIONS = [ALL_TECHNIQUES[:count] for count in range(len(ALL_TECHNIQUES) + 1)]
+
+
+def run_configuration(techniques, puzzles, repeat):
+    """
+    Solve the corpus with a given set of propagation techniques.
+    :param techniques: Tuple of technique names (empty for plain backtracking).
+    :param puzzles: List of 2D boards.
+    :param repeat: Number of passes over the corpus; the best time is kept.
+    :return: Tuple (total nodes, best total time in seconds, number of correctly solved puzzles).
+    """
+    best_time = float("inf")
+    nodes = solved = 0
+    for _ in range(repeat):
+        nodes = solved = 0
+        start = time.perf_counter()
+        for puzzle in puzzles:
+            engine = BitmaskEngine(puzzle, Propagator(techniques) if techniques else None)
+            engine.solve()
+            nodes += engine.nodes
+            board = [row[:] for row in puzzle]
+            engine.write_to(board)
+            solved += is_complete_solution(board)
+        best_time = min(best_time, time.perf_counter() - start)
+    return nodes, best_time, solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the effect of each propagation technique.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Puzzle file, one puzzle per line.")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus; the best time is kept.")
+    args = parser.parse_args()
+
+    puzzles = load_corpus(args.corpus)
+    print(f"{len(puzzles)} puzzles from {args.corpus}")
+    print(f"{'techniques':<58}{'solved':>8}{'nodes':>10}{'total ms':>12}")
+    for techniques in CONFIGURATIONS:
+        nodes, elapsed, solved = run_configuration(techniques, puzzles, args.repeat)
+        label = " + ".join(techniques) or "none"
+        print(f"{label:<58}{solved:>5}/{len(puzzles):<2}{nodes:>10}{elapsed * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import itertools
+import math
+import os
+import sys
+import time
+
+from benchmarks.bench_suite import CORPUS_DIR
+from config.settings import SERVICE_BATCH_SIZE, SERVICE_MAX_IN_FLIGHT
+from puzzles.io import read_puzzles
+from use_cases.solve_service import GENERATE, OPERATIONS, SOLVE, ServiceClient, ServiceError, SolveService
+
+DEFAULT_CORPUS = os.path.join(CORPUS_DIR, "hard.txt")
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def percentile(values, point):
+    """Nearest-rank percentile of a sorted list."""
+    return values[max(math.ceil(point / 100 * len(values)) - 1, 0)]
+
+
+async def run_load(connect, operation, puzzles, requests, connections, depth):
+    """
+    Send ``requests`` requests over ``connections`` connections, each keeping ``depth`` of them in flight.
+    :param connect: Coroutine function returning a connected ServiceClient.
+    :param operation: Operation to request.
+    :param puzzles: Puzzle strings, cycled through (ignored by "generate").
+    :return: Tuple (elapsed seconds, list of latencies in seconds, number of errors).
+    """
+    clients = [await connect() for _ in range(connections)]
+    sequence = itertools.cycle(puzzles)
+    remaining = itertools.count(requests, -1)
+    latencies = []
+    errors = 0
+
+    async def one_stream(client):
+        nonlocal errors
+        while next(remaining) > 0:
+            params = {} if operation == GENERATE else {"puzzle": next(sequence)}
+            start = time.perf_counter()
+            try:
+                await client.request(operation, **params)
+            except ServiceError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_stream(client) for client in clients for _ in range(depth)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return elapsed, latencies, errors
+
+
+async def main_async(args):
+    service = None
+    if args.unix:
+        connect = lambda: ServiceClient.connect_unix(args.unix)
+        target = args.unix
+    elif args.port is not None:
+        connect = lambda: ServiceClient.connect(args.host, args.port)
+        target = f"{args.host}:{args.port}"
+    else:
+        service = SolveService(args.workers, args.batch_size, args.max_in_flight)
+        host, port = await service.start_tcp("127.0.0.1", 0)
+        connect = lambda: ServiceClient.connect(host, port)
+        target = f"local instance on {host}:{port}, {service.workers} workers"
+
+    try:
+        puzzles = list(read_puzzles(args.corpus))
+        # One untimed round trip per worker, so process start-up is not measured.
+        await run_load(connect, args.op, puzzles, args.connections, args.connections, 1)
+        elapsed, latencies, errors = await run_load(
+            connect, args.op, puzzles, args.requests, args.connections, args.depth
+        )
+    finally:
+        if service is not None:
+            await service.close()
+
+    latencies.sort()
+    print(f"{args.op} x {len(latencies)} against {target}: {args.connections} connections x {args.depth} in flight")
+    print(f"throughput {len(latencies) / elapsed:10.1f} requests/s  ({elapsed:.2f} s, {errors} errors)")
+    print("latency ms " + "  ".join(
+        f"p{point:g} {percentile(latencies, point) * 1000:.2f}" for point in PERCENTILES
+    ) + f"  max {latencies[-1] * 1000:.2f}")
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the JSON solve service and report throughput and tail latency.")
+    parser.add_argument("--host", default="127.0.0.1", help="Service host (with --port).")
+    parser.add_argument("--port", type=int, help="Service port; without it (or --unix) a local instance is started.")
+    parser.add_argument("--unix", help="Service Unix socket path.")
+    parser.add_argument("--op", choices=OPERATIONS, default=SOLVE, help="Operation to request.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Puzzle file, one puzzle per line.")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Requests to send.")
+    parser.add_argument("-c", "--connections", type=int, default=8, help="Concurrent connections.")
+    parser.add_argument("-d", "--depth", type=int, default=8, help="Requests in flight per connection.")
+    parser.add_argument("--workers", type=int, help="Worker processes of the local instance (default: one per CPU).")
+    parser.add_argument("--batch-size", type=int, default=SERVICE_BATCH_SIZE, help="Batch size of the local instance.")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=SERVICE_MAX_IN_FLIGHT, help="In-flight limit of the local instance."
+    )
+    return asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
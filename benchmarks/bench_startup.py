@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from config.settings import STARTUP_BUDGET_MS
+
+HEADLESS_MODULES = ("core.logic.sudoku_solver", "use_cases.sudoku_generator", "use_cases.batch_solver", "puzzles.io")
+GUI_MODULES = ("pygame", "tkinter", "_tkinter")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so nothing is already imported.
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_seconds": elapsed,
+    "gui_modules": sorted(name for name in {gui!r} if name in sys.modules),
+}}))
+"""
+
+
+def measure_startup(modules=HEADLESS_MODULES):
+    """
+    Import the headless modules in a fresh interpreter and time it.
+    :param modules: Module names to import.
+    :return: Dict with "import_seconds" and the list of "gui_modules" that were loaded.
+    """
+    probe = _PROBE.format(modules=tuple(modules), gui=GUI_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def check_startup(max_seconds, repeat=3):
+    """
+    Measure headless startup and check it against the budget.
+    :param max_seconds: Maximum accepted import time in seconds.
+    :param repeat: Number of fresh interpreters; the fastest run is kept.
+    :return: Tuple (fastest import time in seconds, list of problems found).
+    """
+    runs = [measure_startup() for _ in range(repeat)]
+    fastest = min(run["import_seconds"] for run in runs)
+    problems = []
+    loaded = sorted({name for run in runs for name in run["gui_modules"]})
+    if loaded:
+        problems.append(f"headless import loaded GUI modules: {', '.join(loaded)}")
+    if fastest > max_seconds:
+        problems.append(f"import took {fastest * 1000:.1f} ms, budget is {max_seconds * 1000:.1f} ms")
+    return fastest, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure headless import time of the solver and generator.")
+    parser.add_argument("--max-ms", type=float, default=STARTUP_BUDGET_MS, help="Fail if importing takes longer than this.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to try; the fastest is kept.")
+    args = parser.parse_args(argv)
+
+    fastest, problems = check_startup(args.max_ms / 1000, args.repeat)
+    print(f"headless import: {fastest * 1000:.1f} ms ({', '.join(HEADLESS_MODULES)})")
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
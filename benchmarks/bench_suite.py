@@ -0,0 +1,208 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_engines import is_complete_solution, load_corpus
+from config.settings import BLANK_COUNT, BOARD_SIZE, WINDOW_WIDTH
+from core.logic.sudoku_solver import STRATEGIES, SudokuSolver
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+CORPORA = ("easy", "hard", "pathological", "min17", "16x16")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+GENERATE_COUNT = 20
+GENERATE_SEED = 2024
+
+# Metrics where a larger value is a regression; throughput regresses when it drops.
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "peak_kib")
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def _solve_case(puzzles, strategy):
+    def run(puzzle):
+        board = [row[:] for row in puzzle]
+        SudokuSolver.solve(board, strategy=strategy)
+        if not is_complete_solution(board):
+            raise RuntimeError(f"{strategy} left a corpus puzzle unsolved.")
+    return puzzles, run
+
+
+def _generate_case(count, seeded=False):
+    from use_cases.sudoku_generator import SudokuGenerator, load_seed_puzzles
+
+    generator = SudokuGenerator(BOARD_SIZE, BLANK_COUNT, seeds=load_seed_puzzles() if seeded else None)
+    random.seed(GENERATE_SEED)
+    return range(count), lambda _: generator.generate_board()
+
+
+def _grade_case(puzzles):
+    from core.logic.grader import Grader
+
+    grader = Grader()
+    return puzzles, grader.grade
+
+
+def _grid_case(puzzles):
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from core.entities.grid import Grid
+    from core.logic.solution_cache import DEFAULT_CACHE
+
+    def run(puzzle):
+        # Grid solves through the shared cache; start cold so every build pays for its solve.
+        DEFAULT_CACHE.clear()
+        # The grid never draws while it is built, so no display surface is needed.
+        Grid(BOARD_SIZE, BOARD_SIZE, WINDOW_WIDTH, WINDOW_WIDTH, [row[:] for row in puzzle], None)
+    return puzzles, run
+
+
+def build_cases(strategies):
+    """
+    Describe every benchmark case without running it.
+    :param strategies: Solver backends to time on each corpus.
+    :return: Dict of case name to a zero-argument factory returning (items, run), where
+        ``run(item)`` does one timed unit of work.
+    """
+    cases = {}
+    for corpus in CORPORA:
+        path = os.path.join(CORPUS_DIR, f"{corpus}.txt")
+        for strategy in strategies:
+            cases[f"solve/{corpus}/{strategy}"] = (
+                lambda path=path, strategy=strategy: _solve_case(load_corpus(path), strategy)
+            )
+    cases["generate"] = lambda: _generate_case(GENERATE_COUNT)
+    cases["generate/seeds"] = lambda: _generate_case(GENERATE_COUNT * 100, seeded=True)
+    for corpus in ("easy", "hard"):
+        path = os.path.join(CORPUS_DIR, f"{corpus}.txt")
+        cases[f"grade/{corpus}"] = lambda path=path: _grade_case(load_corpus(path))
+    cases["grid"] = lambda: _grid_case(load_corpus(os.path.join(CORPUS_DIR, "easy.txt")))
+    return cases
+
+
+def _percentile(values, point):
+    """Nearest-rank percentile of a sorted list."""
+    return values[max(math.ceil(point / 100 * len(values)) - 1, 0)]
+
+
+def run_case(factory, repeat):
+    """
+    Time one case and measure its peak memory.
+    :param factory: Case factory from build_cases.
+    :param repeat: Timed passes; each item keeps its best time.
+    :return: Dict with "items", "throughput" (items/s), "p50_ms", "p99_ms" and "peak_kib".
+    """
+    items, run = factory()
+    items = list(items)
+    # An untimed pass first, so one-off caches and imports are not billed to the first item.
+    for item in items:
+        run(item)
+    best = [float("inf")] * len(items)
+    for _ in range(repeat):
+        for index, item in enumerate(items):
+            start = time.perf_counter()
+            run(item)
+            best[index] = min(best[index], time.perf_counter() - start)
+
+    # Tracing allocations slows everything down, so memory gets its own untimed pass.
+    items, run = factory()
+    tracemalloc.start()
+    try:
+        for item in items:
+            run(item)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    times = sorted(best)
+    return {
+        "items": len(times),
+        "throughput": len(times) / sum(times),
+        "p50_ms": _percentile(times, 50) * 1000,
+        "p99_ms": _percentile(times, 99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+    :param results: Dict of case name to metrics from run_case.
+    :param baseline: Dict of case name to metrics, as saved by a previous run.
+    :param threshold: Accepted relative slowdown, e.g. 0.25 for 25%.
+    :return: List of regression descriptions (empty if none).
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if metrics[metric] > expected[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {metrics[metric]:.4g} vs baseline {expected[metric]:.4g}")
+        for metric in HIGHER_IS_BETTER:
+            if metrics[metric] < expected[metric] / (1 + threshold):
+                regressions.append(f"{name}: {metric} {metrics[metric]:.4g} vs baseline {expected[metric]:.4g}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the solver, generator and grid on the checked-in corpora.")
+    parser.add_argument("--strategy", choices=STRATEGIES, action="append", help="Solver backends (default: all).")
+    parser.add_argument("--case", action="append", help="Only run cases whose name starts with this prefix.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; each item keeps its best time.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's results as the new baseline.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Accepted relative regression (default: 0.25)."
+    )
+    parser.add_argument("--json", help="Also write this run's results to this file.")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.strategy or STRATEGIES)
+    if args.case:
+        cases = {name: case for name, case in cases.items() if name.startswith(tuple(args.case))}
+
+    print(f"{'case':<30}{'items':>6}{'items/s':>11}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+    results = {}
+    for name, factory in cases.items():
+        metrics = results[name] = run_case(factory, args.repeat)
+        print(
+            f"{name:<30}{metrics['items']:>6}{metrics['throughput']:>11.1f}{metrics['p50_ms']:>10.3f}"
+            f"{metrics['p99_ms']:>10.3f}{metrics['peak_kib']:>11.1f}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["cases"]
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import argparse
+import os
+import time
+
+from benchmarks.bench_suite import CORPUS_DIR
+from core.logic.sudoku_solver import SudokuSolver
+from core.logic.vectorized import boards_from_strings, candidate_masks, validate_boards
+from puzzles.io import read_puzzles
+from utils.board_codec import decode_board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-board validation with the NumPy batch validator.")
+    parser.add_argument("--corpus", default=os.path.join(CORPUS_DIR, "easy.txt"), help="Puzzle file to replicate.")
+    parser.add_argument("--boards", type=int, default=100_000, help="Batch size.")
+    args = parser.parse_args()
+
+    corpus = list(read_puzzles(args.corpus))
+    puzzles = (corpus * (args.boards // len(corpus) + 1))[:args.boards]
+
+    start = time.perf_counter()
+    boards = boards_from_strings(puzzles)
+    decoded = time.perf_counter()
+    vectorized = validate_boards(boards)
+    validated = time.perf_counter()
+    candidate_masks(boards)
+    candidates = time.perf_counter()
+
+    sample = [decode_board(puzzle) for puzzle in puzzles[:min(len(puzzles), 10_000)]]
+    loop_start = time.perf_counter()
+    expected = [SudokuSolver.is_valid_sudoku(board) for board in sample]
+    loop_seconds = time.perf_counter() - loop_start
+
+    print(f"{len(puzzles)} boards from {args.corpus}")
+    print(f"decode           {(decoded - start) * 1000:10.1f} ms")
+    print(f"validate         {(validated - decoded) * 1000:10.1f} ms  {len(puzzles) / (validated - decoded):12.0f} boards/s")
+    print(f"candidates       {(candidates - validated) * 1000:10.1f} ms  {len(puzzles) / (candidates - validated):12.0f} boards/s")
+    print(f"is_valid_sudoku  {'':>10}     {len(sample) / loop_seconds:12.0f} boards/s")
+    print(f"results match: {list(vectorized[:len(sample)]) == expected}")
+
+
+if __name__ == "__main__":
+    main()
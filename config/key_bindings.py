@@ -0,0 +1,13 @@
+import pygame
+
+RESET_KEY = pygame.K_r
+SOLVE_KEY = pygame.K_SPACE
+HINT_KEY = pygame.K_h
+QUIT_EVENT = pygame.QUIT
+PLAY_AGAIN_YES = pygame.K_y
+PLAY_AGAIN_NO = pygame.K_n
+PAUSE_KEY = pygame.K_p
+FASTER_KEY = pygame.K_EQUALS
+SLOWER_KEY = pygame.K_MINUS
+ABORT_KEY = pygame.K_ESCAPE
+FRAME_STATS_KEY = pygame.K_F3
\ No newline at end of file
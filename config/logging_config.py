@@ -1,6 +1,12 @@
 import logging
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
\ No newline at end of file
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(level=logging.INFO):
+    """
+    Configure the root logger for an application entry point.
+    Library modules only create named loggers, so importing them never changes logging.
+    :param level: Root logging level.
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
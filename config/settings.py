@@ -1,7 +1,5 @@
-import pygame
-
 WINDOW_WIDTH = 550
-WINDOW_HEIGHT = 600
+WINDOW_HEIGHT = 625
 CELL_SIZE = 60
 
 BOARD_SIZE = 9
@@ -10,6 +8,52 @@ FONT_NAME = "Arial"
 FONT_SIZE = 30
 PLAY_AGAIN_FONT_SIZE = 46
 VISUALIZATION_DELAY_MS = 100
+# The live solver shows one change per VISUALIZATION_DELAY_MS at first; speed keys scale it.
+LIVE_SOLVE_FRAME_BUDGET_MS = 8
+LIVE_SOLVE_SPEED_FACTOR = 2
+LIVE_SOLVE_MAX_STEPS_PER_SECOND = 10000
+FPS_CAP = 60
+HINT_FRAME_BUDGET_MS = 4
+FRAME_STATS_WINDOW_SECONDS = 1.0
+SOLVER_STRATEGY = "bitmask"
+COUNT_STRATEGY = "dlx"
+# Most time importing the headless solver and generator may take.
+STARTUP_BUDGET_MS = 250.0
+GENERATOR_MAX_ATTEMPTS = 50
+# Blank/clue swaps tried per attempt to move a puzzle into a requested difficulty band.
+GENERATOR_STEER_MOVES = 60
+BATCH_CHUNKSIZE = 64
+BATCH_PENDING_CHUNKS_PER_WORKER = 2
+VECTORIZED_CHUNK_BOARDS = 65536
+CANONICAL_BEAM_LIMIT = 4096
+SOLUTION_CACHE_SIZE = 1024
+PROPAGATION_TECHNIQUES = ("naked_singles", "hidden_singles")
+# Difficulty name and the highest grader rating it covers, easiest first.
+DIFFICULTY_BANDS = (("easy", 2.3), ("medium", 2.8), ("hard", 5.4), ("expert", 7.0), ("extreme", 10.0))
+# 9x9 blanks count the generator reaches each band with quickly, used when none is given.
+DIFFICULTY_BLANKS = {"easy": 40, "medium": 48, "hard": 50, "expert": 52, "extreme": 56}
+GAME_DIFFICULTY = "easy"
+# Blanks per difficulty kept ready by the puzzle pool, and how many of each.
+PUZZLE_POOL_BLANKS = {GAME_DIFFICULTY: BLANK_COUNT}
+PUZZLE_POOL_CAPACITY = 5
+# Failed generations in a row after which the pool stops refilling a difficulty.
+PUZZLE_POOL_MAX_FAILURES = 3
+PUZZLE_POOL_PATH = "~/.sudoku_puzzle_pool.txt"
+PUZZLE_STORE_PATH = "~/.sudoku_puzzles.sqlite3"
+# Puzzles analyzed and written per transaction by a bulk import.
+PUZZLE_STORE_BATCH = 500
+# Stored puzzles drawn for a new game when the pool has none ready (others may be another size).
+STARTUP_STORE_SAMPLE = 4
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+# Requests sent to a worker process at once while all workers are busy.
+SERVICE_BATCH_SIZE = 32
+SERVICE_MAX_IN_FLIGHT = 256
+SERVICE_MAX_LINE_BYTES = 65536
+# Largest solution count a count request may ask for; counting stops there.
+SERVICE_MAX_COUNT_LIMIT = 1000
+# Board sizes the service generates; 25x25 takes seconds per puzzle.
+SERVICE_GENERATE_SIZES = (4, 9, 16)
 
 COLOR_GRAY = (128, 128, 128)
 COLOR_BLACK = (0, 0, 0)
@@ -20,6 +64,10 @@ COLOR_GREEN = (0, 255, 0)
 
 TIME_TEXT_POSITION = (380, 560)
 STRIKES_TEXT_POSITION = (20, 560)
+FRAME_STATS_POSITION = (110, 568)
+FRAME_STATS_FONT_SIZE = 14
+HINT_TEXT_POSITION = (20, 600)
+HINT_FONT_SIZE = 16
 TK_TOPMOST_ATTRIBUTE = "-topmost"
 
 CELL_BORDER_WIDTH = 3
@@ -27,12 +75,7 @@ CELL_BORDER_WIDTH = 3
 MUSIC_PATH = "resources/music.mp3"
 CLICK_SOUND_PATH = "resources/click.wav"
 CORRECT_SOUND_PATH = "resources/correct.wav"
+SEED_PUZZLES_PATH = "resources/seed_puzzles.txt"
 
 GAME_BANNER = "Sudoku Solver: by Arian"
-PLAY_AGAIN_MESSAGE = "Play again? (Y/N)"
-
-RESET_KEY = pygame.K_r
-SOLVE_KEY = pygame.K_SPACE
-QUIT_EVENT = pygame.QUIT
-PLAY_AGAIN_YES = pygame.K_y
-PLAY_AGAIN_NO = pygame.K_n
\ No newline at end of file
+PLAY_AGAIN_MESSAGE = "Play again? (Y/N)"
\ No newline at end of file
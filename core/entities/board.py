@@ -0,0 +1,159 @@
+from core.logic.units import board_layout
+from utils.board_codec import BLANK_CHARACTERS, DIGIT_SYMBOLS, ENCODED_LENGTHS
+
+_INVALID = 255
+# Byte translation tables between the string form and cell values.
+_DECODE_TABLE = bytearray([_INVALID]) * 256
+for _value, _symbol in enumerate(DIGIT_SYMBOLS, 1):
+    _DECODE_TABLE[ord(_symbol)] = _DECODE_TABLE[ord(_symbol.lower())] = _value
+for _symbol in BLANK_CHARACTERS:
+    _DECODE_TABLE[ord(_symbol)] = 0
+_ENCODE_TABLE = ("0" + DIGIT_SYMBOLS).encode("ascii").ljust(256, b"?")
+
+
+class Board:
+    """
+    A Sudoku board stored as one flat bytearray of cell values, row by row.
+
+    A 9x9 board takes 81 bytes of cell data instead of ten lists of boxed ints, so
+    copies are a single memcpy and millions of boards fit comfortably in memory.
+    Cells are read and written as ``board[row, col]`` or by flat index
+    ``board[row * size + col]``. Boards compare and hash by content; do not change a
+    board while it is used as a dict key or set member.
+    """
+
+    __slots__ = ("size", "cells")
+
+    def __init__(self, size=9, cells=None):
+        """
+        Initialize the board.
+        :param size: Number of rows (and columns); must be a perfect square.
+        :param cells: Optional iterable of ``size * size`` cell values, row by row (0 for blanks).
+            Defaults to an empty board.
+        :raises ValueError: If the size is not a perfect square or the cells do not fit it.
+        """
+        cell_count = board_layout(size).cell_count
+        cells = bytearray(cell_count) if cells is None else bytearray(cells)
+        if len(cells) != cell_count:
+            raise ValueError(f"A {size}x{size} board needs {cell_count} cells, got {len(cells)}.")
+        if cells and max(cells) > size:
+            raise ValueError(f"Cell values must be between 0 and {size}.")
+        self.size = size
+        self.cells = cells
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a board from a 2D list.
+        :param rows: 2D list representing the Sudoku board.
+        :return: Board.
+        """
+        return cls(len(rows), [value for row in rows for value in row])
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Build a board from its string form (see utils.board_codec).
+        :param text: One character per cell, row by row; "0" or "." for blanks.
+        :return: Board.
+        :raises ValueError: If the string is not a valid board.
+        """
+        size = ENCODED_LENGTHS.get(len(text))
+        if size is None:
+            raise ValueError(f"Expected {', '.join(map(str, ENCODED_LENGTHS))} characters, got {len(text)}.")
+        try:
+            cells = text.encode("ascii").translate(_DECODE_TABLE)
+        except UnicodeEncodeError:
+            raise ValueError("Invalid character in board string.") from None
+        if max(cells) > size:
+            raise ValueError("Invalid character in board string.")
+        board = cls.__new__(cls)
+        board.size = size
+        board.cells = bytearray(cells)
+        return board
+
+    def to_rows(self):
+        """
+        Convert the board to a 2D list.
+        :return: New 2D list representing the Sudoku board.
+        """
+        size, cells = self.size, self.cells
+        return [list(cells[row * size:(row + 1) * size]) for row in range(size)]
+
+    def copy(self):
+        """
+        Copy the board.
+        :return: New Board with the same cells.
+        """
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.cells = self.cells[:]
+        return board
+
+    def empty_cells(self):
+        """
+        Get the empty cells.
+        :return: List of flat indices of the empty cells.
+        """
+        return [cell for cell, value in enumerate(self.cells) if not value]
+
+    def is_full(self):
+        """Check whether every cell is filled."""
+        return 0 not in self.cells
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.cells[row * self.size + col]
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple):
+            row, col = key
+            key = row * self.size + col
+        self.cells[key] = value
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.size == other.size and self.cells == other.cells
+
+    def __hash__(self):
+        return hash((self.size, bytes(self.cells)))
+
+    def __str__(self):
+        return self.cells.translate(_ENCODE_TABLE).decode("ascii")
+
+    def __repr__(self):
+        return f"Board.from_string({str(self)!r})"
+
+
+def flat_cells(board):
+    """
+    Read the cells of a Board or a 2D list.
+    :param board: Board or 2D list representing the Sudoku board.
+    :return: Tuple (board size, new flat list of cell values).
+    """
+    if isinstance(board, Board):
+        return board.size, list(board.cells)
+    return len(board), [value for row in board for value in row]
+
+
+def store_cells(board, cells):
+    """
+    Write flat cell values back into a Board or a 2D list in place.
+    :param board: Board or 2D list to update.
+    :param cells: Flat list of cell values, row by row.
+    """
+    if isinstance(board, Board):
+        board.cells[:] = bytes(cells)
+        return
+    size = len(board)
+    for row in range(size):
+        board[row][:] = cells[row * size:(row + 1) * size]
@@ -1,14 +1,13 @@
 import pygame
 from config.settings import (
     BOARD_SIZE,
-    FONT_NAME,
-    FONT_SIZE,
     COLOR_GRAY,
     COLOR_BLACK,
     COLOR_WHITE,
     COLOR_RED,
     COLOR_GREEN, CELL_BORDER_WIDTH, COLOR_BLUE,
 )
+from utils.glyphs import render_glyph
 
 
 class Cube:
@@ -23,26 +22,24 @@ class Cube:
 
     def draw(self, win):
         """Draw the cube on the window."""
-        font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
         gap = self.width / BOARD_SIZE
         x, y = self._calculate_position(gap)
 
         if self.temp != 0 and self.value == 0:
-            self._draw_text(win, font, str(self.temp), COLOR_GRAY, x + 5, y + 5)
+            self._draw_text(win, str(self.temp), COLOR_GRAY, x + 5, y + 5)
         elif self.value != 0:
-            self._draw_centered_text(win, font, str(self.value), COLOR_BLACK, x, y, gap)
+            self._draw_centered_text(win, str(self.value), COLOR_BLACK, x, y, gap)
 
         if self.selected:
             self._draw_border(win, COLOR_BLUE, x, y, gap)
 
     def draw_change(self, win, check):
         """Draw the cube with changes."""
-        font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
         gap = self.width / BOARD_SIZE
         x, y = self._calculate_position(gap)
 
         self._draw_background(win, COLOR_WHITE, x, y, gap)
-        self._draw_centered_text(win, font, str(self.value), COLOR_BLACK, x, y, gap)
+        self._draw_centered_text(win, str(self.value), COLOR_BLACK, x, y, gap)
 
         border_color = COLOR_GREEN if check else COLOR_RED
         self._draw_border(win, border_color, x, y, gap)
@@ -62,15 +59,15 @@ class Cube:
         return x, y
 
     @staticmethod
-    def _draw_text(win, font, text, color, x, y):
+    def _draw_text(win, text, color, x, y):
         """Draw text at a specific position."""
-        rendered_text = font.render(text, True, color)
+        rendered_text = render_glyph(text, color)
         win.blit(rendered_text, (x, y))
 
     @staticmethod
-    def _draw_centered_text(win, font, text, color, x, y, gap):
+    def _draw_centered_text(win, text, color, x, y, gap):
         """Draw text centered within the cube."""
-        rendered_text = font.render(text, True, color)
+        rendered_text = render_glyph(text, color)
         win.blit(
             rendered_text,
             (
@@ -1,13 +1,26 @@
+import math
+
 import pygame
 
-from config.settings import COLOR_BLACK
+from config.settings import COLOR_BLACK, COLOR_WHITE
+from core.entities.board import Board
 from core.entities.cube import Cube
-from core.logic.sudoku_solver import SudokuSolver
-
-from utils.helpers import is_safe_to_place
+from core.logic.hints import HintEngine
+from core.logic.solution_cache import DEFAULT_CACHE
+from core.logic.units import board_layout
 
 
 class Grid:
+    """
+    The game board: its cubes, the model of placed values, and the solution.
+
+    Used digits are tracked per row, column and box as bitmasks, together with the
+    list of empty cells, and every change goes through set_cell(). Checking a move,
+    finding an empty cell and detecting a finished game therefore take constant
+    time. Cells whose appearance changed are collected in ``dirty`` for the renderer,
+    and the HintEngine in ``hints`` follows every change too.
+    """
+
     def __init__(self, rows, cols, width, height, board, win):
         """
         Initialize the Grid.
@@ -28,20 +41,85 @@ class Grid:
         ]
         self.model = None
         self.answer = None
+        self.hints = None
         self.selected = None
         self.win = win
+        self.layout = board_layout(rows)
+        self.dirty = set()
         self.update_model()
         self._solve_and_store_answer()
-
+        self.hints = HintEngine(self.model, solution=self.answer)
 
     def _solve_and_store_answer(self):
-        """Solve the board and store the solution in self.answer."""
-        self.answer = [row[:] for row in self.model]  # Create a copy of the current board
-        SudokuSolver.solve(self.answer)
+        """Solve the board and store the solution in self.answer, reusing cached solutions."""
+        self.answer = Board.from_rows(self.model)
+        DEFAULT_CACHE.solve(self.answer)
 
     def update_model(self):
-        """Update the internal model of the grid based on cube values."""
+        """
+        Rebuild the model, the incremental state and the hint engine from the cube values,
+        and mark every cell dirty.
+        """
         self.model = [[self.cubes[i][j].value for j in range(self.cols)] for i in range(self.rows)]
+        layout = self.layout
+        self._rows = [0] * layout.size
+        self._cols = [0] * layout.size
+        self._boxes = [0] * layout.size
+        self._empties = []
+        self._empty_position = [-1] * layout.cell_count
+        for cell in range(layout.cell_count):
+            value = self.model[layout.cell_row[cell]][layout.cell_col[cell]]
+            if value:
+                self._mark(cell, 1 << (value - 1))
+            else:
+                self._empty_position[cell] = len(self._empties)
+                self._empties.append(cell)
+        self.dirty = {(i, j) for i in range(self.rows) for j in range(self.cols)}
+        if self.answer is not None:
+            self.hints = HintEngine(self.model, solution=self.answer)
+
+    def candidates(self, row, col):
+        """
+        Get the digits that do not clash with the row, column or box of a cell.
+        :return: Mask with bit ``d - 1`` set for every digit ``d`` that fits.
+        """
+        layout = self.layout
+        cell = row * layout.size + col
+        used = self._rows[row] | self._cols[col] | self._boxes[layout.cell_box[cell]]
+        return layout.all_digits & ~used
+
+    def set_cell(self, row, col, value):
+        """
+        Set the permanent value of a cell, keeping the model and incremental state in step.
+        :param value: Digit to place, or 0 to empty the cell.
+        """
+        old = self.model[row][col]
+        if old == value:
+            return
+        cell = row * self.layout.size + col
+        if old:
+            self._mark(cell, 1 << (old - 1))
+            self._empty_position[cell] = len(self._empties)
+            self._empties.append(cell)
+        if value:
+            self._mark(cell, 1 << (value - 1))
+            position = self._empty_position[cell]
+            last = self._empties.pop()
+            if position < len(self._empties):
+                self._empties[position] = last
+                self._empty_position[last] = position
+            self._empty_position[cell] = -1
+        self.model[row][col] = value
+        self.cubes[row][col].set(value)
+        self.dirty.add((row, col))
+        self.hints.place(row, col, value)
+
+    def _mark(self, cell, bit):
+        """Toggle a digit bit in the masks of a cell's row, column and box."""
+        layout = self.layout
+        self._rows[layout.cell_row[cell]] ^= bit
+        self._cols[layout.cell_col[cell]] ^= bit
+        self._boxes[layout.cell_box[cell]] ^= bit
 
     def place(self, val):
         """
@@ -54,15 +132,14 @@ class Grid:
 
         row, col = self.selected
         if self.cubes[row][col].value == 0:
-            if is_safe_to_place(self.model, val, (row, col)) and self.answer[row][col] == val:
-                self.cubes[row][col].set(val)
-                self.update_model()
+            if self.candidates(row, col) & (1 << (val - 1)) and self.answer[row, col] == val:
+                self.set_cell(row, col, val)
                 return True
 
             else:
                 self.cubes[row][col].set(0)
                 self.cubes[row][col].set_temp(0)
-                self.update_model()
+                self.dirty.add((row, col))
                 return False
 
     def sketch(self, val):
@@ -70,6 +147,7 @@ class Grid:
         if self.selected:
             row, col = self.selected
             self.cubes[row][col].set_temp(val)
+            self.dirty.add((row, col))
 
     def draw(self):
         """Draw the grid and its cubes."""
@@ -78,6 +156,32 @@ class Grid:
             for cube in row:
                 cube.draw(self.win)
 
+    def draw_cells(self, cells):
+        """
+        Redraw some cells only. Each cell is cleared and drawn again, together with the
+        grid lines and neighbouring cubes that reach into it, clipped to its rectangle.
+        :param cells: Iterable of (row, col).
+        :return: List of the redrawn rectangles.
+        """
+        rects = []
+        for row, col in cells:
+            rect = self.cell_rect(row, col)
+            self.win.set_clip(rect)
+            self.win.fill(COLOR_WHITE, rect)
+            self._draw_grid_lines()
+            for i in range(max(row - 1, 0), min(row + 2, self.rows)):
+                for j in range(max(col - 1, 0), min(col + 2, self.cols)):
+                    self.cubes[i][j].draw(self.win)
+            rects.append(rect)
+        self.win.set_clip(None)
+        return rects
+
+    def cell_rect(self, row, col):
+        """Get the rectangle of a cell on the window, rounded outwards to whole pixels."""
+        gap = self.width / self.rows
+        left, top = int(col * gap), int(row * gap)
+        return pygame.Rect(left, top, math.ceil((col + 1) * gap) - left, math.ceil((row + 1) * gap) - top)
+
     def _draw_grid_lines(self):
         """Draw the grid lines."""
         gap = self.width / self.rows
@@ -91,12 +195,14 @@ class Grid:
         self._clear_selection()
         self.cubes[row][col].selected = True
         self.selected = (row, col)
+        self.dirty.add((row, col))
 
     def _clear_selection(self):
-        """Clear the selection of all cubes."""
-        for row in self.cubes:
-            for cube in row:
-                cube.selected = False
+        """Clear the selection of the selected cube."""
+        if self.selected:
+            row, col = self.selected
+            self.cubes[row][col].selected = False
+            self.dirty.add((row, col))
 
     def clear(self):
         """Clear the temporary value of the selected cube."""
@@ -104,6 +210,7 @@ class Grid:
             row, col = self.selected
             if self.cubes[row][col].value == 0:
                 self.cubes[row][col].set_temp(0)
+                self.dirty.add((row, col))
 
     def click(self, pos):
         """
@@ -120,7 +227,7 @@ class Grid:
 
     def is_finished(self):
         """Check if the grid is completely filled."""
-        return all(cube.value != 0 for row in self.cubes for cube in row)
+        return not self._empties
 
     def reset(self, board):
         """
@@ -131,8 +238,6 @@ class Grid:
 
     def find_empty(self):
         """Find an empty cell in the grid."""
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.model[i][j] == 0:
-                    return i, j
-        return None
\ No newline at end of file
+        if not self._empties:
+            return None
+        return divmod(self._empties[0], self.layout.size)
\ No newline at end of file
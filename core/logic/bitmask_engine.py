@@ -0,0 +1,288 @@
+from itertools import islice
+
+from core.entities.board import flat_cells, store_cells
+from core.logic.units import board_layout
+
+
+class BitmaskEngine:
+    """
+    Backtracking engine that tracks used digits per row, column and box as bitmasks.
+
+    Bit ``d - 1`` of a mask is set when digit ``d`` is used in that unit, so the
+    candidates of an empty cell are the bits missing from its three unit masks,
+    minus any digits eliminated from that cell by propagation. All updates happen
+    in place and are recorded on a trail, so backtracking undoes them without any
+    per-node copies of the board or the candidates.
+
+    Any N²xN² board works: masks are Python ints, so they are as wide as the board
+    needs, and the index tables come from the shared BoardLayout for its size.
+    """
+
+    def __init__(self, board, propagator=None, tracer=None):
+        """
+        Load a board into the engine.
+        :param board: Board or square 2D list representing the Sudoku board (0 for
+            empty cells); its size must be a perfect square.
+        :param propagator: Optional Propagator run to a fixpoint before every branch.
+        :param tracer: Optional SolverTracer notified of search events.
+        """
+        size, self.cells = flat_cells(board)
+        layout = self.layout = board_layout(size)
+        self.cell_row, self.cell_col, self.cell_box = layout.cell_row, layout.cell_col, layout.cell_box
+        self.all_digits = layout.all_digits
+        self.rows = [0] * layout.size
+        self.cols = [0] * layout.size
+        self.boxes = [0] * layout.size
+        self.excluded = [0] * layout.cell_count
+        self.empties = []
+        self.empty_position = [-1] * layout.cell_count
+        self.trail = []
+        self.propagator = propagator
+        self.tracer = tracer
+        self.nodes = 0
+        self.consistent = True
+
+        for cell, value in enumerate(self.cells):
+            if value == 0:
+                self.empty_position[cell] = len(self.empties)
+                self.empties.append(cell)
+                continue
+
+            bit = 1 << (value - 1)
+            row, col, box = self.cell_row[cell], self.cell_col[cell], self.cell_box[cell]
+            if (self.rows[row] | self.cols[col] | self.boxes[box]) & bit:
+                self.consistent = False
+            self.rows[row] |= bit
+            self.cols[col] |= bit
+            self.boxes[box] |= bit
+
+    def candidates(self, cell):
+        """
+        Get the candidate mask of an empty cell.
+        :param cell: Flat cell index (row * size + col).
+        :return: Mask with bit ``d - 1`` set for every digit ``d`` that fits.
+        """
+        used = self.rows[self.cell_row[cell]] | self.cols[self.cell_col[cell]] | self.boxes[self.cell_box[cell]]
+        return self.all_digits & ~(used | self.excluded[cell])
+
+    def assign(self, cell, bit):
+        """
+        Place the digit for ``bit`` into an empty cell and record it on the trail.
+        :param cell: Flat cell index of an empty cell.
+        :param bit: Single-bit mask of the digit to place.
+        """
+        position = self.empty_position[cell]
+        empties = self.empties
+        last = empties.pop()
+        if position < len(empties):
+            empties[position] = last
+            self.empty_position[last] = position
+        self.empty_position[cell] = -1
+
+        self.cells[cell] = bit.bit_length()
+        self.rows[self.cell_row[cell]] |= bit
+        self.cols[self.cell_col[cell]] |= bit
+        self.boxes[self.cell_box[cell]] |= bit
+        self.trail.append((cell, bit, position))
+
+    def exclude(self, cell, mask):
+        """
+        Eliminate digits from an empty cell's candidates and record it on the trail.
+        :param cell: Flat cell index of an empty cell.
+        :param mask: Digits to eliminate.
+        :return: True if any candidate was removed.
+        """
+        removed = mask & self.candidates(cell)
+        if not removed:
+            return False
+        self.excluded[cell] |= removed
+        self.trail.append((cell, 0, removed))
+        return True
+
+    def undo(self, mark):
+        """
+        Roll back every assignment and elimination made after ``mark``.
+        :param mark: Trail length returned by ``len(engine.trail)`` before the changes.
+        """
+        trail = self.trail
+        empties = self.empties
+        while len(trail) > mark:
+            cell, bit, saved = trail.pop()
+            if not bit:
+                self.excluded[cell] ^= saved
+                continue
+
+            self.cells[cell] = 0
+            self.rows[self.cell_row[cell]] ^= bit
+            self.cols[self.cell_col[cell]] ^= bit
+            self.boxes[self.cell_box[cell]] ^= bit
+            if saved == len(empties):
+                empties.append(cell)
+            else:
+                moved = empties[saved]
+                empties.append(moved)
+                self.empty_position[moved] = len(empties) - 1
+                empties[saved] = cell
+            self.empty_position[cell] = saved
+
+    def solve(self):
+        """
+        Fill every empty cell.
+        :return: True if a solution was found, False otherwise.
+        """
+        if not self.consistent:
+            return False
+        return self._search(0)
+
+    def solve_steps(self):
+        """
+        Fill every empty cell like solve(), yielding each change as it is made, so a
+        caller can show the search progressively and stop it at any point.
+        The tracer is not notified.
+        :return: Generator of (cell, value) pairs, value 0 when backtracking clears a
+            cell. Its return value is True if a solution was found.
+        """
+        if not self.consistent:
+            return False
+        return (yield from self._search_steps())
+
+    def count(self, limit=None):
+        """
+        Count solutions, stopping early once ``limit`` is reached.
+        :param limit: Maximum number of solutions to count (None for all).
+        :return: Number of solutions found.
+        """
+        if not self.consistent:
+            return 0
+        return self._count(limit, 0, 0)
+
+    def write_to(self, board):
+        """
+        Copy the engine's cells back into a board in place.
+        :param board: Board or 2D list to update.
+        """
+        store_cells(board, self.cells)
+
+    def _search(self, depth):
+        """
+        Depth-first search on the most constrained empty cell.
+        :param depth: Number of branch decisions above this node.
+        :return: True if solved, False otherwise.
+        """
+        self.nodes += 1
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.on_node(depth)
+        if self.propagator is not None and not self.propagator.propagate(self):
+            return False
+
+        if not self.empties:
+            if tracer is not None:
+                tracer.on_solution(depth)
+            return True
+
+        cell, mask = self._select_cell()
+        if not mask:
+            return False
+
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            mark = len(self.trail)
+            self.assign(cell, bit)
+            if tracer is not None:
+                tracer.on_assign(cell, bit.bit_length(), depth)
+            if self._search(depth + 1):
+                return True
+            self.undo(mark)
+            if tracer is not None:
+                tracer.on_backtrack(cell, bit.bit_length(), depth)
+        return False
+
+    def _search_steps(self):
+        """
+        Generator version of _search.
+        :return: True if solved, False otherwise.
+        """
+        self.nodes += 1
+        if self.propagator is not None:
+            mark = len(self.trail)
+            consistent = self.propagator.propagate(self)
+            for cell, bit, _ in islice(self.trail, mark, None):
+                if bit:
+                    yield cell, bit.bit_length()
+            if not consistent:
+                return False
+
+        if not self.empties:
+            return True
+
+        cell, mask = self._select_cell()
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            mark = len(self.trail)
+            self.assign(cell, bit)
+            yield cell, bit.bit_length()
+            if (yield from self._search_steps()):
+                return True
+            cleared = [cell for cell, bit, _ in islice(self.trail, mark, None) if bit]
+            self.undo(mark)
+            for cleared_cell in reversed(cleared):
+                yield cleared_cell, 0
+        return False
+
+    def _count(self, limit, found, depth):
+        """
+        Depth-first search that keeps going after each solution.
+        :param limit: Maximum number of solutions to count (None for all).
+        :param found: Solutions counted so far.
+        :param depth: Number of branch decisions above this node.
+        :return: Updated number of solutions found.
+        """
+        self.nodes += 1
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.on_node(depth)
+        if self.propagator is not None and not self.propagator.propagate(self):
+            return found
+
+        if not self.empties:
+            if tracer is not None:
+                tracer.on_solution(depth)
+            return found + 1
+
+        cell, mask = self._select_cell()
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            mark = len(self.trail)
+            self.assign(cell, bit)
+            if tracer is not None:
+                tracer.on_assign(cell, bit.bit_length(), depth)
+            found = self._count(limit, found, depth + 1)
+            self.undo(mark)
+            if tracer is not None:
+                tracer.on_backtrack(cell, bit.bit_length(), depth)
+            if limit is not None and found >= limit:
+                break
+        return found
+
+    def _select_cell(self):
+        """
+        Find the empty cell with the fewest candidates (MRV).
+        :return: Tuple (cell, candidate mask).
+        """
+        rows, cols, boxes, excluded = self.rows, self.cols, self.boxes, self.excluded
+        cell_row, cell_col, cell_box = self.cell_row, self.cell_col, self.cell_box
+        all_digits, popcount = self.all_digits, self.layout.popcount
+        best_cell, best_mask, best_count = -1, 0, self.layout.size + 1
+        for cell in self.empties:
+            used = rows[cell_row[cell]] | cols[cell_col[cell]] | boxes[cell_box[cell]] | excluded[cell]
+            mask = all_digits & ~used
+            count = popcount[mask]
+            if count < best_count:
+                best_cell, best_mask, best_count = cell, mask, count
+                if count <= 1:
+                    break
+        return best_cell, best_mask
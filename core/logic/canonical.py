@@ -0,0 +1,208 @@
+import random
+from itertools import islice, permutations, product
+
+from config.settings import CANONICAL_BEAM_LIMIT
+from core.entities.board import flat_cells
+from core.logic.units import board_layout
+
+
+class Transform:
+    """
+    A symmetry of Sudoku: it maps every valid board to a valid board.
+
+    The board is optionally transposed, its rows and columns are permuted without
+    breaking up bands and stacks, and its digits are relabelled. ``rows[i]`` and
+    ``cols[j]`` name the source row and column of output cell (i, j), and
+    ``labels[d]`` is the new digit for digit ``d`` (``labels[0]`` is always 0).
+    """
+
+    __slots__ = ("size", "transpose", "rows", "cols", "labels", "_source")
+
+    def __init__(self, size, transpose, rows, cols, labels):
+        self.size = size
+        self.transpose = transpose
+        self.rows = tuple(rows)
+        self.cols = tuple(cols)
+        self.labels = tuple(labels)
+        if transpose:
+            self._source = tuple(col * size + row for row in self.rows for col in self.cols)
+        else:
+            self._source = tuple(row * size + col for row in self.rows for col in self.cols)
+
+    @classmethod
+    def random(cls, size, rng=random):
+        """
+        Draw a uniformly random symmetry.
+        :param size: Board size.
+        :param rng: Random number generator (the random module or a random.Random).
+        :return: Transform.
+        """
+        box_size = board_layout(size).box_size
+        rows = cls._random_lines(box_size, rng)
+        cols = cls._random_lines(box_size, rng)
+        digits = list(range(1, size + 1))
+        rng.shuffle(digits)
+        return cls(size, rng.random() < 0.5, rows, cols, [0] + digits)
+
+    @staticmethod
+    def _random_lines(box_size, rng):
+        """Shuffle the bands (or stacks), then the lines inside each one."""
+        groups = list(range(box_size))
+        rng.shuffle(groups)
+        lines = []
+        for group in groups:
+            inside = list(range(group * box_size, (group + 1) * box_size))
+            rng.shuffle(inside)
+            lines.extend(inside)
+        return lines
+
+    def apply(self, cells):
+        """
+        Transform a board.
+        :param cells: Flat list of cell values, row by row.
+        :return: New flat list of the transformed cell values.
+        """
+        labels = self.labels
+        return [labels[cells[source]] for source in self._source]
+
+    def invert(self, cells):
+        """
+        Undo the transform.
+        :param cells: Flat list of transformed cell values, row by row.
+        :return: New flat list of the original cell values.
+        """
+        digits = [0] * len(self.labels)
+        for digit, label in enumerate(self.labels):
+            digits[label] = digit
+        original = [0] * len(cells)
+        for index, source in enumerate(self._source):
+            original[source] = digits[cells[index]]
+        return original
+
+
+def canonical_form(board):
+    """
+    Find the canonical form of a puzzle: the smallest of its symmetric variants,
+    read row by row, with blanks as 0 and digits relabelled in order of first appearance.
+
+    Puzzles that are equivalent under transposition, band/stack and row/column
+    permutations and digit relabelling share one canonical form. The search keeps
+    every variant tied for the smallest prefix, row by row, so complete 9x9 grids
+    are handled exactly too. Highly symmetric or nearly empty puzzles, and large
+    grids, can tie more than CANONICAL_BEAM_LIMIT ways; the beam is then cut, and
+    equivalent puzzles may then get different forms.
+    Even then, the result is always a true transform of the input.
+    :param board: Board or 2D list representing the Sudoku board.
+    :return: Tuple (canonical cells as bytes, Transform mapping the board to them).
+    """
+    size, cells = flat_cells(board)
+    box_size = board_layout(size).box_size
+    views = (cells, [cells[col * size + row] for row in range(size) for col in range(size)])
+
+    # First row: any row of either orientation, with its columns arranged to minimize it.
+    firsts = []
+    for transpose, view in enumerate(views):
+        for row in range(size):
+            values = view[row * size:(row + 1) * size]
+            cols = next(_first_row_column_orders(values, box_size))
+            firsts.append((_relabel(values, cols, [0] * (size + 1), 1)[0], transpose, row))
+    best_first = min(first[0] for first in firsts)
+
+    # A full first row ties every possible way (it always relabels to 1..n), so the
+    # first-row variants are streamed rather than kept, under a wider limit.
+    beam = islice(
+        (
+            (transpose, (row,), cols) + _relabel(values, cols, [0] * (size + 1), 1)[1:]
+            for key, transpose, row in firsts if key == best_first
+            for values in (views[transpose][row * size:(row + 1) * size],)
+            for cols in _first_row_column_orders(values, box_size)
+        ),
+        CANONICAL_BEAM_LIMIT * size,
+    )
+
+    for _ in range(1, size):
+        best, extended = None, []
+        for transpose, rows, cols, labels, next_label in beam:
+            view = views[transpose]
+            for row in _next_rows(rows, box_size, size):
+                relabelled = _relabel(view[row * size:(row + 1) * size], cols, labels, next_label, best)
+                if relabelled is None:
+                    continue
+                key, row_labels, row_next = relabelled
+                if best is None or key < best:
+                    best, extended = key, []
+                if key == best and len(extended) < CANONICAL_BEAM_LIMIT:
+                    extended.append((transpose, rows + (row,), cols, row_labels, row_next))
+        beam = extended
+
+    transpose, rows, cols, labels, next_label = beam[0]
+    # Digits missing from the puzzle take the remaining labels in order.
+    for digit in range(1, size + 1):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+    transform = Transform(size, bool(transpose), rows, cols, labels)
+    return bytes(transform.apply(cells)), transform
+
+
+def _relabel(values, cols, labels, next_label, bound=None):
+    """
+    Read one row through a column order, giving unseen digits the next free labels.
+    :param bound: Optional best row so far; reading stops as soon as the row is larger.
+    :return: Tuple (relabelled row as a tuple, updated labels, next free label), or
+        None if the row is larger than ``bound``.
+    """
+    row = []
+    tied = bound is not None
+    for col in cols:
+        digit = values[col]
+        label = labels[digit]
+        if digit and not label:
+            labels = labels[:]
+            label = labels[digit] = next_label
+            next_label += 1
+        if tied:
+            limit = bound[len(row)]
+            if label > limit:
+                return None
+            tied = label == limit
+        row.append(label)
+    return tuple(row), labels, next_label
+
+
+def _first_row_column_orders(values, box_size):
+    """
+    Enumerate the column orders that minimize the first row: stacks with fewer
+    clues first, and blanks first inside each stack.
+    :return: Generator of column orders (tuples of column indices).
+    """
+    stacks = [
+        (
+            [col for col in range(stack * box_size, (stack + 1) * box_size) if not values[col]],
+            [col for col in range(stack * box_size, (stack + 1) * box_size) if values[col]],
+        )
+        for stack in range(box_size)
+    ]
+    counts = [len(filled) for _, filled in stacks]
+    for order in permutations(range(box_size)):
+        if any(counts[order[index]] > counts[order[index + 1]] for index in range(box_size - 1)):
+            continue
+        arrangements = [
+            [blank + filled for blank in permutations(stacks[stack][0]) for filled in permutations(stacks[stack][1])]
+            for stack in order
+        ]
+        for parts in product(*arrangements):
+            yield sum(parts, ())
+
+
+def _next_rows(rows, box_size, size):
+    """
+    Get the rows that may come next without breaking up a band.
+    :param rows: Source rows already placed, in order.
+    :return: List of source row indices.
+    """
+    if len(rows) % box_size:
+        band = rows[-1] // box_size
+        return [row for row in range(band * box_size, (band + 1) * box_size) if row not in rows]
+    used_bands = {row // box_size for row in rows}
+    return [row for row in range(size) if row // box_size not in used_bands]
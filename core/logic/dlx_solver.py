@@ -0,0 +1,245 @@
+from functools import lru_cache
+
+from core.entities.board import flat_cells, store_cells
+from core.logic.units import board_layout
+
+
+def _constraint_columns(layout, cell, digit):
+    """
+    Get the four exact-cover columns satisfied by placing ``digit`` in ``cell``.
+    Columns are numbered from 1 because node 0 is the root header.
+    :param layout: BoardLayout of the board.
+    :return: Tuple of column header indices (cell, row-digit, col-digit, box-digit).
+    """
+    index = digit - 1
+    cell_count, size = layout.cell_count, layout.size
+    return (
+        1 + cell,
+        1 + cell_count + layout.cell_row[cell] * size + index,
+        1 + 2 * cell_count + layout.cell_col[cell] * size + index,
+        1 + 3 * cell_count + layout.cell_box[cell] * size + index,
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_template(board_size):
+    """
+    Build the full, unreduced exact-cover matrix as Dancing Links arrays.
+    :param board_size: Board size.
+    :return: Tuple (left, right, up, down, column, size, candidate of node).
+    """
+    layout = board_layout(board_size)
+    constraint_count = 4 * layout.cell_count
+    header_count = constraint_count + 1
+    left = [index - 1 for index in range(header_count)]
+    right = [index + 1 for index in range(header_count)]
+    left[0], right[-1] = constraint_count, 0
+    up = list(range(header_count))
+    down = list(range(header_count))
+    column = list(range(header_count))
+    size = [0] * header_count
+    candidate = [-1] * header_count
+
+    for cell in range(layout.cell_count):
+        for digit in range(1, board_size + 1):
+            first = len(column)
+            columns = _constraint_columns(layout, cell, digit)
+            for offset, header in enumerate(columns):
+                node = first + offset
+                left.append(first + (offset - 1) % len(columns))
+                right.append(first + (offset + 1) % len(columns))
+                up.append(up[header])
+                down.append(header)
+                down[up[header]] = node
+                up[header] = node
+                column.append(header)
+                candidate.append(cell * board_size + digit - 1)
+                size[header] += 1
+
+    return left, right, up, down, column, size, tuple(candidate)
+
+
+class DLXSolver:
+    """
+    Exact-cover solver using Knuth's Algorithm X with Dancing Links.
+
+    Every (cell, digit) candidate is a matrix row covering four constraints: the
+    cell is filled, and the digit appears once in its row, column and box. Givens
+    are selected up front, and the search enumerates every remaining exact cover,
+    which makes counting solutions as cheap as finding one.
+    """
+
+    def __init__(self, board, tracer=None):
+        """
+        Build the exact-cover matrix for a board and select its givens.
+        :param board: Board or square 2D list representing the Sudoku board (0 for
+            empty cells); its size must be a perfect square.
+        :param tracer: Optional SolverTracer notified of search events.
+        """
+        board_size, self.cells = flat_cells(board)
+        self.layout = board_layout(board_size)
+        left, right, up, down, column, size, self.candidate = _build_template(board_size)
+        self.left, self.right, self.up, self.down = left[:], right[:], up[:], down[:]
+        self.column, self.size = column, size[:]
+        self.tracer = tracer
+        self.consistent = True
+
+        covered = set()
+        for cell, value in enumerate(self.cells):
+            if value == 0:
+                continue
+            columns = _constraint_columns(self.layout, cell, value)
+            if covered.intersection(columns):
+                self.consistent = False
+                return
+            covered.update(columns)
+            for header in columns:
+                self._cover(header)
+
+    def solve(self):
+        """
+        Find one solution and store it in ``self.cells``.
+        :return: True if a solution was found, False otherwise.
+        """
+        for solution in self.solutions():
+            self.cells = solution
+            return True
+        return False
+
+    def count(self, limit=None):
+        """
+        Count solutions, stopping early once ``limit`` is reached.
+        :param limit: Maximum number of solutions to count (None for all).
+        :return: Number of solutions found.
+        """
+        found = 0
+        for _ in self.solutions():
+            found += 1
+            if limit is not None and found >= limit:
+                break
+        return found
+
+    def solutions(self):
+        """
+        Enumerate every solution of the board.
+        :return: Generator of solved boards as flat lists of cell values.
+        """
+        if not self.consistent:
+            return
+
+        left, right, down, column, size = self.left, self.right, self.down, self.column, self.size
+        cover, uncover = self._cover, self._uncover
+        tracer = self.tracer
+        stack = []
+
+        while True:
+            if tracer is not None:
+                tracer.on_node(len(stack))
+            if right[0] == 0:
+                if tracer is not None:
+                    tracer.on_solution(len(stack))
+                yield self._decode(stack)
+            else:
+                best, best_size = 0, self.layout.cell_count
+                header = right[0]
+                while header != 0:
+                    if size[header] < best_size:
+                        best, best_size = header, size[header]
+                        if best_size <= 1:
+                            break
+                    header = right[header]
+
+                if best_size:
+                    cover(best)
+                    node = down[best]
+                    if tracer is not None:
+                        tracer.on_assign(*self._cell_digit(node), len(stack))
+                    stack.append(node)
+                    other = right[node]
+                    while other != node:
+                        cover(column[other])
+                        other = right[other]
+                    continue
+
+            # Dead end or solution reported: move to the next alternative.
+            while stack:
+                node = stack.pop()
+                other = left[node]
+                while other != node:
+                    uncover(column[other])
+                    other = left[other]
+                if tracer is not None:
+                    tracer.on_backtrack(*self._cell_digit(node), len(stack))
+
+                header = column[node]
+                node = down[node]
+                if node != header:
+                    if tracer is not None:
+                        tracer.on_assign(*self._cell_digit(node), len(stack))
+                    stack.append(node)
+                    other = right[node]
+                    while other != node:
+                        cover(column[other])
+                        other = right[other]
+                    break
+                uncover(header)
+            else:
+                return
+
+    def write_to(self, board):
+        """
+        Copy the solver's cells back into a board in place.
+        :param board: Board or 2D list to update.
+        """
+        store_cells(board, self.cells)
+
+    def _decode(self, stack):
+        """
+        Turn the selected matrix rows into a board.
+        :param stack: Nodes of the selected rows.
+        :return: Flat list of cell values.
+        """
+        cells = self.cells[:]
+        for node in stack:
+            cell, digit = self._cell_digit(node)
+            cells[cell] = digit
+        return cells
+
+    def _cell_digit(self, node):
+        """
+        Get the candidate a matrix node belongs to.
+        :param node: Row node index.
+        :return: Tuple (flat cell index, digit).
+        """
+        cell, index = divmod(self.candidate[node], self.layout.size)
+        return cell, index + 1
+
+    def _cover(self, header):
+        """Unlink a column and every row that intersects it."""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        row = down[header]
+        while row != header:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def _uncover(self, header):
+        """Relink a column and its rows, reversing :meth:`_cover`."""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        row = up[header]
+        while row != header:
+            node = left[row]
+            while node != row:
+                size[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[header]] = header
+        left[right[header]] = header
@@ -0,0 +1,429 @@
+from collections import deque
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Optional
+
+from config.settings import DIFFICULTY_BANDS
+from core.logic.bitmask_engine import BitmaskEngine
+from core.logic.propagation import box_line_segments
+
+HIDDEN_SINGLE = "hidden_single"
+NAKED_SINGLE = "naked_single"
+POINTING = "pointing"
+CLAIMING = "claiming"
+NAKED_PAIR = "naked_pair"
+X_WING = "x_wing"
+HIDDEN_PAIR = "hidden_pair"
+NAKED_TRIPLE = "naked_triple"
+SWORDFISH = "swordfish"
+HIDDEN_TRIPLE = "hidden_triple"
+XY_WING = "xy_wing"
+NAKED_QUAD = "naked_quad"
+JELLYFISH = "jellyfish"
+HIDDEN_QUAD = "hidden_quad"
+X_CHAIN = "x_chain"
+ALTERNATING_CHAIN = "alternating_chain"
+BACKTRACKING = "backtracking"
+
+# Difficulty of each technique, roughly on the Sudoku Explainer scale. Techniques are
+# tried in this order and the search restarts from the top after every deduction.
+TECHNIQUE_RATINGS = {
+    HIDDEN_SINGLE: 1.5,
+    NAKED_SINGLE: 2.3,
+    POINTING: 2.6,
+    CLAIMING: 2.8,
+    NAKED_PAIR: 3.0,
+    X_WING: 3.2,
+    HIDDEN_PAIR: 3.4,
+    NAKED_TRIPLE: 3.6,
+    SWORDFISH: 3.8,
+    HIDDEN_TRIPLE: 4.0,
+    XY_WING: 4.2,
+    NAKED_QUAD: 5.0,
+    JELLYFISH: 5.2,
+    HIDDEN_QUAD: 5.4,
+    X_CHAIN: 6.6,
+    ALTERNATING_CHAIN: 7.0,
+}
+# Rating of a puzzle the enabled techniques cannot finish.
+BACKTRACKING_RATING = 10.0
+
+DIFFICULTIES = tuple(name for name, _ in DIFFICULTY_BANDS)
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    One logical deduction: the digits it places and the candidates it removes.
+    Cells are flat indices and digits are 1-based.
+    """
+
+    technique: str
+    placements: tuple = ()
+    eliminations: tuple = ()
+    cells: tuple = ()
+
+    @property
+    def rating(self):
+        return TECHNIQUE_RATINGS[self.technique]
+
+
+@dataclass(frozen=True)
+class Grade:
+    """Outcome of grading one puzzle."""
+
+    rating: float
+    difficulty: str
+    hardest: Optional[str]
+    solved: bool
+    counts: dict
+
+
+def difficulty_of(rating):
+    """
+    Map a rating to its difficulty band (see DIFFICULTY_BANDS).
+    :param rating: Grader rating.
+    :return: Difficulty name.
+    """
+    for name, highest in DIFFICULTY_BANDS:
+        if rating <= highest:
+            return name
+    return DIFFICULTIES[-1]
+
+
+class Grader:
+    """
+    Solves a puzzle the way a person would, one deduction at a time with the easiest
+    technique that makes progress, and rates it by the hardest technique it needed.
+
+    Deductions are returned as Steps before they are applied, so the same search can
+    explain a single next move. The puzzle is assumed to have a unique solution.
+    """
+
+    def __init__(self, techniques=tuple(TECHNIQUE_RATINGS)):
+        """
+        Initialize the grader.
+        :param techniques: Iterable of technique names to enable (see TECHNIQUE_RATINGS).
+        """
+        techniques = set(techniques)
+        unknown = techniques.difference(TECHNIQUE_RATINGS)
+        if unknown:
+            raise ValueError(f"Unknown grading techniques: {', '.join(sorted(unknown))}.")
+
+        self.techniques = tuple(name for name in TECHNIQUE_RATINGS if name in techniques)
+        self._finders = tuple(_FINDERS[name] for name in self.techniques)
+
+    def grade(self, board):
+        """
+        Rate a puzzle.
+        :param board: Board or 2D list representing the Sudoku board; it is not modified.
+        :return: Grade. A puzzle the techniques cannot finish is rated BACKTRACKING_RATING.
+        """
+        engine = BitmaskEngine(board)
+        counts = {}
+        hardest, rating = None, 0.0
+        solved = engine.consistent
+        while solved and engine.empties:
+            step = self.next_step(engine)
+            if step is None:
+                solved = False
+                break
+            self.apply(engine, step)
+            counts[step.technique] = counts.get(step.technique, 0) + 1
+            if step.rating > rating:
+                hardest, rating = step.technique, step.rating
+
+        if not solved:
+            hardest, rating = BACKTRACKING, BACKTRACKING_RATING
+        return Grade(rating, difficulty_of(rating), hardest, solved, counts)
+
+    def next_step(self, engine):
+        """
+        Find the easiest deduction available.
+        :param engine: BitmaskEngine holding the current cells and eliminated candidates.
+        :return: Step, or None if no enabled technique makes progress.
+        """
+        candidates = [0 if value else engine.candidates(cell) for cell, value in enumerate(engine.cells)]
+        for finder in self._finders:
+            step = finder(engine.layout, candidates)
+            if step is not None:
+                return step
+        return None
+
+    @staticmethod
+    def apply(engine, step):
+        """
+        Apply a step to the engine (recorded on its trail, so it can be undone).
+        :param engine: BitmaskEngine to update.
+        :param step: Step returned by next_step.
+        """
+        for cell, digit in step.placements:
+            engine.assign(cell, 1 << (digit - 1))
+        for cell, digit in step.eliminations:
+            engine.exclude(cell, 1 << (digit - 1))
+
+
+def _digits(mask):
+    """List the 1-based digits of a mask."""
+    digits = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        digits.append(bit.bit_length())
+    return digits
+
+
+def _eliminations(candidates, cells, mask):
+    """
+    List the candidates of ``mask`` still present in ``cells``.
+    :return: Tuple of (cell, digit).
+    """
+    return tuple(
+        (cell, digit) for cell in cells if candidates[cell] & mask for digit in _digits(candidates[cell] & mask)
+    )
+
+
+def _hidden_single(layout, candidates):
+    """A digit with only one place left in a box, row or column."""
+    for unit in layout.box_units + layout.row_units + layout.col_units:
+        once = twice = 0
+        for cell in unit:
+            twice |= once & candidates[cell]
+            once |= candidates[cell]
+        hidden = once & ~twice
+        if hidden:
+            bit = hidden & -hidden
+            cell = next(cell for cell in unit if candidates[cell] & bit)
+            return Step(HIDDEN_SINGLE, placements=((cell, bit.bit_length()),), cells=unit)
+    return None
+
+
+def _naked_single(layout, candidates):
+    """A cell with only one candidate left."""
+    for cell, mask in enumerate(candidates):
+        if mask and not mask & (mask - 1):
+            return Step(NAKED_SINGLE, placements=((cell, mask.bit_length()),), cells=(cell,))
+    return None
+
+
+def _locked_candidates(layout, candidates, claiming):
+    """
+    Pointing: a digit confined to one line inside a box leaves the rest of the line.
+    Claiming: a digit confined to one box inside a line leaves the rest of the box.
+    """
+    for segment, line_rest, box_rest in box_line_segments(layout.size):
+        inside = outside_line = outside_box = 0
+        for cell in segment:
+            inside |= candidates[cell]
+        if not inside:
+            continue
+        for cell in line_rest:
+            outside_line |= candidates[cell]
+        for cell in box_rest:
+            outside_box |= candidates[cell]
+
+        if claiming:
+            locked, targets, technique = inside & ~outside_line & outside_box, box_rest, CLAIMING
+        else:
+            locked, targets, technique = inside & ~outside_box & outside_line, line_rest, POINTING
+        if locked:
+            bit = locked & -locked
+            return Step(technique, eliminations=_eliminations(candidates, targets, bit), cells=segment)
+    return None
+
+
+def _naked_subset(layout, candidates, size, technique):
+    """N cells of a unit holding exactly N candidates between them."""
+    popcount, peer_sets = layout.popcount, layout.peer_sets
+    for unit in layout.units:
+        small = [cell for cell in unit if 2 <= popcount[candidates[cell]] <= size]
+        for subset in combinations(small, size):
+            union = 0
+            for cell in subset:
+                union |= candidates[cell]
+            if popcount[union] != size:
+                continue
+            seen = peer_sets[subset[0]].intersection(*(peer_sets[cell] for cell in subset[1:]))
+            eliminations = _eliminations(candidates, sorted(seen), union)
+            if eliminations:
+                return Step(technique, eliminations=eliminations, cells=subset)
+    return None
+
+
+def _hidden_subset(layout, candidates, size, technique):
+    """N digits of a unit confined to the same N cells."""
+    for unit in layout.units:
+        places = {}
+        for digit in range(1, layout.size + 1):
+            bit = 1 << (digit - 1)
+            spots = tuple(cell for cell in unit if candidates[cell] & bit)
+            if 2 <= len(spots) <= size:
+                places[digit] = spots
+        for digits in combinations(places, size):
+            cells = sorted(set().union(*(places[digit] for digit in digits)))
+            if len(cells) != size:
+                continue
+            keep = 0
+            for digit in digits:
+                keep |= 1 << (digit - 1)
+            eliminations = _eliminations(candidates, cells, layout.all_digits & ~keep)
+            if eliminations:
+                return Step(technique, eliminations=eliminations, cells=tuple(cells))
+    return None
+
+
+def _fish(layout, candidates, size, technique):
+    """A digit confined to the same N columns in N rows (or the same N rows in N columns)."""
+    for digit in range(1, layout.size + 1):
+        bit = 1 << (digit - 1)
+        for bases, covers in ((layout.row_units, layout.col_units), (layout.col_units, layout.row_units)):
+            lines = {}
+            for index, line in enumerate(bases):
+                positions = frozenset(offset for offset, cell in enumerate(line) if candidates[cell] & bit)
+                if 2 <= len(positions) <= size:
+                    lines[index] = positions
+            for chosen in combinations(lines, size):
+                covered = frozenset().union(*(lines[index] for index in chosen))
+                if len(covered) != size:
+                    continue
+                base_cells = {cell for index in chosen for cell in bases[index]}
+                targets = [cell for offset in sorted(covered) for cell in covers[offset] if cell not in base_cells]
+                eliminations = _eliminations(candidates, targets, bit)
+                if eliminations:
+                    pattern = tuple(cell for index in chosen for cell in bases[index] if candidates[cell] & bit)
+                    return Step(technique, eliminations=eliminations, cells=pattern)
+    return None
+
+
+def _xy_wing(layout, candidates):
+    """
+    A bivalue pivot XY seeing bivalue pincers XZ and YZ: whichever value the pivot
+    takes, one pincer is Z, so Z leaves every cell seeing both pincers.
+    """
+    popcount, peers, peer_sets = layout.popcount, layout.peers, layout.peer_sets
+    for pivot, mask in enumerate(candidates):
+        if popcount[mask] != 2:
+            continue
+        wings = [cell for cell in peers[pivot] if popcount[candidates[cell]] == 2 and popcount[candidates[cell] & mask] == 1]
+        for first, second in combinations(wings, 2):
+            shared = candidates[first] & candidates[second]
+            if (
+                popcount[shared] != 1 or shared & mask
+                or candidates[first] & mask == candidates[second] & mask
+            ):
+                continue
+            targets = sorted((peer_sets[first] & peer_sets[second]) - {pivot})
+            eliminations = _eliminations(candidates, targets, shared)
+            if eliminations:
+                return Step(XY_WING, eliminations=eliminations, cells=(pivot, first, second))
+    return None
+
+
+def _chain(layout, candidates, single_digit, technique):
+    """
+    Alternating inference chains. A node is "cell holds digit". Strong links (if one
+    node is false the other is true) join the only two places of a digit in a unit
+    and, unless ``single_digit``, the two candidates of a bivalue cell. Weak links
+    (both cannot be true) join a digit in peer cells and two digits of one cell.
+    A chain that starts and ends with a strong link proves one of its end nodes true.
+    """
+    size, peer_sets = layout.size, layout.peer_sets
+    strong = {}
+    for unit in layout.units:
+        for digit in range(size):
+            bit = 1 << digit
+            spots = [cell for cell in unit if candidates[cell] & bit]
+            if len(spots) == 2:
+                first, second = spots[0] * size + digit, spots[1] * size + digit
+                strong.setdefault(first, set()).add(second)
+                strong.setdefault(second, set()).add(first)
+    if not single_digit:
+        for cell, mask in enumerate(candidates):
+            if layout.popcount[mask] == 2:
+                first, second = (cell * size + digit - 1 for digit in _digits(mask))
+                strong.setdefault(first, set()).add(second)
+                strong.setdefault(second, set()).add(first)
+
+    # Weak links only matter between nodes that can continue the chain.
+    weak = {node: [] for node in strong}
+    for node, other in combinations(strong, 2):
+        cell, digit = divmod(node, size)
+        other_cell, other_digit = divmod(other, size)
+        if (digit == other_digit and other_cell in peer_sets[cell]) or (cell == other_cell and not single_digit):
+            weak[node].append(other)
+            weak[other].append(node)
+
+    for start in strong:
+        start_cell, start_digit = divmod(start, size)
+        # Nodes proven true when ``start`` is false, and nodes proven false, each
+        # mapped to the node before it on the chain.
+        parents = {}
+        on_chain = {start: None}
+        queue = deque()
+        for node in strong[start]:
+            parents[node] = start
+            queue.append((node, 1))
+        while queue:
+            node, length = queue.popleft()
+            end_cell, end_digit = divmod(node, size)
+            if length >= 3:
+                eliminations = _chain_eliminations(
+                    layout, candidates, start_cell, start_digit, end_cell, end_digit
+                )
+                if eliminations:
+                    path, proven = [node], True
+                    while path[-1] != start:
+                        path.append(parents[path[-1]] if proven else on_chain[path[-1]])
+                        proven = not proven
+                    return Step(technique, eliminations=eliminations, cells=tuple(n // size for n in reversed(path)))
+            for false_node in weak[node]:
+                if false_node in on_chain:
+                    continue
+                on_chain[false_node] = node
+                for true_node in strong[false_node]:
+                    if true_node not in parents and true_node != start:
+                        parents[true_node] = false_node
+                        queue.append((true_node, length + 2))
+    return None
+
+
+def _chain_eliminations(layout, candidates, start_cell, start_digit, end_cell, end_digit):
+    """
+    Candidates removed by knowing that one of two nodes is true.
+    :return: Tuple of (cell, digit).
+    """
+    if start_cell == end_cell:
+        if start_digit == end_digit:
+            return ()
+        keep = (1 << start_digit) | (1 << end_digit)
+        return _eliminations(candidates, (start_cell,), layout.all_digits & ~keep)
+
+    peer_sets = layout.peer_sets
+    if start_digit == end_digit:
+        targets = sorted(peer_sets[start_cell] & peer_sets[end_cell])
+        return _eliminations(candidates, targets, 1 << start_digit)
+    if end_cell not in peer_sets[start_cell]:
+        return ()
+    return _eliminations(candidates, (start_cell,), 1 << end_digit) + _eliminations(
+        candidates, (end_cell,), 1 << start_digit
+    )
+
+
+_FINDERS = {
+    HIDDEN_SINGLE: _hidden_single,
+    NAKED_SINGLE: _naked_single,
+    POINTING: lambda layout, candidates: _locked_candidates(layout, candidates, False),
+    CLAIMING: lambda layout, candidates: _locked_candidates(layout, candidates, True),
+    NAKED_PAIR: lambda layout, candidates: _naked_subset(layout, candidates, 2, NAKED_PAIR),
+    X_WING: lambda layout, candidates: _fish(layout, candidates, 2, X_WING),
+    HIDDEN_PAIR: lambda layout, candidates: _hidden_subset(layout, candidates, 2, HIDDEN_PAIR),
+    NAKED_TRIPLE: lambda layout, candidates: _naked_subset(layout, candidates, 3, NAKED_TRIPLE),
+    SWORDFISH: lambda layout, candidates: _fish(layout, candidates, 3, SWORDFISH),
+    HIDDEN_TRIPLE: lambda layout, candidates: _hidden_subset(layout, candidates, 3, HIDDEN_TRIPLE),
+    XY_WING: _xy_wing,
+    NAKED_QUAD: lambda layout, candidates: _naked_subset(layout, candidates, 4, NAKED_QUAD),
+    JELLYFISH: lambda layout, candidates: _fish(layout, candidates, 4, JELLYFISH),
+    HIDDEN_QUAD: lambda layout, candidates: _hidden_subset(layout, candidates, 4, HIDDEN_QUAD),
+    X_CHAIN: lambda layout, candidates: _chain(layout, candidates, True, X_CHAIN),
+    ALTERNATING_CHAIN: lambda layout, candidates: _chain(layout, candidates, False, ALTERNATING_CHAIN),
+}
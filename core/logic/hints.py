@@ -0,0 +1,204 @@
+import math
+import time
+from dataclasses import dataclass
+
+from core.entities.board import Board
+from core.logic.bitmask_engine import BitmaskEngine
+from core.logic.grader import BACKTRACKING, BACKTRACKING_RATING, HIDDEN_SINGLE, NAKED_SINGLE, Grader
+from core.logic.solution_cache import DEFAULT_CACHE
+
+
+@dataclass(frozen=True)
+class Hint:
+    """
+    The next digit a player can place, and the deductions behind it.
+    Rows and columns are 0-based, digits 1-based.
+    """
+
+    technique: str
+    row: int
+    col: int
+    digit: int
+    rating: float
+    # (row, col) of the cells the placing step looks at, e.g. the unit of a hidden single.
+    cells: tuple = ()
+    # Candidate eliminations needed first: (technique, ((row, col, digit), ...)) per step.
+    eliminations: tuple = ()
+
+    def describe(self):
+        """
+        Explain the hint in one line.
+        :return: Text such as "Hidden single: row 3 has one place for 7, R3C5".
+        """
+        where = f"R{self.row + 1}C{self.col + 1}"
+        if self.technique == HIDDEN_SINGLE:
+            text = f"Hidden single: {_unit_name(self.cells)} has one place for {self.digit}, {where}"
+        elif self.technique == NAKED_SINGLE:
+            text = f"Naked single: {where} can only be {self.digit}"
+        else:
+            return f"No logical step found: {where} is {self.digit}"
+        if self.eliminations:
+            techniques = dict.fromkeys(technique.replace("_", " ") for technique, _ in self.eliminations)
+            text += f" (after {', '.join(techniques)})"
+        return text
+
+    def as_dict(self):
+        """
+        Convert the hint to plain data, e.g. for JSON.
+        :return: Dict of the hint's fields plus its "text".
+        """
+        return {
+            "technique": self.technique,
+            "row": self.row,
+            "col": self.col,
+            "digit": self.digit,
+            "rating": self.rating,
+            "cells": [list(cell) for cell in self.cells],
+            "eliminations": [
+                {"technique": technique, "removed": [list(removed) for removed in candidates]}
+                for technique, candidates in self.eliminations
+            ],
+            "text": self.describe(),
+        }
+
+
+class HintEngine:
+    """
+    Finds the next logical move of a game in progress.
+
+    The engine keeps a BitmaskEngine in step with the board: placements are applied
+    as they happen, and candidates eliminated while looking for a hint stay
+    eliminated, so each hint only searches from where the previous one stopped
+    instead of solving the puzzle again. The hint itself is kept until its cell is
+    filled. Placements are assumed to be correct; clearing a cell (or placing a
+    digit already ruled out) rebuilds the state from the board on the next search.
+
+    The search can run in slices (see advance()), so a caller with a frame budget
+    never waits for the slow techniques of a hard puzzle in one go.
+    """
+
+    def __init__(self, board, solution=None, grader=None):
+        """
+        Load a puzzle or game in progress.
+        :param board: Board or 2D list representing the Sudoku board; it is not modified.
+        :param solution: Optional solved Board, used when no technique applies. It is
+            computed on first need otherwise.
+        :param grader: Grader whose techniques are used (default: all of them).
+        """
+        self.grader = grader if grader is not None else Grader()
+        self.solution = solution
+        self.engine = BitmaskEngine(board)
+        self.size = self.engine.layout.size
+        self._hint = None
+        self._found = False
+        self._eliminations = []
+        # Cell values to rebuild the engine from, after a change it cannot apply in place.
+        self._pending = None
+
+    def place(self, row, col, digit):
+        """
+        Record a change to the board.
+        :param digit: Digit placed, or 0 if the cell was cleared.
+        """
+        engine = self.engine
+        cell = row * self.size + col
+        cells = engine.cells if self._pending is None else self._pending
+        if cells[cell] == digit:
+            return
+        bit = 1 << (digit - 1) if digit else 0
+        if self._pending is None and not cells[cell] and bit and engine.candidates(cell) & bit:
+            engine.assign(cell, bit)
+        else:
+            if self._pending is None:
+                self._pending = list(engine.cells)
+            self._pending[cell] = digit
+        hint = self._hint
+        if self._found and (self._pending is not None or hint is None or (hint.row, hint.col) == (row, col)):
+            self._hint, self._found = None, False
+
+    def advance(self, seconds=None):
+        """
+        Search for the next hint.
+        :param seconds: Optional time limit. The search stops after the first deduction
+            past it, and the next call carries on where it stopped.
+        :return: True once next_hint() can answer without searching.
+        """
+        if self._found:
+            return True
+        if self._pending is not None:
+            self.engine = BitmaskEngine(Board(self.size, self._pending))
+            self._pending = None
+            self._eliminations = []
+
+        engine = self.engine
+        hint = None
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        while engine.consistent and engine.empties:
+            step = self.grader.next_step(engine)
+            if step is None:
+                hint = self._from_solution()
+                break
+            if step.placements:
+                hint = self._from_step(step)
+                break
+            self.grader.apply(engine, step)
+            self._eliminations.append(step)
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+        self._hint, self._found = hint, True
+        return True
+
+    def next_hint(self):
+        """
+        Find the easiest next placement, applying any eliminations it needs first.
+        :return: Hint, or None if the board is full, broken or has no solution.
+        """
+        self.advance()
+        return self._hint
+
+    def _from_step(self, step):
+        """Turn a placing grader Step into a Hint, with the eliminations that led to it."""
+        size = self.size
+        (cell, digit), = step.placements
+        rating = max([step.rating] + [found.rating for found in self._eliminations])
+        return Hint(
+            step.technique, cell // size, cell % size, digit, rating,
+            cells=tuple(divmod(seen, size) for seen in step.cells), eliminations=self._take_eliminations(),
+        )
+
+    def _from_solution(self):
+        """Hint the cell with the fewest candidates from the solution, when no technique applies."""
+        engine = self.engine
+        if self.solution is None:
+            solution = Board(self.size, engine.cells)
+            if not DEFAULT_CACHE.solve(solution):
+                return None
+            self.solution = solution
+        cell = min(engine.empties, key=lambda empty: engine.layout.popcount[engine.candidates(empty)])
+        row, col = divmod(cell, self.size)
+        return Hint(
+            BACKTRACKING, row, col, self.solution[row, col], BACKTRACKING_RATING, eliminations=self._take_eliminations()
+        )
+
+    def _take_eliminations(self):
+        """Hand over the eliminations found since the last hint, as (technique, ((row, col, digit), ...))."""
+        size = self.size
+        eliminations = tuple(
+            (found.technique, tuple((cell // size, cell % size, digit) for cell, digit in found.eliminations))
+            for found in self._eliminations
+        )
+        self._eliminations = []
+        return eliminations
+
+
+def _unit_name(cells):
+    """Name the row, column or box made of ``cells`` (row, col) pairs."""
+    rows = {row for row, _ in cells}
+    cols = {col for _, col in cells}
+    if len(rows) == 1:
+        return f"row {next(iter(rows)) + 1}"
+    if len(cols) == 1:
+        return f"column {next(iter(cols)) + 1}"
+    box_size = math.isqrt(len(cells))
+    row, col = min(cells)
+    return f"box {row // box_size * box_size + col // box_size + 1}"
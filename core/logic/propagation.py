@@ -0,0 +1,241 @@
+import time
+from functools import lru_cache
+from itertools import combinations, islice
+
+from core.logic.units import board_layout
+
+NAKED_SINGLES = "naked_singles"
+HIDDEN_SINGLES = "hidden_singles"
+POINTING = "pointing"
+NAKED_SUBSETS = "naked_subsets"
+
+# Cheapest first: after any technique makes progress the loop restarts from the top.
+ALL_TECHNIQUES = (NAKED_SINGLES, HIDDEN_SINGLES, POINTING, NAKED_SUBSETS)
+
+NAKED_SUBSET_SIZES = (2, 3)
+
+
+@lru_cache(maxsize=None)
+def box_line_segments(size):
+    """
+    Build every box/line intersection of a board size.
+    :param size: Board size.
+    :return: Tuple of (segment cells, rest of the line, rest of the box).
+    """
+    layout = board_layout(size)
+    segments = []
+    for box in layout.box_units:
+        for lines in (layout.row_units, layout.col_units):
+            for line in lines:
+                segment = tuple(cell for cell in line if cell in box)
+                if segment:
+                    segments.append((
+                        segment,
+                        tuple(cell for cell in line if cell not in segment),
+                        tuple(cell for cell in box if cell not in segment),
+                    ))
+    return tuple(segments)
+
+
+class Contradiction(Exception):
+    """Raised by a technique when the current board state has no solution."""
+
+
+class Propagator:
+    """
+    Applies logical techniques to a BitmaskEngine until none of them makes progress.
+
+    Assignments and eliminations go through the engine, so they are recorded on its
+    trail and undone together with the branch that triggered them.
+    """
+
+    def __init__(self, techniques=ALL_TECHNIQUES):
+        """
+        Initialize the propagator.
+        :param techniques: Iterable of technique names to enable (see ALL_TECHNIQUES).
+        """
+        techniques = set(techniques)
+        unknown = techniques.difference(ALL_TECHNIQUES)
+        if unknown:
+            raise ValueError(f"Unknown propagation techniques: {', '.join(sorted(unknown))}.")
+
+        self.techniques = tuple(name for name in ALL_TECHNIQUES if name in techniques)
+        self._steps = tuple(getattr(self, f"_{name}") for name in self.techniques)
+
+    def propagate(self, engine):
+        """
+        Run the enabled techniques to a fixpoint.
+        :param engine: BitmaskEngine to update in place; its tracer, if any, gets an
+            on_propagation event for every technique run.
+        :return: False if a contradiction was found, True otherwise.
+        """
+        tracer = engine.tracer
+        try:
+            while engine.empties:
+                for technique, step in zip(self.techniques, self._steps):
+                    if tracer is None:
+                        progress = step(engine)
+                    else:
+                        progress = self._traced_step(technique, step, engine, tracer)
+                    if progress:
+                        break
+                else:
+                    return True
+        except Contradiction:
+            return False
+        return True
+
+    @staticmethod
+    def _traced_step(technique, step, engine, tracer):
+        """
+        Run one technique and report what it did from the engine's trail.
+        :return: True if the technique made progress.
+        """
+        mark = len(engine.trail)
+        start = time.perf_counter()
+        try:
+            return step(engine)
+        finally:
+            seconds = time.perf_counter() - start
+            placed = eliminated = 0
+            popcount = engine.layout.popcount
+            for _, bit, removed in islice(engine.trail, mark, None):
+                if bit:
+                    placed += 1
+                else:
+                    eliminated += popcount[removed]
+            tracer.on_propagation(technique, placed, eliminated, seconds)
+
+    @staticmethod
+    def _naked_singles(engine):
+        """
+        Place every empty cell that has exactly one candidate.
+        :return: True if any cell was placed.
+        """
+        progress = False
+        for cell in list(engine.empties):
+            mask = engine.candidates(cell)
+            if not mask:
+                raise Contradiction
+            if not mask & (mask - 1):
+                engine.assign(cell, mask)
+                progress = True
+        return progress
+
+    @staticmethod
+    def _hidden_singles(engine):
+        """
+        Place every digit that fits in only one cell of a row, column or box.
+        :return: True if any cell was placed.
+        """
+        cells = engine.cells
+        all_digits = engine.all_digits
+        progress = False
+        for unit in engine.layout.units:
+            once = twice = placed = 0
+            for cell in unit:
+                if cells[cell]:
+                    placed |= 1 << (cells[cell] - 1)
+                    continue
+                mask = engine.candidates(cell)
+                twice |= once & mask
+                once |= mask
+
+            if (once | placed) != all_digits:
+                raise Contradiction
+
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for cell in unit:
+                    if not cells[cell] and engine.candidates(cell) & bit:
+                        engine.assign(cell, bit)
+                        progress = True
+                        break
+                else:
+                    # The only cell for this digit already took another hidden single.
+                    raise Contradiction
+        return progress
+
+    @staticmethod
+    def _pointing(engine):
+        """
+        Apply pointing and claiming: when a digit is confined to one box/line
+        intersection within the box (or within the line), remove it from the rest
+        of the line (or the rest of the box).
+        :return: True if any candidate was eliminated.
+        """
+        cells = engine.cells
+        candidates = [0 if value else engine.candidates(cell) for cell, value in enumerate(cells)]
+        progress = False
+        for segment, line_rest, box_rest in box_line_segments(engine.layout.size):
+            inside = 0
+            for cell in segment:
+                inside |= candidates[cell]
+            if not inside:
+                continue
+
+            outside_line = outside_box = 0
+            for cell in line_rest:
+                outside_line |= candidates[cell]
+            for cell in box_rest:
+                outside_box |= candidates[cell]
+
+            pointing = inside & ~outside_box & outside_line
+            if pointing:
+                progress |= Propagator._eliminate(engine, candidates, line_rest, pointing)
+
+            claiming = inside & ~outside_line & outside_box
+            if claiming:
+                progress |= Propagator._eliminate(engine, candidates, box_rest, claiming)
+        return progress
+
+    @staticmethod
+    def _naked_subsets(engine):
+        """
+        Apply naked pairs and triples: when N cells of a unit share exactly N
+        candidates, remove those digits from the other cells of the unit.
+        :return: True if any candidate was eliminated.
+        """
+        cells = engine.cells
+        popcount = engine.layout.popcount
+        progress = False
+        for unit in engine.layout.units:
+            open_cells = [(cell, engine.candidates(cell)) for cell in unit if not cells[cell]]
+            for size in NAKED_SUBSET_SIZES:
+                if len(open_cells) <= size:
+                    break
+
+                small = [entry for entry in open_cells if popcount[entry[1]] <= size]
+                for subset in combinations(small, size):
+                    union = 0
+                    for _, mask in subset:
+                        union |= mask
+                    count = popcount[union]
+                    if count < size:
+                        raise Contradiction
+                    if count > size:
+                        continue
+
+                    members = {cell for cell, _ in subset}
+                    for cell, mask in open_cells:
+                        if cell not in members and mask & union:
+                            progress |= engine.exclude(cell, union)
+        return progress
+
+    @staticmethod
+    def _eliminate(engine, candidates, targets, mask):
+        """
+        Eliminate ``mask`` from the open cells in ``targets``, keeping ``candidates`` current.
+        :return: True if any candidate was eliminated.
+        """
+        progress = False
+        for cell in targets:
+            if candidates[cell] & mask:
+                engine.exclude(cell, mask)
+                candidates[cell] &= ~mask
+                if not candidates[cell]:
+                    raise Contradiction
+                progress = True
+        return progress
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+from config.settings import SOLUTION_CACHE_SIZE, SOLVER_STRATEGY
+from core.entities.board import Board, flat_cells, store_cells
+from core.logic.canonical import canonical_form
+from core.logic.sudoku_solver import SudokuSolver
+
+_MISSING = object()
+
+
+class SolutionCache:
+    """
+    Bounded LRU cache of solutions, keyed by the canonical form of the puzzle.
+
+    Puzzles that are the same up to transposition, band/stack and row/column
+    permutations and digit relabelling share one entry: the solution is stored in
+    canonical coordinates and mapped back through each puzzle's own transform.
+    Canonical forms are themselves remembered per exact puzzle, so solving the same
+    puzzle again (for example when a game is reset) skips the canonical search.
+
+    With a ``store`` (a puzzles.store.PuzzleStore), misses are looked up on disk
+    before solving, so puzzles seen in an earlier run are not solved again. A
+    puzzle the store lacks is solved here and handed to the store's background
+    thread for grading and saving, so a miss never waits for the grader or a write.
+    """
+
+    def __init__(self, maxsize=SOLUTION_CACHE_SIZE, canonical=True, store=None):
+        """
+        Initialize the cache.
+        :param maxsize: Maximum number of solutions kept; the least recently used is evicted.
+        :param canonical: Key by canonical form (True) or by the exact puzzle only (False).
+        :param store: Optional PuzzleStore behind the cache.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.canonical = canonical
+        self.store = store
+        self._entries = OrderedDict()
+        self._keys = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def solve(self, board, strategy=SOLVER_STRATEGY):
+        """
+        Solve the board in place, like SudokuSolver.solve, reusing a cached solution when possible.
+        :param board: Board or 2D list representing the Sudoku board.
+        :param strategy: Solver backend used on a cache miss.
+        :return: True if solved, False otherwise.
+        """
+        if not SudokuSolver.is_valid_sudoku(board):
+            return False
+
+        size, cells = flat_cells(board)
+        key, transform = self._key(size, cells)
+        solution = self._entries.get(key, _MISSING)
+        if solution is _MISSING:
+            self.misses += 1
+            solution = self._from_store(Board(size, cells), transform) if self.store is not None else _MISSING
+            if solution is _MISSING:
+                work = Board(size, transform.apply(cells) if transform else cells)
+                solution = bytes(work.cells) if SudokuSolver.solve(work, strategy=strategy) else None
+                if self.store is not None:
+                    self.store.add_later(Board(size, cells))
+            self._remember(self._entries, key, solution)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        if solution is None:
+            return False
+        solution = list(solution)
+        store_cells(board, transform.invert(solution) if transform else solution)
+        return True
+
+    def _from_store(self, board, transform):
+        """
+        Look a solution up in the store.
+        :return: Solution cells in canonical coordinates, as bytes, None if the puzzle is
+            stored as unsolvable, or _MISSING if it is not stored.
+        """
+        record = self.store.get(board)
+        if record is None:
+            return _MISSING
+        if record.solution is None:
+            return None
+        cells = list(Board.from_string(record.solution).cells)
+        return bytes(transform.apply(cells) if transform else cells)
+
+    def stats(self):
+        """
+        Get the cache counters.
+        :return: Dict with "hits", "misses", "evictions", "size", "maxsize" and "hit_rate".
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self._keys.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def _key(self, size, cells):
+        """
+        Get the cache key of a puzzle.
+        :return: Tuple (key, Transform to canonical coordinates or None).
+        """
+        exact = (size, bytes(cells))
+        if not self.canonical:
+            return exact, None
+
+        found = self._keys.get(exact)
+        if found is None:
+            form, transform = canonical_form(Board(size, cells))
+            found = ((size, form), transform)
+            self._remember(self._keys, exact, found)
+        else:
+            self._keys.move_to_end(exact)
+        return found
+
+    def _remember(self, entries, key, value):
+        """Insert into an LRU map, evicting the oldest entry when it is full."""
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            if entries is self._entries:
+                self.evictions += 1
+
+
+# Shared by the game, so resets and repeated puzzles are not solved twice.
+DEFAULT_CACHE = SolutionCache()
@@ -0,0 +1,153 @@
+import math
+from contextvars import ContextVar
+
+from core.logic.tracing import CountingTracer
+
+PHASES = ("validate", "setup", "search", "total")
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+_active_collector = ContextVar("active_stats_collector", default=None)
+
+
+class SolveStats(CountingTracer):
+    """
+    Statistics of a single solve: search counters, propagation work per technique
+    and wall time per phase.
+
+    Pass an instance as ``stats`` to SudokuSolver.solve or count_solutions to fill it.
+    The "search" phase includes propagation; ``propagation_seconds`` isolates it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.placements = {}
+        self.eliminations = {}
+        self.technique_seconds = {}
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.solved = None
+
+    def on_propagation(self, technique, placed, eliminated, seconds):
+        self.placements[technique] = self.placements.get(technique, 0) + placed
+        self.eliminations[technique] = self.eliminations.get(technique, 0) + eliminated
+        self.technique_seconds[technique] = self.technique_seconds.get(technique, 0.0) + seconds
+
+    @property
+    def propagation_seconds(self):
+        return sum(self.technique_seconds.values())
+
+    def as_dict(self):
+        """
+        Flatten the statistics into one level of numeric metrics.
+        :return: Dict of metric name to value.
+        """
+        metrics = super().as_dict()
+        metrics["placements"] = sum(self.placements.values())
+        metrics["eliminations"] = sum(self.eliminations.values())
+        metrics["propagation_seconds"] = self.propagation_seconds
+        for phase, seconds in self.phase_seconds.items():
+            metrics[f"{phase}_seconds"] = seconds
+        for technique in self.technique_seconds:
+            metrics[f"{technique}_placements"] = self.placements[technique]
+            metrics[f"{technique}_eliminations"] = self.eliminations[technique]
+            metrics[f"{technique}_seconds"] = self.technique_seconds[technique]
+        return metrics
+
+
+class StatsCollector:
+    """
+    Collects the statistics of every solve made while it is active.
+
+    Use it as a context manager around a batch: each SudokuSolver.solve or
+    count_solutions call inside the ``with`` block records a SolveStats, and the
+    collector then reports percentiles and histograms per metric.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active_collector.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_collector.reset(self._token)
+        self._token = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, stats):
+        """
+        Record the statistics of one solve.
+        :param stats: SolveStats to record.
+        """
+        self.records.append(stats.as_dict())
+
+    def values(self, metric):
+        """
+        Get the values of a metric across all recorded solves, sorted ascending.
+        :param metric: Metric name from SolveStats.as_dict.
+        :return: Sorted list of values (solves without the metric count as 0).
+        """
+        return sorted(record.get(metric, 0) for record in self.records)
+
+    def percentiles(self, metric, points=DEFAULT_PERCENTILES):
+        """
+        Compute nearest-rank percentiles of a metric.
+        :param metric: Metric name from SolveStats.as_dict.
+        :param points: Percentiles to compute, between 0 and 100.
+        :return: Dict of percentile to value (empty if nothing was recorded).
+        """
+        values = self.values(metric)
+        if not values:
+            return {}
+        return {point: values[max(math.ceil(point / 100 * len(values)) - 1, 0)] for point in points}
+
+    def histogram(self, metric):
+        """
+        Bucket a metric into power-of-two ranges, which suits heavy-tailed values
+        like node counts and solve times.
+        :param metric: Metric name from SolveStats.as_dict.
+        :return: List of (upper bound, count) pairs in ascending order; a value v
+            falls in the first bucket whose upper bound is >= v.
+        """
+        values = self.values(metric)
+        buckets = {}
+        for value in values:
+            bound = 2.0 ** math.ceil(math.log2(value)) if value > 0 else 0
+            buckets[bound] = buckets.get(bound, 0) + 1
+        return sorted(buckets.items())
+
+    def summary(self, points=DEFAULT_PERCENTILES):
+        """
+        Summarize every metric that was recorded.
+        :param points: Percentiles to include.
+        :return: Dict of metric name to {"count", "mean", "p<N>"..., "max"}.
+        """
+        metrics = sorted({metric for record in self.records for metric in record})
+        summary = {}
+        for metric in metrics:
+            values = self.values(metric)
+            entry = {"count": len(values), "mean": sum(values) / len(values)}
+            for point, value in self.percentiles(metric, points).items():
+                entry[f"p{point}"] = value
+            entry["max"] = values[-1]
+            summary[metric] = entry
+        return summary
+
+
+def collect_stats():
+    """
+    Start collecting statistics for a batch of solves.
+    :return: StatsCollector to use as a context manager.
+    """
+    return StatsCollector()
+
+
+def active_collector():
+    """
+    Get the collector of the innermost active ``collect_stats()`` block.
+    :return: StatsCollector or None.
+    """
+    return _active_collector.get()
@@ -1,14 +1,154 @@
-import pygame
-from config.logging_config import logging
-from config.settings import VISUALIZATION_DELAY_MS
-from utils.helpers import is_safe_to_place
+import logging
+import time
+
+from config.settings import PROPAGATION_TECHNIQUES, SOLVER_STRATEGY, COUNT_STRATEGY
+from core.entities.board import Board, flat_cells
+from core.logic.bitmask_engine import BitmaskEngine
+from core.logic.dlx_solver import DLXSolver
+from core.logic.propagation import Propagator
+from core.logic.stats import SolveStats, active_collector
+from core.logic.tracing import TracerGroup
+from core.logic.units import board_layout
+from utils.helpers import is_safe_to_place, print_board
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_BITMASK = "bitmask"
+STRATEGY_DLX = "dlx"
+STRATEGIES = (STRATEGY_BITMASK, STRATEGY_DLX)
+
+# Fewest givens a uniquely solvable puzzle can have, per board size; unknown for larger boards.
+MINIMUM_CLUES = {4: 4, 9: 17}
+
 
 class SudokuSolver:
 
     @staticmethod
-    def solve(board):
+    def solve(board, strategy=SOLVER_STRATEGY, techniques=PROPAGATION_TECHNIQUES, tracer=None, stats=None):
+        """
+        Solve the Sudoku board in place.
+        :param board: Board or 2D list representing the Sudoku board.
+        :param strategy: Solver backend, "bitmask" (backtracking with propagation) or "dlx" (Dancing Links).
+        :param techniques: Propagation techniques run before every branch by the bitmask backend.
+        :param tracer: Optional SolverTracer notified of nodes, assignments, backtracks and solutions.
+        :param stats: Optional SolveStats to fill with counters and phase timings. Inside a
+            ``collect_stats()`` block one is created automatically and recorded.
+        :return: True if solved, False otherwise.
+        """
+        collector = active_collector()
+        if stats is None and collector is None:
+            if not SudokuSolver.is_valid_sudoku(board):
+                return False
+
+            engine = SudokuSolver._create_engine(board, strategy, techniques, tracer)
+            if not engine.solve():
+                return False
+
+            engine.write_to(board)
+            return True
+
+        stats = stats if stats is not None else SolveStats()
+        start = time.perf_counter()
+        solved = SudokuSolver.is_valid_sudoku(board)
+        validated = time.perf_counter()
+        engine = None
+        if solved:
+            engine = SudokuSolver._create_engine(board, strategy, techniques, SudokuSolver._with_stats(tracer, stats))
+        created = time.perf_counter()
+        if engine is not None:
+            solved = engine.solve()
+            if solved:
+                engine.write_to(board)
+        SudokuSolver._record_phases(stats, collector, start, validated, created)
+        stats.solved = solved
+        return solved
+
+    @staticmethod
+    def count_solutions(
+        board, limit=2, strategy=COUNT_STRATEGY, techniques=PROPAGATION_TECHNIQUES, tracer=None, stats=None
+    ):
         """
-        Solve the Sudoku board using backtracking with optimizations.
+        Count the solutions of a board without modifying it, stopping at ``limit``.
+        With the default limit of 2 this answers "does the puzzle have a unique solution?".
+        :param board: Board or 2D list representing the Sudoku board.
+        :param limit: Stop counting once this many solutions are found (None to count all).
+        :param strategy: Solver backend, "dlx" or "bitmask".
+        :param techniques: Propagation techniques run before every branch by the bitmask backend.
+        :param tracer: Optional SolverTracer notified of nodes, assignments, backtracks and solutions.
+        :param stats: Optional SolveStats to fill, as for solve().
+        :return: Number of solutions found, at most ``limit``; 0 for a malformed board.
+        :raises ValueError: If ``limit`` is not None or at least 1.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be None or at least 1.")
+
+        collector = active_collector()
+        if stats is None and collector is None:
+            if not SudokuSolver.is_well_formed(board):
+                return 0
+            return SudokuSolver._create_engine(board, strategy, techniques, tracer).count(limit)
+
+        stats = stats if stats is not None else SolveStats()
+        start = time.perf_counter()
+        well_formed = SudokuSolver.is_well_formed(board)
+        validated = time.perf_counter()
+        found = 0
+        created = validated
+        if well_formed:
+            engine = SudokuSolver._create_engine(board, strategy, techniques, SudokuSolver._with_stats(tracer, stats))
+            created = time.perf_counter()
+            found = engine.count(limit)
+        SudokuSolver._record_phases(stats, collector, start, validated, created)
+        stats.solved = found > 0
+        return found
+
+    @staticmethod
+    def _with_stats(tracer, stats):
+        """
+        Combine a caller's tracer with the SolveStats being filled.
+        :return: Tracer to hand to the engine.
+        """
+        return stats if tracer is None else TracerGroup(tracer, stats)
+
+    @staticmethod
+    def _record_phases(stats, collector, start, validated, created):
+        """
+        Store phase timings in ``stats`` and record it in the active collector.
+        :param stats: SolveStats being filled.
+        :param collector: Active StatsCollector or None.
+        :param start: Time the call started.
+        :param validated: Time validation finished.
+        :param created: Time the engine was built; the search ran until now.
+        """
+        end = time.perf_counter()
+        stats.phase_seconds["validate"] += validated - start
+        stats.phase_seconds["setup"] += created - validated
+        stats.phase_seconds["search"] += end - created
+        stats.phase_seconds["total"] += end - start
+        if collector is not None:
+            collector.add(stats)
+
+    @staticmethod
+    def _create_engine(board, strategy, techniques, tracer=None):
+        """
+        Build the solver backend for a strategy.
+        :param board: Board or 2D list representing the Sudoku board.
+        :param strategy: One of STRATEGIES.
+        :param techniques: Propagation techniques for the bitmask backend.
+        :param tracer: Optional SolverTracer for the engine.
+        :return: Engine exposing solve(), count(limit) and write_to(board).
+        """
+        if strategy == STRATEGY_BITMASK:
+            return BitmaskEngine(board, Propagator(techniques) if techniques else None, tracer)
+        if strategy == STRATEGY_DLX:
+            return DLXSolver(board, tracer)
+        raise ValueError(f"Unknown solver strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}.")
+
+    @staticmethod
+    def _solve_with_candidates(board):
+        """
+        Solve the Sudoku board with the original dict-of-sets candidate backtracker.
+        Kept as a reference implementation for benchmarks.
         :param board: 2D list representing the Sudoku board.
         :return: True if solved, False otherwise.
         """
@@ -16,40 +156,30 @@ class SudokuSolver:
 
         return SudokuSolver._backtrack(board, candidates)
 
-
     @staticmethod
-    def solve_live(grid):
-            """
-            Solve the Sudoku board using backtracking with live updates.
-            :param grid: Grid object for rendering the board.
-            :return: True if solved, False otherwise.
-            """
-            empty = grid.find_empty()
-            if not empty:
-                return True
-            row, col = empty
-
-            for num in range(1, 10):
-                if is_safe_to_place(grid.model, num, (row, col)):
-                    grid.model[row][col] = num
-                    grid.cubes[row][col].set(num)
-                    grid.update_model()
-                    grid.cubes[row][col].draw_change(grid.win, True)
-                    pygame.display.update()
-                    pygame.time.delay(VISUALIZATION_DELAY_MS)
-
-                    if SudokuSolver.solve_live(grid):
-                        return True
-
-                    grid.model[row][col] = 0
-                    grid.cubes[row][col].set(0)
-                    grid.update_model()
-                    grid.cubes[row][col].draw_change(grid.win, False)
-                    pygame.display.update()
-                    pygame.time.delay(VISUALIZATION_DELAY_MS)
-
+    def solve_steps(board, techniques=PROPAGATION_TECHNIQUES):
+        """
+        Solve the Sudoku board one change at a time, with the same engine and
+        propagation as solve(), for showing the search as it happens.
+        The board itself is not modified; each change is only reported.
+        :param board: Board or 2D list representing the Sudoku board.
+        :param techniques: Propagation techniques run before every branch.
+        :return: Generator of (row, col, value) changes, value 0 when backtracking clears
+            a cell. Its return value is True if solved, False otherwise.
+        """
+        if not SudokuSolver.is_valid_sudoku(board):
             return False
 
+        engine = BitmaskEngine(board, Propagator(techniques) if techniques else None)
+        size = engine.layout.size
+        steps = engine.solve_steps()
+        while True:
+            try:
+                cell, value = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            yield cell // size, cell % size, value
+
     @staticmethod
     def _initialize_candidates(board):
         """
@@ -73,15 +203,9 @@ class SudokuSolver:
         :param col: Column index of the cell.
         :return: Set of valid numbers for the cell.
         """
-        used = set(board[row])
-        used.update(board[i][col] for i in range(len(board)))
-
-        box_start_row, box_start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_start_row, box_start_row + 3):
-            for j in range(box_start_col, box_start_col + 3):
-                used.add(board[i][j])
-
-        return {num for num in range(1, 10) if num not in used}
+        layout = board_layout(len(board))
+        used = {board[r][c] for r, c in layout.peer_positions[row * layout.size + col]}
+        return {num for num in range(1, layout.size + 1) if num not in used}
 
     @staticmethod
     def _backtrack(board, candidates):
@@ -91,50 +215,43 @@ class SudokuSolver:
         :param candidates: Dictionary of possible candidates for each empty cell.
         :return: True if solved, False otherwise.
         """
-        logging.debug("Candidates: %s", candidates)
-
         if not SudokuSolver.is_valid_sudoku(board):
             return False
 
         if not candidates:
-            logging.debug("No candidates left. Puzzle solved. Exiting _backtrack.")
             return True
 
-
         cell = min(candidates, key=lambda k: len(candidates[k]))
         row, col = cell
-        logging.debug("Trying to solve cell (%d, %d) with candidates: %s", row, col, candidates[cell])
 
         for num in candidates[cell]:
             if SudokuSolver._is_safe_to_place(board, num, (row, col)):
-                logging.debug("Placing number %d in cell (%d, %d)", num, row, col)
                 board[row][col] = num
-                new_candidates = SudokuSolver._update_candidates(candidates, cell, num)
+                new_candidates = SudokuSolver._update_candidates(candidates, cell, num, board_layout(len(board)))
 
                 if SudokuSolver._backtrack(board, new_candidates):
                     return True
 
-                logging.debug("Backtracking: Removing number %d from cell (%d, %d)", num, row, col)
                 board[row][col] = 0
 
-        logging.debug("Exiting _backtrack: No solution found for cell (%d, %d)", row, col)
         return False
 
     @staticmethod
-    def _update_candidates(candidates, cell, num):
+    def _update_candidates(candidates, cell, num, layout):
         """
         Update the candidates dictionary after placing a number.
         :param candidates: Current candidates' dictionary.
         :param cell: Cell where the number was placed.
         :param num: Number placed in the cell.
+        :param layout: BoardLayout of the board.
         :return: Updated candidates dictionary.
         """
         row, col = cell
         new_candidates = {k: v.copy() for k, v in candidates.items() if k != cell}
 
-        for r, c in new_candidates:
-            if r == row or c == col or (r // 3 == row // 3 and c // 3 == col // 3):
-                new_candidates[(r, c)].discard(num)
+        for peer in layout.peer_positions[row * layout.size + col]:
+            if peer in new_candidates:
+                new_candidates[peer].discard(num)
 
         return {k: v for k, v in new_candidates.items() if v}
 
@@ -147,21 +264,7 @@ class SudokuSolver:
         :param position: Tuple (row, col) of the position.
         :return: True if safe, False otherwise.
         """
-        row, col = position
-
-        if num in board[row]:
-            return False
-
-        if num in [board[i][col] for i in range(len(board))]:
-            return False
-
-        box_start_row, box_start_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_start_row, box_start_row + 3):
-            for j in range(box_start_col, box_start_col + 3):
-                if board[i][j] == num:
-                    return False
-
-        return True
+        return is_safe_to_place(board, num, position)
 
     @staticmethod
     def print_board(board):
@@ -169,34 +272,51 @@ class SudokuSolver:
         Print the Sudoku board in a readable format.
         :param board: 2D list representing the Sudoku board.
         """
-        for row in range(len(board)):
-            if row % 3 == 0 and row != 0:
-                print("-" * 21)
-
-            for col in range(len(board[0])):
-                if col % 3 == 0 and col != 0:
-                    print(" | ", end="")
-
-                if col == 8:
-                    print(board[row][col])
-                else:
-                    print(f"{board[row][col]} ", end="")
+        print_board(board)
 
     @staticmethod
     def has_minimal_clues(board):
         """
         Check if the Sudoku board has the minimal number of clues required to solve it.
-        :param board: 2D list representing the Sudoku board.
-        :return: True if the board has at least 17 clues, False otherwise.
+        :param board: Board or 2D list representing the Sudoku board.
+        :return: True if the board has at least MINIMUM_CLUES for its size (17 on 9x9), False otherwise.
         """
-        clue_count = sum(1 for row in board for cell in row if cell != 0)
-        return clue_count >= 17
+        size, cells = flat_cells(board)
+        clue_count = len(cells) - cells.count(0)
+        return clue_count >= MINIMUM_CLUES.get(size, 0)
+
+    @staticmethod
+    def is_well_formed(board):
+        """
+        Check that the board is an N²xN² square of values from 0 to N², without
+        checking clues or duplicates.
+        :param board: Board or 2D list representing the Sudoku board.
+        :return: True if well formed, False otherwise.
+        """
+        return SudokuSolver._is_well_formed(board, *flat_cells(board))
+
+    @staticmethod
+    def _is_well_formed(board, size, cells):
+        """Shape and value range check of is_well_formed(), on cells already read by the caller."""
+        try:
+            board_layout(size)
+        except ValueError:
+            logger.debug("Board is invalid. Board is not an N²xN² square.")
+            return False
+        if not isinstance(board, Board) and any(len(row) != size for row in board):
+            logger.debug("Board is invalid. Board is not an N²xN² square.")
+            return False
+
+        if any(not 0 <= value <= size for value in cells):
+            logger.debug("Board is invalid. Board has values outside 0-%d.", size)
+            return False
+        return True
 
     @staticmethod
     def is_valid_sudoku(board):
         """
         Check if the Sudoku board is valid.
-        :param board: 2D list representing the Sudoku board.
+        :param board: Board or 2D list representing the Sudoku board.
         :return: True if valid, False otherwise.
         """
 
@@ -205,25 +325,24 @@ class SudokuSolver:
             values = [v for v in values if v != 0]
             return len(values) != len(set(values))
 
-        if not SudokuSolver.has_minimal_clues(board):
-            logging.debug("Board is invalid. Board does not have minimal clues.")
+        size, cells = flat_cells(board)
+        if not SudokuSolver._is_well_formed(board, size, cells):
+            return False
+
+        layout = board_layout(size)
+        if len(cells) - cells.count(0) < MINIMUM_CLUES.get(size, 0):
+            logger.debug("Board is invalid. Board does not have minimal clues.")
             return False
 
-        for i in range(9):
-            if has_duplicates(board[i]) or has_duplicates([board[j][i] for j in range(9)]):
-                logging.debug("Board is invalid. Board has duplicates in row or column.")
+        for unit in layout.row_units + layout.col_units:
+            if has_duplicates([cells[cell] for cell in unit]):
+                logger.debug("Board is invalid. Board has duplicates in row or column.")
                 return False
 
-        for box_row in range(0, 9, 3):
-            for box_col in range(0, 9, 3):
-                subgrid = [
-                    board[r][c]
-                    for r in range(box_row, box_row + 3)
-                    for c in range(box_col, box_col + 3)
-                ]
-                if has_duplicates(subgrid):
-                    logging.debug("Board is invalid. Board has duplicates in 3x3 subgrid.")
-                    return False
+        for unit in layout.box_units:
+            if has_duplicates([cells[cell] for cell in unit]):
+                logger.debug("Board is invalid. Board has duplicates in a box.")
+                return False
 
         return True
 
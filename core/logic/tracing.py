@@ -0,0 +1,155 @@
+import json
+
+NODE = "node"
+ASSIGN = "assign"
+BACKTRACK = "backtrack"
+SOLUTION = "solution"
+PROPAGATION = "propagation"
+EVENTS = (NODE, ASSIGN, BACKTRACK, SOLUTION, PROPAGATION)
+
+
+class SolverTracer:
+    """
+    Receives search events from a solver engine.
+
+    Engines only call a tracer when one is passed in, so tracing costs a single
+    ``is not None`` check per node when it is off. Subclasses override the events
+    they care about.
+    """
+
+    def on_node(self, depth):
+        """Called when the search enters a node at ``depth`` branch decisions."""
+
+    def on_assign(self, cell, digit, depth):
+        """Called when the search tries ``digit`` in ``cell`` (flat index) at ``depth``."""
+
+    def on_backtrack(self, cell, digit, depth):
+        """Called when the search takes back ``digit`` from ``cell`` at ``depth``."""
+
+    def on_solution(self, depth):
+        """Called when the search completes the board at ``depth``."""
+
+    def on_propagation(self, technique, placed, eliminated, seconds):
+        """
+        Called after each run of a propagation technique.
+        :param technique: Technique name.
+        :param placed: Cells the technique filled.
+        :param eliminated: Candidates the technique removed.
+        :param seconds: Wall time the run took.
+        """
+
+
+class TracerGroup(SolverTracer):
+    """Forwards every event to several tracers."""
+
+    def __init__(self, *tracers):
+        self.tracers = tracers
+
+    def on_node(self, depth):
+        for tracer in self.tracers:
+            tracer.on_node(depth)
+
+    def on_assign(self, cell, digit, depth):
+        for tracer in self.tracers:
+            tracer.on_assign(cell, digit, depth)
+
+    def on_backtrack(self, cell, digit, depth):
+        for tracer in self.tracers:
+            tracer.on_backtrack(cell, digit, depth)
+
+    def on_solution(self, depth):
+        for tracer in self.tracers:
+            tracer.on_solution(depth)
+
+    def on_propagation(self, technique, placed, eliminated, seconds):
+        for tracer in self.tracers:
+            tracer.on_propagation(technique, placed, eliminated, seconds)
+
+
+class CountingTracer(SolverTracer):
+    """Tracer that keeps per-event counters and the deepest depth reached."""
+
+    def __init__(self):
+        self.nodes = 0
+        self.assignments = 0
+        self.backtracks = 0
+        self.solutions = 0
+        self.max_depth = 0
+
+    def on_node(self, depth):
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def on_assign(self, cell, digit, depth):
+        self.assignments += 1
+
+    def on_backtrack(self, cell, digit, depth):
+        self.backtracks += 1
+
+    def on_solution(self, depth):
+        self.solutions += 1
+
+    def as_dict(self):
+        """
+        Get the counters.
+        :return: Dict of counter name to value.
+        """
+        return {
+            "nodes": self.nodes,
+            "assignments": self.assignments,
+            "backtracks": self.backtracks,
+            "solutions": self.solutions,
+            "max_depth": self.max_depth,
+        }
+
+
+class JsonLinesTracer(CountingTracer):
+    """Counting tracer that also writes every selected event as one JSON object per line."""
+
+    def __init__(self, stream, events=EVENTS):
+        """
+        Initialize the tracer.
+        :param stream: Text stream to write to.
+        :param events: Event names to write (see EVENTS); counters are kept for all of them.
+        """
+        super().__init__()
+        unknown = set(events).difference(EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown trace events: {', '.join(sorted(unknown))}.")
+        self.stream = stream
+        self.events = frozenset(events)
+
+    def on_node(self, depth):
+        super().on_node(depth)
+        if NODE in self.events:
+            self._write({"event": NODE, "depth": depth, "nodes": self.nodes})
+
+    def on_assign(self, cell, digit, depth):
+        super().on_assign(cell, digit, depth)
+        if ASSIGN in self.events:
+            self._write({"event": ASSIGN, "cell": cell, "digit": digit, "depth": depth})
+
+    def on_backtrack(self, cell, digit, depth):
+        super().on_backtrack(cell, digit, depth)
+        if BACKTRACK in self.events:
+            self._write({"event": BACKTRACK, "cell": cell, "digit": digit, "depth": depth, "backtracks": self.backtracks})
+
+    def on_solution(self, depth):
+        super().on_solution(depth)
+        if SOLUTION in self.events:
+            self._write({"event": SOLUTION, "depth": depth, "nodes": self.nodes})
+
+    def on_propagation(self, technique, placed, eliminated, seconds):
+        if PROPAGATION in self.events and (placed or eliminated):
+            self._write({
+                "event": PROPAGATION,
+                "technique": technique,
+                "placed": placed,
+                "eliminated": eliminated,
+                "seconds": seconds,
+            })
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record))
+        self.stream.write("\n")
@@ -0,0 +1,79 @@
+import math
+from functools import lru_cache
+
+BOARD_SIZES = (4, 9, 16, 25)
+# Digit masks up to this many bits get a popcount lookup table (65536 entries for 16x16).
+POPCOUNT_TABLE_BITS = 16
+
+
+class _BitCount:
+    """Stands in for the popcount table on boards too large to tabulate."""
+
+    @staticmethod
+    def __getitem__(mask):
+        return bin(mask).count("1")
+
+
+class BoardLayout:
+    """
+    Index tables for one board size, shared by every engine working on that size.
+
+    Cells are numbered row by row (``row * size + col``). Each unit is a tuple of
+    flat cell indices, and digit ``d`` is bit ``d - 1`` of a ``size``-bit mask. The
+    peers of a cell are the other cells sharing its row, column or box, given as
+    sorted flat indices, as a frozenset for membership tests, and as (row, col)
+    pairs for code working on 2D boards.
+    """
+
+    def __init__(self, size):
+        """
+        Build the tables for a board of ``size`` x ``size`` cells.
+        :param size: Board size; must be a perfect square (4, 9, 16, 25, ...).
+        """
+        box_size = math.isqrt(size)
+        if size < 1 or box_size * box_size != size:
+            raise ValueError(f"Board size must be a perfect square (e.g., 4, 9, 16), got {size}.")
+
+        self.size = size
+        self.box_size = box_size
+        self.cell_count = size * size
+        self.all_digits = (1 << size) - 1
+
+        cells = range(self.cell_count)
+        self.cell_row = tuple(cell // size for cell in cells)
+        self.cell_col = tuple(cell % size for cell in cells)
+        self.cell_box = tuple(
+            (cell // size // box_size) * box_size + (cell % size) // box_size for cell in cells
+        )
+
+        self.row_units = tuple(tuple(cell for cell in cells if self.cell_row[cell] == row) for row in range(size))
+        self.col_units = tuple(tuple(cell for cell in cells if self.cell_col[cell] == col) for col in range(size))
+        self.box_units = tuple(tuple(cell for cell in cells if self.cell_box[cell] == box) for box in range(size))
+        self.units = self.row_units + self.col_units + self.box_units
+        self.cell_units = tuple(
+            (self.row_units[self.cell_row[cell]], self.col_units[self.cell_col[cell]], self.box_units[self.cell_box[cell]])
+            for cell in cells
+        )
+        self.peers = tuple(
+            tuple(sorted(set().union(*self.cell_units[cell]).difference((cell,)))) for cell in cells
+        )
+        self.peer_sets = tuple(frozenset(peers) for peers in self.peers)
+        self.peer_positions = tuple(
+            tuple((self.cell_row[peer], self.cell_col[peer]) for peer in self.peers[cell]) for cell in cells
+        )
+
+        if size <= POPCOUNT_TABLE_BITS:
+            self.popcount = tuple(bin(mask).count("1") for mask in range(self.all_digits + 1))
+        else:
+            self.popcount = _BitCount()
+
+
+@lru_cache(maxsize=None)
+def board_layout(size):
+    """
+    Get the shared layout for a board size, building it on first use.
+    :param size: Number of rows (and columns) of the board.
+    :return: BoardLayout.
+    :raises ValueError: If ``size`` is not a perfect square.
+    """
+    return BoardLayout(size)
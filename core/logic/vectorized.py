@@ -0,0 +1,158 @@
+import numpy as np
+
+from config.settings import VECTORIZED_CHUNK_BOARDS
+from core.logic.sudoku_solver import MINIMUM_CLUES
+from core.logic.units import board_layout
+from utils.board_codec import BLANK_CHARACTERS, DIGIT_SYMBOLS, ENCODED_LENGTHS
+
+_INVALID = 255
+# ASCII code of a cell character to its value.
+_DECODE_TABLE = np.full(256, _INVALID, dtype=np.uint8)
+for _value, _symbol in enumerate(DIGIT_SYMBOLS, 1):
+    _DECODE_TABLE[ord(_symbol)] = _DECODE_TABLE[ord(_symbol.lower())] = _value
+for _symbol in BLANK_CHARACTERS:
+    _DECODE_TABLE[ord(_symbol)] = 0
+
+# Cell value to its digit bit; blanks and values above 25 map to 0.
+_BIT_TABLE = np.zeros(256, dtype=np.uint32)
+_BIT_TABLE[1:len(DIGIT_SYMBOLS) + 1] = np.left_shift(np.uint32(1), np.arange(len(DIGIT_SYMBOLS), dtype=np.uint32))
+
+
+def boards_from_strings(puzzles):
+    """
+    Decode encoded puzzles (see utils.board_codec) into one array in a single pass.
+    :param puzzles: Iterable of puzzle strings, all of the same board size.
+    :return: uint8 array of shape (N, size, size).
+    :raises ValueError: If the puzzles differ in size or contain invalid characters.
+    """
+    puzzles = list(puzzles)
+    if not puzzles:
+        return np.zeros((0, 9, 9), dtype=np.uint8)
+
+    size = ENCODED_LENGTHS.get(len(puzzles[0]))
+    if size is None:
+        raise ValueError(f"Expected {', '.join(map(str, ENCODED_LENGTHS))} characters, got {len(puzzles[0])}.")
+    joined = "".join(puzzles).encode("ascii")
+    if len(joined) != len(puzzles) * size * size:
+        raise ValueError("All puzzles in a batch must have the same board size.")
+
+    boards = _DECODE_TABLE[np.frombuffer(joined, dtype=np.uint8)]
+    if (boards > size).any():
+        raise ValueError("Invalid character in board string.")
+    return boards.reshape(len(puzzles), size, size)
+
+
+def validate_boards(boards):
+    """
+    Check many boards at once with the same rules as SudokuSolver.is_valid_sudoku:
+    values between 0 and the size, the minimum number of clues, and no duplicate
+    digit in any row, column or box.
+    :param boards: Array-like of shape (N, size, size) with 0 for blanks.
+    :return: bool array of shape (N,), True for every valid board.
+    """
+    boards = _as_board_array(boards)
+    valid = np.empty(len(boards), dtype=bool)
+    for start, chunk in _chunks(boards):
+        valid[start:start + len(chunk)] = _validate_chunk(chunk)
+    return valid
+
+
+def candidate_masks(boards):
+    """
+    Compute the candidates of every empty cell of many boards at once.
+    :param boards: Array-like of shape (N, size, size) with 0 for blanks.
+    :return: uint32 array of shape (N, size, size); bit ``d - 1`` is set when digit
+        ``d`` fits an empty cell, and filled cells are 0. Results for invalid boards
+        are unspecified.
+    """
+    boards = _as_board_array(boards)
+    masks = np.empty(boards.shape, dtype=np.uint32)
+    for start, chunk in _chunks(boards):
+        masks[start:start + len(chunk)] = _candidate_chunk(chunk)
+    return masks
+
+
+def _as_board_array(boards):
+    """
+    Check the shape of a batch and convert it to uint8.
+    :return: uint8 array of shape (N, size, size).
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"Expected an array of shape (N, size, size), got {boards.shape}.")
+    board_layout(boards.shape[1])
+    return boards
+
+
+def _chunks(boards):
+    """
+    Split a batch so temporaries stay within a few tens of megabytes.
+    :return: Generator of (start index, chunk).
+    """
+    for start in range(0, len(boards), VECTORIZED_CHUNK_BOARDS):
+        yield start, boards[start:start + VECTORIZED_CHUNK_BOARDS]
+
+
+def _unit_masks(bits, box_size):
+    """
+    OR the digit bits of every row, column and box.
+    :param bits: uint32 array of shape (N, size, size).
+    :return: Tuple of three uint32 arrays of shape (N, size): rows, columns, boxes.
+    """
+    count, size = bits.shape[0], bits.shape[1]
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    cols = np.bitwise_or.reduce(bits, axis=1)
+    # Axes become (board, band, row in band, stack, column in stack).
+    boxes = bits.reshape(count, box_size, box_size, box_size, box_size)
+    boxes = np.bitwise_or.reduce(np.bitwise_or.reduce(boxes, axis=4), axis=2).reshape(count, size)
+    return rows, cols, boxes
+
+
+def _unit_counts(filled, box_size):
+    """
+    Count the filled cells of every row, column and box.
+    :param filled: bool array of shape (N, size, size).
+    :return: Tuple of three int arrays of shape (N, size): rows, columns, boxes.
+    """
+    count, size = filled.shape[0], filled.shape[1]
+    boxes = filled.reshape(count, box_size, box_size, box_size, box_size).sum(axis=(2, 4)).reshape(count, size)
+    return filled.sum(axis=2), filled.sum(axis=1), boxes
+
+
+def _popcount(masks):
+    """Count the set bits of every element of a uint32 array."""
+    masks = masks - ((masks >> np.uint32(1)) & np.uint32(0x55555555))
+    masks = (masks & np.uint32(0x33333333)) + ((masks >> np.uint32(2)) & np.uint32(0x33333333))
+    masks = (masks + (masks >> np.uint32(4))) & np.uint32(0x0F0F0F0F)
+    return (masks * np.uint32(0x01010101)) >> np.uint32(24)
+
+
+def _validate_chunk(chunk):
+    """
+    Validate one chunk of boards.
+    :return: bool array, one entry per board.
+    """
+    size = chunk.shape[1]
+    box_size = board_layout(size).box_size
+    valid = (chunk <= size).all(axis=(1, 2))
+    valid &= np.count_nonzero(chunk, axis=(1, 2)) >= MINIMUM_CLUES.get(size, 0)
+
+    # A unit holds no duplicate exactly when its filled cells set that many distinct bits.
+    masks = _unit_masks(_BIT_TABLE[chunk], box_size)
+    counts = _unit_counts(chunk != 0, box_size)
+    for mask, filled in zip(masks, counts):
+        valid &= (_popcount(mask) == filled).all(axis=1)
+    return valid
+
+
+def _candidate_chunk(chunk):
+    """
+    Compute candidate masks for one chunk of boards.
+    :return: uint32 array shaped like the chunk.
+    """
+    layout = board_layout(chunk.shape[1])
+    size = layout.size
+    rows, cols, boxes = _unit_masks(_BIT_TABLE[chunk], layout.box_size)
+    cell_box = np.asarray(layout.cell_box, dtype=np.intp).reshape(size, size)
+    used = rows[:, :, None] | cols[:, None, :] | boxes[:, cell_box]
+    return np.where(chunk == 0, np.uint32(layout.all_digits) & ~used, np.uint32(0))
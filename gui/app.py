@@ -1,36 +1,35 @@
+import argparse
 import os
 import sys
 import time
 
 import pygame
 
+from config.key_bindings import (
+    QUIT_EVENT, SOLVE_KEY, RESET_KEY, PLAY_AGAIN_YES, PLAY_AGAIN_NO, PAUSE_KEY, FASTER_KEY, SLOWER_KEY, ABORT_KEY,
+    FRAME_STATS_KEY, HINT_KEY
+)
+from config.logging_config import configure_logging
 from config.settings import (
-    BOARD_SIZE, BLANK_COUNT, WINDOW_HEIGHT, WINDOW_WIDTH, CLICK_SOUND_PATH,
-    CORRECT_SOUND_PATH, MUSIC_PATH, GAME_BANNER, COLOR_WHITE, COLOR_BLACK, QUIT_EVENT, SOLVE_KEY, RESET_KEY,
-    PLAY_AGAIN_YES, PLAY_AGAIN_NO, PLAY_AGAIN_FONT_SIZE, PLAY_AGAIN_MESSAGE
+    BOARD_SIZE, WINDOW_HEIGHT, WINDOW_WIDTH, GAME_BANNER, COLOR_WHITE, COLOR_BLACK, PLAY_AGAIN_FONT_SIZE,
+    PLAY_AGAIN_MESSAGE, GAME_DIFFICULTY, PUZZLE_POOL_PATH, HINT_FRAME_BUDGET_MS, STARTUP_STORE_SAMPLE
 )
+from core.entities.board import Board
 from core.entities.grid import Grid
-from core.logic.sudoku_solver import SudokuSolver
-from gui.render import redraw_window
-from use_cases.sudoku_generator import SudokuGenerator
+from core.logic.solution_cache import DEFAULT_CACHE
+from gui.audio import CLICK, CORRECT, Audio
+from gui.frame_pacer import FramePacer, FrameStats, seconds_until_next_second
+from gui.live_solve import LiveSolve
+from gui.render import Renderer
+from gui.startup import StartupTimer
+from puzzles.store import PuzzleStore
+from use_cases.puzzle_pool import PuzzlePool
 
 
 def initialize_pygame():
-    pygame.init()
+    # Only what the first frame needs; the mixer is opened by Audio, off the main thread.
+    pygame.display.init()
     pygame.font.init()
-    pygame.mixer.init()
-
-def resource_path(relative_path):
-    base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
-    return os.path.join(base_path, relative_path)
-
-
-def load_sounds():
-    pygame.mixer.music.load(resource_path(MUSIC_PATH))
-    pygame.mixer.music.play(-1)
-    click_sound = pygame.mixer.Sound(resource_path(CLICK_SOUND_PATH))
-    correct_sound = pygame.mixer.Sound(resource_path(CORRECT_SOUND_PATH))
-    return click_sound, correct_sound
 
 
 def create_game_window():
@@ -38,67 +37,119 @@ def create_game_window():
     return pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 
 
-def generate_new_game(win):
-    sudoku_board_generator = SudokuGenerator(BOARD_SIZE, BLANK_COUNT)
-    sudoku_board_generator.generate_board()
-    board = sudoku_board_generator.board
+def next_puzzle(pool, store=None):
+    """
+    Take a ready puzzle from the pool, else a stored one of the game difficulty, and
+    only generate one when neither has any.
+    :return: Board with the puzzle.
+    """
+    board = pool.pop(GAME_DIFFICULTY, generate=False)
+    if board is None and store is not None:
+        for record in store.sample(GAME_DIFFICULTY, STARTUP_STORE_SAMPLE):
+            if len(record.puzzle) == BOARD_SIZE * BOARD_SIZE:
+                return Board.from_string(record.puzzle)
+    return board if board is not None else pool.pop(GAME_DIFFICULTY)
+
+
+def generate_new_game(win, pool, store=None):
+    board = next_puzzle(pool, store).to_rows()
     grid = Grid(BOARD_SIZE, BOARD_SIZE, WINDOW_WIDTH, WINDOW_WIDTH, board, win)
     return grid, board
 
 
-def handle_events(grid, click_sound, correct_sound, strikes):
+def handle_events(events, grid, audio, strikes, live):
     key = None
     run = True
-    for event in pygame.event.get():
+    for event in events:
         if event.type == QUIT_EVENT:
-            return False, key, strikes
+            return False, key, strikes, live
+
+        if live is not None:
+            if event.type == pygame.KEYDOWN:
+                live = handle_live_keydown(event, live)
+            continue
 
         if event.type == pygame.KEYDOWN:
-            run, key, strikes = handle_keydown(event, grid, correct_sound, strikes)
+            run, key, strikes, live = handle_keydown(event, grid, audio, strikes)
 
         if event.type == pygame.MOUSEBUTTONDOWN:
             pos = pygame.mouse.get_pos()
             clicked = grid.click(pos)
             if clicked:
-                click_sound.play()
+                audio.play(CLICK)
                 grid.select(clicked[0], clicked[1])
                 key = None
 
-    return run, key, strikes
+    return run, key, strikes, live
 
 
-def handle_keydown(event, grid, correct_sound, strikes):
+def handle_keydown(event, grid, audio, strikes):
     key = None
     run = True
+    live = None
     if event.key in range(pygame.K_1, pygame.K_9 + 1):
         key = event.key - pygame.K_0
     elif event.key == pygame.K_DELETE:
         grid.clear()
     elif event.key == pygame.K_RETURN:
-        run = handle_return_key(grid, correct_sound)
+        run = handle_return_key(grid, audio)
     elif event.key == SOLVE_KEY:
-        run = handle_solve_key(grid)
+        live = LiveSolve(grid)
     elif event.key == RESET_KEY:
         grid.reset(grid.board)
 
-    return run, key, strikes
+    return run, key, strikes, live
+
+
+def handle_live_keydown(event, live):
+    """Pause, change the speed of or abort a live solve; other keys wait until it ends."""
+    if event.key in (PAUSE_KEY, SOLVE_KEY):
+        live.toggle_pause()
+    elif event.key == FASTER_KEY:
+        live.faster()
+    elif event.key == SLOWER_KEY:
+        live.slower()
+    elif event.key == ABORT_KEY:
+        live.abort()
+        return None
+    return live
 
 
-def handle_return_key(grid, correct_sound):
+def handle_return_key(grid, audio):
     i, j = grid.selected
     if grid.cubes[i][j].temp != 0:
         if grid.place(grid.cubes[i][j].temp):
-            correct_sound.play()
+            audio.play(CORRECT)
             if grid.is_finished():
                 return ask_to_play_again(grid)
     return True
 
 
-def handle_solve_key(grid):
-    SudokuSolver.solve_live(grid)
+def advance_live_solve(grid, live, seconds):
+    """
+    Run a live solve for one frame.
+    :return: Tuple (run, live); live is None once the solve has ended.
+    """
+    live.advance(seconds)
+    if not live.done:
+        return True, live
     if grid.is_finished():
-        return ask_to_play_again(grid)
-    return True
+        return ask_to_play_again(grid), None
+    return True, None
+
+
+def advance_hint(grid):
+    """
+    Search for a hint for at most HINT_FRAME_BUDGET_MS, and put its digit in as a sketch once found.
+    :return: Tuple (pending, hint); pending stays True while the search goes on.
+    """
+    if not grid.hints.advance(HINT_FRAME_BUDGET_MS / 1000):
+        return True, None
+    hint = grid.hints.next_hint()
+    if hint is not None:
+        grid.select(hint.row, hint.col)
+        grid.sketch(hint.digit)
+    return False, hint
 
 
 def ask_to_play_again(grid):
@@ -109,14 +160,14 @@ def ask_to_play_again(grid):
     pygame.display.update()
 
     while True:
-        for event in pygame.event.get():
-            if event.type == QUIT_EVENT:
+        event = pygame.event.wait()
+        if event.type == QUIT_EVENT:
+            return False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == PLAY_AGAIN_YES:
+                return True
+            elif event.key == PLAY_AGAIN_NO:
                 return False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == PLAY_AGAIN_YES:
-                    return True
-                elif event.key == PLAY_AGAIN_NO:
-                    return False
 
 
 def update_game_state(grid, key):
@@ -124,25 +175,94 @@ def update_game_state(grid, key):
         grid.sketch(key)
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play Sudoku.")
+    parser.add_argument("--no-audio", action="store_true", help="Play without music and sounds; the mixer is never opened.")
+    parser.add_argument("--startup-report", action="store_true", help="Print how long each phase of startup took.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None, timer=None):
+    """
+    Run the game.
+    :param argv: Command line arguments (default: sys.argv).
+    :param timer: StartupTimer started by the caller, e.g. before the imports.
+    """
+    args = parse_args(argv)
+    timer = timer if timer is not None else StartupTimer()
+    configure_logging()
     initialize_pygame()
-    click_sound, correct_sound = load_sounds()
     win = create_game_window()
-    grid, board = generate_new_game(win)
+    timer.mark("window")
+    audio = Audio(enabled=not args.no_audio)
+    audio.start()
+    store = PuzzleStore()
+    DEFAULT_CACHE.store = store
+    pool = PuzzlePool(path=os.path.expanduser(PUZZLE_POOL_PATH))
+    timer.mark("store and pool")
+    grid, board = generate_new_game(win, pool, store)
+    timer.mark("first board")
+    renderer = Renderer(win)
+    pygame.display.update(renderer.draw(grid, 0, 0))
+    timer.mark("first frame")
+    # Refilling only starts now, so it does not compete with the first board.
+    pool.start()
+    if args.startup_report:
+        print(timer.report(), file=sys.stderr)
+    report_audio = args.startup_report and audio.enabled
+    pacer = FramePacer()
+    frame_stats = FrameStats()
+    show_frame_stats = False
 
     run = True
     start_time = time.time()
     strikes = 0
+    live = None
+    hint_pending, hint = False, None
+    last_frame = time.perf_counter()
 
     while run:
+        animating = (live is not None and not live.paused) or hint_pending
+        events = pacer.wait(animating, seconds_until_next_second(start_time))
+        frame_stats.start_frame()
+        now = time.perf_counter()
+        frame_seconds, last_frame = now - last_frame, now
         play_time = round(time.time() - start_time)
-        run, key, strikes = handle_events(grid, click_sound, correct_sound, strikes)
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == FRAME_STATS_KEY:
+                show_frame_stats = not show_frame_stats
+            elif event.type == pygame.KEYDOWN and event.key == HINT_KEY and live is None:
+                hint_pending, hint = True, None
+            elif event.type == pygame.KEYDOWN and event.key == RESET_KEY:
+                hint_pending, hint = False, None
+        run, key, strikes, live = handle_events(events, grid, audio, strikes, live)
+        if live is not None and run:
+            run, live = advance_live_solve(grid, live, frame_seconds)
+        if hint_pending and run:
+            hint_pending, hint = advance_hint(grid)
+        if hint is not None and grid.model[hint.row][hint.col]:
+            hint = None
         update_game_state(grid, key)
-        redraw_window(grid, play_time, strikes)
-        pygame.display.update()
-
-        if grid.is_finished() and run:
-            grid, board = generate_new_game(win)
+        highlight = live.last_change if live is not None else None
+        overlay = frame_stats.text if show_frame_stats else ""
+        message = hint.describe() if hint is not None else ("Looking for a hint..." if hint_pending else "")
+        pygame.display.update(renderer.draw(grid, play_time, strikes, highlight, overlay, message))
+        frame_stats.end_frame()
+        if report_audio and audio.load_seconds is not None:
+            print(f"audio {audio.load_seconds * 1000:.1f} ms, loaded in the background", file=sys.stderr)
+            report_audio = False
+
+        if grid.is_finished() and run and live is None:
+            grid, board = generate_new_game(win, pool, store)
             start_time = time.time()
-
+            hint_pending, hint = False, None
+            # Show the new game now rather than after the next wait.
+            pygame.display.update(renderer.draw(grid, 0, strikes))
+
+    pool.close()
+    DEFAULT_CACHE.store = None
+    store.close()
+    audio.close()
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import pygame
+
+from config.settings import CLICK_SOUND_PATH, CORRECT_SOUND_PATH, MUSIC_PATH
+
+logger = logging.getLogger(__name__)
+
+CLICK = "click"
+CORRECT = "correct"
+
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
+    return os.path.join(base_path, relative_path)
+
+
+class Audio:
+    """
+    Background music and sound effects, loaded off the main thread.
+
+    start() opens the mixer on the calling thread, since SDL expects audio to be
+    initialized on the main thread. Loading the music and decoding the sounds can take
+    a noticeable part of a second, so that runs on a daemon thread while the window and
+    the first board are shown. A sound played before it has loaded is skipped rather
+    than waited for. A disabled Audio never touches the mixer, and a mixer that fails
+    to open only logs a warning: the game plays on in silence.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Initialize the audio. Call start() to load it.
+        :param enabled: False to keep the game silent and skip mixer initialization.
+        """
+        self.enabled = enabled
+        # Seconds the loading took, once it has finished.
+        self.load_seconds = None
+        self._sounds = {}
+        self._thread = None
+
+    def start(self):
+        """Open the mixer, then start the music and load the sound effects in the background."""
+        if not self.enabled or self._thread is not None:
+            return
+        start = time.perf_counter()
+        try:
+            pygame.mixer.init()
+        except pygame.error as error:
+            logger.warning("Playing without sound: %s", error)
+            return
+        self._thread = threading.Thread(target=self._load, args=(start,), name="audio-loader", daemon=True)
+        self._thread.start()
+
+    def play(self, name):
+        """
+        Play a sound effect if it has loaded.
+        :param name: CLICK or CORRECT.
+        """
+        sound = self._sounds.get(name)
+        if sound is not None:
+            sound.play()
+
+    def close(self):
+        """Wait for the loading to finish and close the mixer."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if pygame.mixer.get_init():
+            pygame.mixer.quit()
+        self._sounds = {}
+
+    def _load(self, start):
+        """
+        Body of the loader thread.
+        :param start: perf_counter() value at which start() began opening the mixer.
+        """
+        try:
+            pygame.mixer.music.load(resource_path(MUSIC_PATH))
+            pygame.mixer.music.play(-1)
+            sounds = {
+                CLICK: pygame.mixer.Sound(resource_path(CLICK_SOUND_PATH)),
+                CORRECT: pygame.mixer.Sound(resource_path(CORRECT_SOUND_PATH)),
+            }
+        except pygame.error as error:
+            logger.warning("Playing without sound: %s", error)
+            return
+        self._sounds = sounds
+        self.load_seconds = time.perf_counter() - start
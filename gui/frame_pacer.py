@@ -0,0 +1,110 @@
+import logging
+import math
+import time
+
+import pygame
+
+from config.settings import FPS_CAP, FRAME_STATS_WINDOW_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Events the game reacts to; anything else (mouse motion, ...) never wakes the loop.
+HANDLED_EVENTS = (
+    pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED
+)
+
+
+def seconds_until_next_second(start_time, now=None):
+    """
+    Time left until a timer shown as ``round(now - start_time)`` changes.
+    :param start_time: time.time() when the timer started.
+    :param now: Current time.time() (default: now).
+    :return: Seconds until the displayed value changes.
+    """
+    elapsed = (time.time() if now is None else now) - start_time
+    return math.floor(elapsed + 0.5) + 0.5 - elapsed
+
+
+class FramePacer:
+    """
+    Decides when the main loop runs its next frame.
+
+    While something animates, frames run at up to ``fps_cap`` per second. Otherwise
+    the loop blocks until an input event arrives or ``wake_in`` seconds pass (for
+    the next timer tick), so an untouched game uses no CPU between ticks. Bursts of
+    input are capped at ``fps_cap`` too.
+    """
+
+    def __init__(self, fps_cap=FPS_CAP):
+        """
+        Initialize the pacer. Call it after pygame.init().
+        :param fps_cap: Maximum frames per second.
+        """
+        self.fps_cap = fps_cap
+        self.clock = pygame.time.Clock()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
+
+    def wait(self, animating, wake_in):
+        """
+        Wait for the next frame.
+        :param animating: True while something on screen moves on its own.
+        :param wake_in: Seconds after which to wake up even without input.
+        :return: List of pending events.
+        """
+        if animating:
+            self.clock.tick(self.fps_cap)
+            return pygame.event.get()
+
+        event = pygame.event.wait(max(1, math.ceil(wake_in * 1000)))
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        self.clock.tick(self.fps_cap)
+        return events
+
+
+class FrameStats:
+    """
+    Measures the wall time and process CPU time of every frame, excluding the time
+    spent waiting for it, and summarizes them every ``window`` seconds.
+
+    The summary is logged at DEBUG level and kept in ``text`` for an on-screen overlay.
+    CPU time covers every thread of the process, including background generation.
+    """
+
+    def __init__(self, window=FRAME_STATS_WINDOW_SECONDS):
+        self.window = window
+        self.text = ""
+        self._frame_start = self._cpu_start = 0.0
+        self._reset(time.perf_counter(), time.process_time())
+
+    def start_frame(self):
+        self._frame_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def end_frame(self):
+        """Record the frame started by start_frame, and summarize once the window is over."""
+        now, cpu = time.perf_counter(), time.process_time()
+        frame = now - self._frame_start
+        self._frames += 1
+        self._frame_total += frame
+        self._frame_max = max(self._frame_max, frame)
+        self._cpu_total += cpu - self._cpu_start
+
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+        process_cpu = cpu - self._window_cpu
+        # fps, mean/max frame time, mean CPU per frame, process CPU share.
+        self.text = (
+            f"{self._frames / elapsed:.0f} fps  {self._frame_total / self._frames * 1000:.1f}"
+            f"/{self._frame_max * 1000:.1f} ms  cpu {self._cpu_total / self._frames * 1000:.1f} ms"
+            f"  {process_cpu / elapsed:.0%}"
+        )
+        logger.debug("Frames: %s", self.text)
+        self._reset(now, cpu)
+
+    def _reset(self, now, cpu):
+        self._window_start, self._window_cpu = now, cpu
+        self._frames = 0
+        self._frame_total = self._frame_max = self._cpu_total = 0.0
@@ -0,0 +1,76 @@
+import time
+
+from config.settings import (
+    LIVE_SOLVE_FRAME_BUDGET_MS, LIVE_SOLVE_MAX_STEPS_PER_SECOND, LIVE_SOLVE_SPEED_FACTOR, VISUALIZATION_DELAY_MS
+)
+from core.logic.sudoku_solver import SudokuSolver
+
+
+class LiveSolve:
+    """
+    Shows the solver filling the grid, a few changes per frame.
+
+    The main loop calls advance() once per frame with the time since the previous
+    frame. The solve runs at ``steps_per_second`` changes, and never for more than
+    LIVE_SOLVE_FRAME_BUDGET_MS of a frame, so the window keeps handling input. The
+    solve can be paused, sped up, slowed down or aborted at any time.
+    """
+
+    def __init__(self, grid, steps_per_second=1000 / VISUALIZATION_DELAY_MS):
+        """
+        Start solving the grid from its current state.
+        :param grid: Grid to fill.
+        :param steps_per_second: Changes shown per second.
+        """
+        self.grid = grid
+        self.steps_per_second = steps_per_second
+        self.paused = False
+        self.done = False
+        self.solved = False
+        # (row, col, placed) of the latest change, for the renderer to highlight.
+        self.last_change = None
+        self._initial = [row[:] for row in grid.model]
+        self._steps = SudokuSolver.solve_steps(grid.model)
+        self._credit = 0.0
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def faster(self):
+        self.steps_per_second = min(self.steps_per_second * LIVE_SOLVE_SPEED_FACTOR, LIVE_SOLVE_MAX_STEPS_PER_SECOND)
+
+    def slower(self):
+        self.steps_per_second = max(self.steps_per_second / LIVE_SOLVE_SPEED_FACTOR, 1)
+
+    def abort(self):
+        """Stop the solve and put the grid back as it was before it started."""
+        for row, values in enumerate(self._initial):
+            for col, value in enumerate(values):
+                self.grid.set_cell(row, col, value)
+        self.last_change = None
+        self.done = True
+
+    def advance(self, seconds):
+        """
+        Apply the changes due after ``seconds`` more of solving.
+        :param seconds: Time since the previous frame.
+        """
+        if self.done or self.paused:
+            return
+
+        self._credit += seconds * self.steps_per_second
+        deadline = time.perf_counter() + LIVE_SOLVE_FRAME_BUDGET_MS / 1000
+        while self._credit >= 1:
+            self._credit -= 1
+            try:
+                row, col, value = next(self._steps)
+            except StopIteration as stop:
+                self.solved = bool(stop.value)
+                self.done = True
+                return
+            self.grid.set_cell(row, col, value)
+            self.last_change = (row, col, value != 0)
+            if time.perf_counter() >= deadline:
+                # Over budget: drop the backlog rather than let it grow frame after frame.
+                self._credit = 0.0
+                break
@@ -1,7 +1,8 @@
 import pygame
 
-from config.settings import COLOR_WHITE, COLOR_BLACK, TIME_TEXT_POSITION, COLOR_RED, STRIKES_TEXT_POSITION, FONT_NAME, \
-    FONT_SIZE
+from config.settings import COLOR_WHITE, COLOR_BLACK, TIME_TEXT_POSITION, COLOR_RED, STRIKES_TEXT_POSITION, \
+    FONT_NAME, FRAME_STATS_FONT_SIZE, FRAME_STATS_POSITION, HINT_FONT_SIZE, HINT_TEXT_POSITION
+from utils.glyphs import get_font, render_glyph
 from utils.helpers import format_time
 
 
@@ -14,11 +15,10 @@ def redraw_window(grid, time: int, strikes: int):
     """
     grid.win.fill(COLOR_WHITE)
 
-    font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
-    time_text = font.render(f"Time: {format_time(time)}", True, COLOR_BLACK)
+    time_text = get_font().render(f"Time: {format_time(time)}", True, COLOR_BLACK)
     _calculate_position_and_blit(grid.win, time_text, TIME_TEXT_POSITION)
 
-    strikes_text = font.render("X " * strikes, True, COLOR_RED)
+    strikes_text = render_glyph("X " * strikes, COLOR_RED)
     _calculate_position_and_blit(grid.win, strikes_text, STRIKES_TEXT_POSITION)
 
     grid.draw()
@@ -30,4 +30,122 @@ def _calculate_position_and_blit(win, text_surface, position):
     :param text_surface: Rendered text surface.
     :param position: Tuple (x, y) for the position.
     """
-    win.blit(text_surface, position)
\ No newline at end of file
+    win.blit(text_surface, position)
+    return pygame.Rect(position, text_surface.get_size())
+
+
+class Renderer:
+    """
+    Draws only what changed since the previous frame.
+
+    The first frame of a grid is drawn in full. After that, only the grid's dirty
+    cells, the timer when its text changes, the strikes when they change, the
+    highlighted cell, the hint message and the frame statistics overlay are redrawn,
+    and only their rectangles are returned for ``pygame.display.update``. An idle
+    frame draws nothing.
+    """
+
+    def __init__(self, win):
+        """
+        Initialize the renderer.
+        :param win: Pygame display surface.
+        """
+        self.win = win
+        self._grid = None
+        self._time_rect = None
+        self._time_text = None
+        self._strikes = None
+        self._strikes_rect = None
+        self._highlight = None
+        # Position of each small text line to its (text, rect) on screen.
+        self._notes = {}
+
+    def invalidate(self):
+        """Force a full redraw on the next frame, after something else drew over the window."""
+        self._grid = None
+
+    def draw(self, grid, time: int, strikes: int, highlight=None, overlay="", message=""):
+        """
+        Bring the window up to date.
+        :param grid: Grid object containing the game state.
+        :param time: Current time in seconds.
+        :param strikes: Number of strikes.
+        :param highlight: Optional (row, col, placed) of a cell to outline, green when
+            ``placed`` and red otherwise.
+        :param overlay: Frame statistics text, or "" for none.
+        :param message: Hint text, or "" for none.
+        :return: List of the rectangles that changed.
+        """
+        notes = ((overlay, FRAME_STATS_POSITION, FRAME_STATS_FONT_SIZE), (message, HINT_TEXT_POSITION, HINT_FONT_SIZE))
+        if grid is not self._grid or len(grid.dirty) == grid.rows * grid.cols:
+            self._notes = {}
+            rects = self._draw_full(grid, time, strikes, highlight)
+            for text, position, size in notes:
+                if text:
+                    self._draw_note(text, position, size)
+            return rects
+
+        dirty = set(grid.dirty)
+        grid.dirty.clear()
+        if highlight != self._highlight:
+            for cell in (self._highlight, highlight):
+                if cell is not None:
+                    dirty.add(cell[:2])
+        rects = grid.draw_cells(dirty)
+        if highlight is not None and highlight[:2] in dirty:
+            rects.append(self._draw_highlight(grid, highlight))
+        self._highlight = highlight
+
+        time_text = f"Time: {format_time(time)}"
+        if time_text != self._time_text:
+            rects.append(self._draw_time(time_text))
+        if strikes != self._strikes:
+            rects.append(self._draw_strikes(strikes))
+        for text, position, size in notes:
+            if text != self._notes.get(position, ("",))[0]:
+                rects.append(self._draw_note(text, position, size))
+        return rects
+
+    def _draw_full(self, grid, time, strikes, highlight):
+        redraw_window(grid, time, strikes)
+        grid.dirty.clear()
+        if highlight is not None:
+            self._draw_highlight(grid, highlight)
+        self._grid = grid
+        self._highlight = highlight
+        self._time_text = f"Time: {format_time(time)}"
+        self._time_rect = pygame.Rect(TIME_TEXT_POSITION, get_font().size(self._time_text))
+        self._strikes = strikes
+        self._strikes_rect = pygame.Rect(STRIKES_TEXT_POSITION, render_glyph("X " * strikes, COLOR_RED).get_size())
+        return [self.win.get_rect()]
+
+    def _draw_highlight(self, grid, highlight):
+        row, col, placed = highlight
+        grid.cubes[row][col].draw_change(self.win, placed)
+        return grid.cell_rect(row, col)
+
+    def _draw_time(self, time_text):
+        """Replace the timer text; returns the union of the old and new text rectangles."""
+        self.win.fill(COLOR_WHITE, self._time_rect)
+        rect = _calculate_position_and_blit(self.win, get_font().render(time_text, True, COLOR_BLACK), TIME_TEXT_POSITION)
+        changed = rect.union(self._time_rect)
+        self._time_text, self._time_rect = time_text, rect
+        return changed
+
+    def _draw_strikes(self, strikes):
+        """Replace the strikes text; returns the union of the old and new text rectangles."""
+        self.win.fill(COLOR_WHITE, self._strikes_rect)
+        rect = _calculate_position_and_blit(self.win, render_glyph("X " * strikes, COLOR_RED), STRIKES_TEXT_POSITION)
+        changed = rect.union(self._strikes_rect)
+        self._strikes, self._strikes_rect = strikes, rect
+        return changed
+
+    def _draw_note(self, text, position, size):
+        """Replace a small text line; returns the union of the old and new text rectangles."""
+        old_rect = self._notes.get(position, ("", pygame.Rect(position, (0, 0))))[1]
+        self.win.fill(COLOR_WHITE, old_rect)
+        rect = pygame.Rect(position, (0, 0))
+        if text:
+            rect = _calculate_position_and_blit(self.win, get_font(FONT_NAME, size).render(text, True, COLOR_BLACK), position)
+        self._notes[position] = (text, rect)
+        return rect.union(old_rect)
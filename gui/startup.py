@@ -0,0 +1,37 @@
+import time
+
+
+class StartupTimer:
+    """
+    Times the phases of starting the game, for a breakdown of where startup goes.
+
+    It imports nothing heavy, so it can be created before pygame is imported and
+    count the imports as the first phase.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        self._last = self.start
+
+    def mark(self, phase):
+        """
+        End a phase: the time since the previous mark (or the start) is charged to it.
+        :param phase: Name of the phase that just ended.
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self):
+        """Seconds from the start to the last mark."""
+        return self._last - self.start
+
+    def report(self):
+        """
+        Describe the breakdown in one line.
+        :return: Text such as "startup 212.4 ms: imports 190.1, window 3.2, first board 1.0, ...".
+        """
+        phases = ", ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in self.phases.items())
+        return f"startup {self.total * 1000:.1f} ms: {phases}"
@@ -1,4 +1,8 @@
-from gui.app import main
+from gui.startup import StartupTimer
 
 if __name__ == "__main__":
-    main()
+    timer = StartupTimer()
+    from gui.app import main
+
+    timer.mark("imports")
+    main(timer=timer)
@@ -0,0 +1,57 @@
+import argparse
+import sys
+
+from config.settings import BATCH_CHUNKSIZE, SOLVER_STRATEGY
+from core.logic.sudoku_solver import STRATEGIES
+from puzzles.io import read_puzzles
+from use_cases.batch_solver import solve_many
+
+
+def add_solve_arguments(parser):
+    """
+    Add the options of the solve command to an argument parser.
+    :param parser: argparse parser or subparser.
+    """
+    parser.add_argument("input", nargs="?", default="-", help="Puzzle file, one puzzle per line (default: stdin).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--chunksize", type=int, default=BATCH_CHUNKSIZE, help="Puzzles sent to a worker at once.")
+    parser.add_argument("--unordered", action="store_true", help="Write solutions as they finish.")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=SOLVER_STRATEGY, help="Solver backend.")
+
+
+def run_solve(args):
+    """
+    Solve every puzzle of a file and write one solution per line to stdout.
+    Puzzles that cannot be solved are reported on stderr by their index.
+    :param args: Parsed arguments from add_solve_arguments.
+    :return: Process exit code (1 if any puzzle failed).
+    """
+    failures = 0
+    results = solve_many(
+        read_puzzles(args.input),
+        workers=args.workers,
+        chunksize=args.chunksize,
+        ordered=not args.unordered,
+        strategy=args.strategy,
+    )
+    for result in results:
+        if result.solved:
+            sys.stdout.write(result.solution)
+            sys.stdout.write("\n")
+        else:
+            failures += 1
+            print(f"puzzle {result.index}: {result.error}", file=sys.stderr)
+    sys.stdout.flush()
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzles", description="Puzzle file tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_solve_arguments(commands.add_parser("solve", help="Solve a puzzle file and write the solutions to stdout."))
+    args = parser.parse_args(argv)
+    return run_solve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
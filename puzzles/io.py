@@ -0,0 +1,223 @@
+import mmap
+import os
+import sys
+from array import array
+
+from core.entities.board import Board
+from utils.board_codec import DIGIT_SYMBOLS, ENCODED_LENGTHS, encode_board
+
+COMMENT_PREFIX = "#"
+# "." and "0" both mark blanks on input; puzzles are normalized to "0" and upper case.
+_NORMALIZE_BLANKS = str.maketrans(".", "0")
+_VALID_CHARACTERS = frozenset("0" + DIGIT_SYMBOLS)
+# Bytes that never occur in a file of bare puzzle lines: comments, and field or padding whitespace.
+_NON_PUZZLE_BYTES = (b"#", b",", b" ", b"\t")
+
+
+def parse_line(line: str):
+    """
+    Parse one line of a puzzle file.
+
+    The puzzle is the first field of the line; anything after whitespace or a comma
+    (a rating, a solution, ...) is ignored. Blank lines and lines starting with "#"
+    carry no puzzle. Puzzles are one character per cell, so 9x9 puzzles are 81
+    characters long, 16x16 ones 256, and so on (see utils.board_codec).
+    :param line: Line of text, with or without its newline.
+    :return: Puzzle string with "0" for blanks, or None if the line has no puzzle.
+    :raises ValueError: If the first field is not a valid puzzle.
+    """
+    line = line.strip()
+    if not line or line.startswith(COMMENT_PREFIX):
+        return None
+
+    puzzle = line.replace(",", " ").split(None, 1)[0].translate(_NORMALIZE_BLANKS).upper()
+    if not _is_puzzle(puzzle):
+        raise ValueError(f"Not a puzzle of {', '.join(map(str, ENCODED_LENGTHS))} cells: {puzzle[:90]!r}")
+    return puzzle
+
+
+def read_puzzles(source):
+    """
+    Stream puzzles from a file in the one-puzzle-per-line format.
+    Lines are read one at a time, so the file never has to fit in memory.
+    :param source: Path, "-" for standard input, or an open text file.
+    :return: Generator of puzzle strings with "0" for blanks.
+    :raises ValueError: If a line holds a malformed puzzle (the message names the line number).
+    """
+    if source == "-":
+        yield from _parse_lines(sys.stdin)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="ascii") as stream:
+            yield from _parse_lines(stream)
+    else:
+        yield from _parse_lines(source)
+
+
+def write_puzzles(destination, puzzles, blank="0"):
+    """
+    Write puzzles one per line.
+    :param destination: Path, "-" for standard output, or an open text file.
+    :param puzzles: Iterable of puzzle strings, Boards or 2D lists.
+    :param blank: Character written for empty cells ("0" or ".").
+    :return: Number of puzzles written.
+    """
+    if destination == "-":
+        return _write_lines(sys.stdout, puzzles, blank)
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", encoding="ascii") as stream:
+            return _write_lines(stream, puzzles, blank)
+    return _write_lines(destination, puzzles, blank)
+
+
+class MmapPuzzleReader:
+    """
+    Random access to the puzzles of a file by index, through a memory map.
+
+    Files where every line is exactly one puzzle (the usual output of generators)
+    are addressed by arithmetic on the record width, after a quick pass over the
+    bytes confirms that no comment or blank line hides among them. Any other file is scanned once
+    to build a compact array of line offsets.
+    """
+
+    def __init__(self, path):
+        """
+        Open and map a puzzle file.
+        :param path: Path to the puzzle file.
+        """
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._stride = self._detect_stride(size)
+        self._offsets = None
+        if self._stride:
+            self._count = (size + self._stride - 1) // self._stride
+        else:
+            self._offsets = self._index_offsets()
+            self._count = len(self._offsets)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Get a puzzle by its position in the file, ignoring blank and comment lines.
+        :param index: Puzzle index (negative values count from the end).
+        :return: Puzzle string with "0" for blanks.
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Puzzle index out of range.")
+
+        start = index * self._stride if self._stride else self._offsets[index]
+        end = self._map.find(b"\n", start)
+        line = self._map[start:end if end != -1 else len(self._map)].decode("ascii")
+        puzzle = parse_line(line)
+        if puzzle is None:
+            raise ValueError(f"No puzzle at index {index}; the file is not one puzzle per line.")
+        return puzzle
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        """Release the memory map and the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _detect_stride(self, size):
+        """
+        Check whether the file is a plain list of fixed-width puzzle lines.
+        :param size: File size in bytes.
+        :return: Record width in bytes including the newline, or 0 if records are not fixed width.
+        """
+        end = self._map.find(b"\n") if size else -1
+        if end == -1:
+            return 0
+
+        first_line = self._map[:end].decode("ascii", "replace")
+        stripped = first_line.rstrip("\r")
+        if not _is_puzzle(stripped.translate(_NORMALIZE_BLANKS).upper()):
+            return 0
+
+        stride = end + 1
+        newline = self._map[len(stripped):stride]
+        # The last record may or may not end with a newline.
+        if size % stride not in (0, stride - len(newline)):
+            return 0
+        # Every record must be one bare puzzle line: all newlines sit at record ends, and no
+        # comment, blank or annotated line of the same width hides in the middle.
+        ends = self._map[stride - 1::stride]
+        if ends.count(b"\n") != len(ends) or _count_newlines(self._map) != len(ends):
+            return 0
+        if any(self._map.find(byte) != -1 for byte in _NON_PUZZLE_BYTES):
+            return 0
+        return stride
+
+    def _index_offsets(self):
+        """
+        Scan the file once and record the byte offset of every puzzle line.
+        :return: array of offsets.
+        """
+        offsets = array("Q")
+        position, size = 0, len(self._map)
+        while position < size:
+            end = self._map.find(b"\n", position)
+            if end == -1:
+                end = size
+            if parse_line(self._map[position:end].decode("ascii")) is not None:
+                offsets.append(position)
+            position = end + 1
+        return offsets
+
+
+def _count_newlines(data, chunk=1 << 20):
+    """Count the newlines of a bytes-like object, a chunk at a time."""
+    return sum(data[start:start + chunk].count(b"\n") for start in range(0, len(data), chunk))
+
+
+def _is_puzzle(text):
+    """Check that a normalized string has a board's length and only cell characters."""
+    return len(text) in ENCODED_LENGTHS and _VALID_CHARACTERS.issuperset(text)
+
+
+def _parse_lines(lines):
+    """
+    Parse puzzle lines, adding the line number to parse errors.
+    :param lines: Iterable of text lines.
+    :return: Generator of puzzle strings.
+    """
+    for number, line in enumerate(lines, 1):
+        try:
+            puzzle = parse_line(line)
+        except ValueError as error:
+            raise ValueError(f"Line {number}: {error}") from None
+        if puzzle is not None:
+            yield puzzle
+
+
+def _write_lines(stream, puzzles, blank):
+    """
+    Write puzzles to an open text stream.
+    :return: Number of puzzles written.
+    """
+    count = 0
+    for puzzle in puzzles:
+        if isinstance(puzzle, Board):
+            puzzle = str(puzzle)
+        elif not isinstance(puzzle, str):
+            puzzle = encode_board(puzzle)
+        if blank != "0":
+            puzzle = puzzle.replace("0", blank)
+        stream.write(puzzle)
+        stream.write("\n")
+        count += 1
+    return count
@@ -0,0 +1,278 @@
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional
+
+from config.settings import BATCH_CHUNKSIZE, PUZZLE_STORE_BATCH, PUZZLE_STORE_PATH
+from core.entities.board import Board
+from core.logic.grader import Grader
+from core.logic.stats import SolveStats
+from core.logic.sudoku_solver import SudokuSolver
+from utils.board_codec import pack_board, unpack_board
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    key BLOB PRIMARY KEY,
+    solution BLOB,
+    rating REAL,
+    difficulty TEXT,
+    hardest TEXT,
+    nodes INTEGER,
+    backtracks INTEGER,
+    solve_seconds REAL,
+    sample REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_by_difficulty ON puzzles (difficulty, sample);
+"""
+_COLUMNS = "key, solution, rating, difficulty, hardest, nodes, backtracks, solve_seconds"
+# Probes per requested puzzle before sample() falls back to reading in index order.
+_SAMPLE_PROBES = 4
+
+
+@dataclass(frozen=True)
+class StoredPuzzle:
+    """A puzzle with its solution, grade and solve statistics. Missing values are None."""
+
+    puzzle: str
+    solution: Optional[str] = None
+    rating: Optional[float] = None
+    difficulty: Optional[str] = None
+    hardest: Optional[str] = None
+    nodes: Optional[int] = None
+    backtracks: Optional[int] = None
+    solve_seconds: Optional[float] = None
+
+    @property
+    def solved(self):
+        return self.solution is not None
+
+
+def analyze(board, grader=None):
+    """
+    Solve and grade a puzzle, for storing.
+    :param board: Board or puzzle string; it is not modified.
+    :param grader: Grader to rate it with (default: all techniques).
+    :return: StoredPuzzle. A puzzle without a solution has no solution, grade or difficulty.
+    """
+    if isinstance(board, str):
+        board = Board.from_string(board)
+    work = board.copy()
+    stats = SolveStats()
+    if not SudokuSolver.solve(work, stats=stats):
+        return StoredPuzzle(str(board), nodes=stats.nodes, backtracks=stats.backtracks)
+    grade = (grader or Grader()).grade(board)
+    return StoredPuzzle(
+        str(board), str(work), grade.rating, grade.difficulty, grade.hardest,
+        stats.nodes, stats.backtracks, stats.phase_seconds["total"],
+    )
+
+
+class PuzzleStore:
+    """
+    SQLite file of puzzles with their solutions, grades and solve statistics.
+
+    Rows are keyed by the packed puzzle (see utils.board_codec.pack_board), 35 bytes
+    for a 9x9 board, and solutions are packed the same way. Each write is one
+    transaction in write-ahead-log mode, so a crash leaves either the whole batch
+    or none of it, and readers never see half a write. Every row also gets a random
+    ``sample`` value, indexed with its difficulty, so drawing random puzzles of a
+    difficulty takes a few index lookups however large the store is.
+
+    One store may be shared between threads; calls are serialized. add_later()
+    solves, grades and stores puzzles on a background thread, for callers such as
+    the game loop that must not wait for grading.
+    """
+
+    def __init__(self, path=PUZZLE_STORE_PATH):
+        """
+        Open the store, creating the file and table if needed.
+        :param path: Database file ("~" is expanded), or ":memory:".
+        """
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # NORMAL keeps a WAL database consistent on a crash; a power cut may only drop the last commits.
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+        self._backlog = queue.Queue()
+        self._analyzer = None
+
+    def close(self):
+        """Finish analyzing the puzzles handed to add_later(), then close the database."""
+        if self._analyzer is not None:
+            self._backlog.put(None)
+            self._analyzer.join()
+            self._analyzer = None
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+
+    def __contains__(self, puzzle):
+        return self.get(puzzle) is not None
+
+    def add(self, record):
+        """
+        Insert or replace one puzzle.
+        :param record: StoredPuzzle.
+        """
+        self.add_many((record,))
+
+    def add_many(self, records):
+        """
+        Insert or replace many puzzles in a single transaction.
+        :param records: Iterable of StoredPuzzle.
+        :return: Number of records written.
+        """
+        rows = [_to_row(record) for record in records]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO puzzles ({_COLUMNS}, sample) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def get(self, puzzle):
+        """
+        Look a puzzle up.
+        :param puzzle: Board or puzzle string.
+        :return: StoredPuzzle, or None if the puzzle is not stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM puzzles WHERE key = ?", (pack_board(str(puzzle)),)
+            ).fetchone()
+        return None if row is None else _from_row(row)
+
+    def get_or_analyze(self, puzzle, grader=None):
+        """
+        Look a puzzle up, or solve, grade and store it the first time it is seen.
+        :param puzzle: Board or puzzle string.
+        :param grader: Grader used for new puzzles.
+        :return: StoredPuzzle.
+        """
+        record = self.get(puzzle)
+        if record is None:
+            record = analyze(puzzle, grader)
+            self.add(record)
+        return record
+
+    def add_later(self, puzzle):
+        """
+        Solve, grade and store a puzzle on a background thread, unless it is stored already.
+        :param puzzle: Board or puzzle string.
+        """
+        if self._analyzer is None:
+            self._analyzer = threading.Thread(target=self._analyze_backlog, name="puzzle-store", daemon=True)
+            self._analyzer.start()
+        self._backlog.put(str(puzzle))
+
+    def _analyze_backlog(self):
+        """Body of the add_later() thread; stops at a None puzzle."""
+        while True:
+            puzzle = self._backlog.get()
+            if puzzle is None:
+                return
+            try:
+                if self.get(puzzle) is None:
+                    self.add(analyze(puzzle))
+            except (ValueError, sqlite3.Error) as error:
+                logger.warning("Could not store puzzle %s: %s", puzzle, error)
+
+    def sample(self, difficulty, count=1, rng=random):
+        """
+        Draw random solvable puzzles of a difficulty.
+        :param difficulty: Difficulty name (see DIFFICULTIES).
+        :param count: Number of puzzles wanted.
+        :param rng: Random number generator (the random module or a random.Random).
+        :return: List of up to ``count`` distinct StoredPuzzles; fewer if the store has fewer.
+        """
+        found = {}
+        query = f"SELECT {_COLUMNS} FROM puzzles WHERE difficulty = ? AND sample >= ? ORDER BY sample LIMIT 1"
+        with self._lock:
+            for _ in range(count * _SAMPLE_PROBES):
+                if len(found) == count:
+                    break
+                row = self._connection.execute(query, (difficulty, rng.random())).fetchone()
+                if row is None:
+                    # Past the last sample value: wrap around to the first.
+                    row = self._connection.execute(query, (difficulty, 0.0)).fetchone()
+                if row is None:
+                    break
+                found.setdefault(row[0], row)
+            if len(found) < count:
+                rows = self._connection.execute(
+                    f"SELECT {_COLUMNS} FROM puzzles WHERE difficulty = ? ORDER BY sample LIMIT ?",
+                    (difficulty, count * _SAMPLE_PROBES),
+                ).fetchall()
+                for row in rows:
+                    if len(found) == count:
+                        break
+                    found.setdefault(row[0], row)
+        return [_from_row(row) for row in found.values()]
+
+    def counts(self):
+        """
+        Count the stored puzzles per difficulty.
+        :return: Dict of difficulty (None for unsolvable puzzles) to count.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT difficulty, COUNT(*) FROM puzzles GROUP BY difficulty").fetchall()
+        return dict(rows)
+
+
+def import_puzzles(store, puzzles, workers=1, batch=PUZZLE_STORE_BATCH):
+    """
+    Analyze and store the puzzles the store does not have yet, ``batch`` per transaction.
+    :param store: PuzzleStore to fill.
+    :param puzzles: Iterable of puzzle strings.
+    :param workers: Worker processes for solving and grading (None for one per CPU).
+    :param batch: Puzzles analyzed and written at a time.
+    :return: Tuple (number added, number already stored).
+    """
+    added = skipped = 0
+    pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        puzzles = iter(puzzles)
+        while True:
+            chunk = list(islice(puzzles, batch))
+            if not chunk:
+                break
+            new = [puzzle for puzzle in dict.fromkeys(chunk) if store.get(puzzle) is None]
+            skipped += len(chunk) - len(new)
+            records = map(analyze, new) if pool is None else pool.map(analyze, new, chunksize=BATCH_CHUNKSIZE)
+            added += store.add_many(records)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return added, skipped
+
+
+def _to_row(record):
+    solution = None if record.solution is None else pack_board(record.solution)
+    return (
+        pack_board(record.puzzle), solution, record.rating, record.difficulty, record.hardest,
+        record.nodes, record.backtracks, record.solve_seconds, random.random(),
+    )
+
+
+def _from_row(row):
+    key, solution, *fields = row
+    return StoredPuzzle(unpack_board(key), None if solution is None else unpack_board(solution), *fields)
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+
+from config.logging_config import configure_logging
+from config.settings import (
+    BLANK_COUNT, BOARD_SIZE, DIFFICULTY_BLANKS, PUZZLE_STORE_PATH, SEED_PUZZLES_PATH, SERVICE_BATCH_SIZE, SERVICE_HOST,
+    SERVICE_MAX_IN_FLIGHT, SERVICE_PORT, SOLVER_STRATEGY, STARTUP_BUDGET_MS
+)
+from core.entities.board import Board
+from core.logic.canonical import canonical_form
+from core.logic.grader import DIFFICULTIES, Grader
+from core.logic.hints import HintEngine
+from core.logic.stats import collect_stats
+from core.logic.sudoku_solver import STRATEGIES, SudokuSolver
+from core.logic.tracing import JsonLinesTracer
+from core.logic.units import BOARD_SIZES
+from puzzles.__main__ import add_solve_arguments, run_solve
+from puzzles.io import read_puzzles, write_puzzles
+from use_cases.sudoku_generator import SudokuGenerator, load_seed_puzzles
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def run_generate(args):
+    """
+    Generate puzzles and write them one per line.
+    :param args: Parsed arguments of the generate command.
+    :return: Process exit code (1 if the generator could not reach the requested puzzle).
+    """
+    blanks = args.blanks
+    if blanks is None:
+        blanks = DIFFICULTY_BLANKS.get(args.difficulty, BLANK_COUNT) if args.size == 9 else BLANK_COUNT
+    seeds = load_seed_puzzles(args.seeds) if args.seeds else None
+    generator = SudokuGenerator(args.size, blanks, seeds=seeds, difficulty=args.difficulty)
+
+    def puzzles():
+        for _ in range(args.count):
+            generator.generate_board()
+            yield generator.puzzle
+
+    try:
+        write_puzzles(args.output, puzzles(), blank=args.blank)
+    except RuntimeError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_canonical(args):
+    """
+    Write the canonical form of every puzzle, one per line.
+    :param args: Parsed arguments of the canonical command.
+    :return: Process exit code.
+    """
+    def forms():
+        for puzzle in read_puzzles(args.input):
+            board = Board.from_string(puzzle)
+            yield Board(board.size, canonical_form(board)[0])
+
+    write_puzzles(args.output, forms(), blank=args.blank)
+    return 0
+
+
+def run_store(args):
+    """
+    Import puzzles into the puzzle store, draw random ones, or summarize it.
+    :param args: Parsed arguments of the store command.
+    :return: Process exit code (1 if sampling found no puzzle).
+    """
+    from puzzles.store import PuzzleStore, import_puzzles
+
+    with PuzzleStore(args.db) as store:
+        if args.store_command == "import":
+            added, skipped = import_puzzles(store, read_puzzles(args.input), workers=args.workers or None)
+            print(f"added {added} puzzles, {skipped} already stored, {len(store)} in {store.path}")
+        elif args.store_command == "sample":
+            records = store.sample(args.difficulty, args.count)
+            for record in records:
+                sys.stdout.write(f"{record.puzzle} {record.rating:.1f} {record.difficulty} {record.hardest}\n")
+            return 0 if records else 1
+        else:
+            for difficulty, count in sorted(store.counts().items(), key=lambda item: str(item[0])):
+                print(f"{difficulty or 'unsolvable':<12}{count:>10}")
+    return 0
+
+
+def run_grade(args):
+    """
+    Grade every puzzle and write "puzzle rating difficulty hardest-technique" lines to stdout.
+    :param args: Parsed arguments of the grade command.
+    :return: Process exit code.
+    """
+    grader = Grader()
+    for puzzle in read_puzzles(args.input):
+        grade = grader.grade(Board.from_string(puzzle))
+        if args.difficulty is None or grade.difficulty == args.difficulty:
+            sys.stdout.write(f"{puzzle} {grade.rating:.1f} {grade.difficulty} {grade.hardest}\n")
+    sys.stdout.flush()
+    return 0
+
+
+def run_hint(args):
+    """
+    Write the next logical step of every puzzle (a game in progress works too) as a JSON line.
+    With --all, write every step until the puzzle is solved, as a JSON array per puzzle.
+    :param args: Parsed arguments of the hint command.
+    :return: Process exit code (1 if a puzzle had no hint).
+    """
+    grader = Grader()
+    missing = 0
+    for puzzle in read_puzzles(args.input):
+        hints = HintEngine(Board.from_string(puzzle), grader=grader)
+        steps = []
+        hint = hints.next_hint()
+        while hint is not None:
+            steps.append(hint.as_dict())
+            if not args.all:
+                break
+            hints.place(hint.row, hint.col, hint.digit)
+            hint = hints.next_hint()
+        missing += not steps
+        result = steps if args.all else (steps[0] if steps else None)
+        sys.stdout.write(json.dumps({"puzzle": puzzle, "hint" + ("s" if args.all else ""): result}) + "\n")
+    sys.stdout.flush()
+    return 1 if missing else 0
+
+
+def run_serve(args):
+    """
+    Run the JSON solve service until interrupted.
+    :param args: Parsed arguments of the serve command.
+    :return: Process exit code.
+    """
+    from use_cases.solve_service import SolveService
+
+    async def serve():
+        service = SolveService(args.workers, args.batch_size, args.max_in_flight)
+        if args.unix:
+            await service.start_unix(args.unix)
+            print(f"Serving on {args.unix} with {service.workers} workers", file=sys.stderr)
+        else:
+            host, port = await service.start_tcp(args.host, args.port)
+            print(f"Serving on {host}:{port} with {service.workers} workers", file=sys.stderr)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_bench(args):
+    """
+    Time the solver on a corpus, and optionally check headless startup time.
+    :param args: Parsed arguments of the bench command.
+    :return: Process exit code (1 if a puzzle was not solved or startup is over budget).
+    """
+    # Imported here so the solve and generate commands never load the benchmarks package.
+    from benchmarks.bench_engines import DEFAULT_CORPUS, is_complete_solution, load_corpus
+
+    puzzles = load_corpus(args.corpus or DEFAULT_CORPUS)
+    failures = 0
+    summaries = {}
+    with ExitStack() as stack:
+        trace = stack.enter_context(open(args.trace, "w")) if args.trace else None
+        for strategy in args.strategy:
+            with collect_stats() as collector:
+                start = time.perf_counter()
+                solved = 0
+                for puzzle in puzzles:
+                    board = [row[:] for row in puzzle]
+                    tracer = JsonLinesTracer(trace) if trace else None
+                    SudokuSolver.solve(board, strategy=strategy, tracer=tracer)
+                    solved += is_complete_solution(board)
+                elapsed = time.perf_counter() - start
+            failures += len(puzzles) - solved
+            print(
+                f"{strategy:<10}{solved:>6}/{len(puzzles)} solved  {elapsed * 1000:10.2f} ms"
+                f"  {len(puzzles) / elapsed:10.1f} puzzles/s"
+            )
+            summaries[strategy] = collector.summary()
+            if args.stats:
+                _print_summary(summaries[strategy])
+    if args.stats_json:
+        with open(args.stats_json, "w") as stats_file:
+            json.dump(summaries, stats_file, indent=2, sort_keys=True)
+
+    if args.startup:
+        from benchmarks.bench_startup import check_startup
+
+        fastest, problems = check_startup(args.max_startup_ms / 1000)
+        print(f"headless import: {fastest * 1000:.1f} ms")
+        for problem in problems:
+            print(f"FAIL: {problem}", file=sys.stderr)
+        failures += len(problems)
+
+    return 1 if failures else 0
+
+
+def _print_summary(summary):
+    """
+    Print the percentiles of the main solve metrics.
+    :param summary: Output of StatsCollector.summary().
+    """
+    for metric in ("nodes", "backtracks", "max_depth", "eliminations", "propagation_seconds", "total_seconds"):
+        entry = summary.get(metric)
+        if entry:
+            print(
+                f"  {metric:<20} mean {entry['mean']:>10.4g}  p50 {entry['p50']:>10.4g}"
+                f"  p90 {entry['p90']:>10.4g}  p99 {entry['p99']:>10.4g}  max {entry['max']:>10.4g}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sudoku", description="Headless Sudoku solver and generator.")
+    parser.add_argument(
+        "--log-level", type=str.upper, choices=LOG_LEVELS, default="WARNING", help="Logging level (default: WARNING)."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="Solve a puzzle file and write the solutions to stdout.")
+    add_solve_arguments(solve)
+    solve.set_defaults(handler=run_solve)
+
+    generate = commands.add_parser("generate", help="Generate puzzles with a unique solution.")
+    generate.add_argument("-n", "--count", type=int, default=1, help="Number of puzzles to generate.")
+    generate.add_argument("--size", type=int, choices=BOARD_SIZES, default=BOARD_SIZE, help="Rows per board.")
+    generate.add_argument(
+        "--blanks", type=int,
+        help=f"Empty cells per puzzle (default: {BLANK_COUNT}, or the band's DIFFICULTY_BLANKS with --difficulty).",
+    )
+    generate.add_argument("-o", "--output", default="-", help="Output file (default: stdout).")
+    generate.add_argument("--blank", choices=("0", "."), default="0", help="Character written for empty cells.")
+    generate.add_argument(
+        "--seeds", nargs="?", const=SEED_PUZZLES_PATH,
+        help=f"Transform puzzles from this seed file instead of building new ones (default file: {SEED_PUZZLES_PATH}).",
+    )
+    generate.add_argument("--difficulty", choices=DIFFICULTIES, help="Keep only puzzles graded into this band.")
+    generate.set_defaults(handler=run_generate)
+
+    grade = commands.add_parser("grade", help="Rate puzzles by the hardest solving technique they need.")
+    grade.add_argument("input", nargs="?", default="-", help="Puzzle file (default: stdin).")
+    grade.add_argument("--difficulty", choices=DIFFICULTIES, help="Write only puzzles graded into this band.")
+    grade.set_defaults(handler=run_grade)
+
+    hint = commands.add_parser("hint", help="Explain the next logical step of puzzles or games in progress.")
+    hint.add_argument("input", nargs="?", default="-", help="Puzzle file (default: stdin).")
+    hint.add_argument("--all", action="store_true", help="Write every step to the solution, not just the next one.")
+    hint.set_defaults(handler=run_hint)
+
+    serve = commands.add_parser("serve", help="Serve solve, count, validate and generate requests as JSON lines.")
+    serve.add_argument("--host", default=SERVICE_HOST, help=f"Address to listen on (default: {SERVICE_HOST}).")
+    serve.add_argument("--port", type=int, default=SERVICE_PORT, help=f"TCP port (default: {SERVICE_PORT}).")
+    serve.add_argument("--unix", help="Listen on this Unix socket instead of TCP.")
+    serve.add_argument("--workers", type=int, help="Worker processes (default: one per CPU).")
+    serve.add_argument(
+        "--batch-size", type=int, default=SERVICE_BATCH_SIZE, help="Most requests sent to a worker at once."
+    )
+    serve.add_argument(
+        "--max-in-flight", type=int, default=SERVICE_MAX_IN_FLIGHT,
+        help="Most requests accepted at once; past it the server stops reading.",
+    )
+    serve.set_defaults(handler=run_serve)
+
+    store = commands.add_parser("store", help="Keep puzzles with their solutions and grades in a local database.")
+    store.add_argument("--db", default=PUZZLE_STORE_PATH, help=f"Database file (default: {PUZZLE_STORE_PATH}).")
+    store_commands = store.add_subparsers(dest="store_command", required=True)
+    store_import = store_commands.add_parser("import", help="Solve, grade and store the puzzles of a file.")
+    store_import.add_argument("input", nargs="?", default="-", help="Puzzle file (default: stdin).")
+    store_import.add_argument("--workers", type=int, default=1, help="Worker processes (0 for one per CPU).")
+    store_sample = store_commands.add_parser("sample", help="Write random stored puzzles of a difficulty.")
+    store_sample.add_argument("--difficulty", choices=DIFFICULTIES, required=True, help="Difficulty band.")
+    store_sample.add_argument("-n", "--count", type=int, default=1, help="Number of puzzles.")
+    store_commands.add_parser("info", help="Count the stored puzzles per difficulty.")
+    store.set_defaults(handler=run_store)
+
+    canonical = commands.add_parser("canonical", help="Write the canonical form of every puzzle under Sudoku symmetries.")
+    canonical.add_argument("input", nargs="?", default="-", help="Puzzle file (default: stdin).")
+    canonical.add_argument("-o", "--output", default="-", help="Output file (default: stdout).")
+    canonical.add_argument("--blank", choices=("0", "."), default="0", help="Character written for empty cells.")
+    canonical.set_defaults(handler=run_canonical)
+
+    bench = commands.add_parser("bench", help="Time the solver on a puzzle corpus.")
+    bench.add_argument(
+        "--corpus", help="Puzzle file, one puzzle per line (default: benchmarks/corpus/reference.txt)."
+    )
+    bench.add_argument(
+        "--strategy", choices=STRATEGIES, action="append", help=f"Solver backend (default: {SOLVER_STRATEGY})."
+    )
+    bench.add_argument("--stats", action="store_true", help="Print percentiles of nodes, backtracks and timings.")
+    bench.add_argument("--stats-json", help="Write the full per-metric percentile summary to this JSON file.")
+    bench.add_argument("--trace", help="Write solver events as JSON lines to this file (slows the run).")
+    bench.add_argument("--startup", action="store_true", help="Also check that headless imports stay fast.")
+    bench.add_argument("--max-startup-ms", type=float, default=STARTUP_BUDGET_MS, help="Startup budget for --startup.")
+    bench.set_defaults(handler=run_bench)
+
+    args = parser.parse_args(argv)
+    configure_logging(getattr(logging, args.log_level))
+    if args.command == "bench" and not args.strategy:
+        args.strategy = [SOLVER_STRATEGY]
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
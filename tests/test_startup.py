@@ -0,0 +1,12 @@
+from benchmarks.bench_startup import GUI_MODULES, check_startup, measure_startup
+from config.settings import STARTUP_BUDGET_MS
+
+
+def test_headless_import_loads_no_gui_modules():
+    loaded = measure_startup()["gui_modules"]
+    assert not loaded, f"headless import loaded {', '.join(loaded)} (any of {', '.join(GUI_MODULES)})"
+
+
+def test_headless_import_stays_within_budget():
+    fastest, problems = check_startup(STARTUP_BUDGET_MS / 1000)
+    assert not problems, "; ".join(problems)
@@ -0,0 +1,138 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional
+
+from config.settings import BATCH_CHUNKSIZE, BATCH_PENDING_CHUNKS_PER_WORKER, SOLVER_STRATEGY
+from core.entities.board import Board
+from core.logic.sudoku_solver import SudokuSolver
+from utils.board_codec import encode_board
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one puzzle in a batch."""
+
+    index: int
+    puzzle: str
+    solution: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def solved(self):
+        return self.solution is not None
+
+
+def solve_many(boards, workers=None, chunksize=BATCH_CHUNKSIZE, ordered=True, strategy=SOLVER_STRATEGY):
+    """
+    Solve many boards across a pool of worker processes.
+
+    Boards travel to the workers as encoded strings in chunks of ``chunksize``,
+    and only a few chunks per worker are in flight at a time, so ``boards`` can be
+    an arbitrarily long stream.
+    :param boards: Iterable of Boards, 2D lists or encoded board strings.
+    :param workers: Number of worker processes (None for one per CPU, 1 to solve in this process).
+    :param chunksize: Number of puzzles sent to a worker at once.
+    :param ordered: Yield results in input order if True, otherwise as soon as each chunk finishes.
+    :param strategy: Solver backend passed to SudokuSolver.solve.
+    :return: Generator of BatchResult, one per input board.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunk size must be at least 1.")
+
+    chunks = _chunked(_encode_all(boards), chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _collect(chunk, _solve_chunk(chunk, strategy))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        finished = {}
+        next_sequence = 0
+        submitted = 0
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < workers * BATCH_PENDING_CHUNKS_PER_WORKER:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                future = pool.submit(_solve_chunk, chunk, strategy)
+                pending[future] = (submitted, chunk)
+                submitted += 1
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                sequence, chunk = pending.pop(future)
+                results = _collect(chunk, future.result())
+                if ordered:
+                    finished[sequence] = results
+                else:
+                    yield from results
+
+            while next_sequence in finished:
+                yield from finished.pop(next_sequence)
+                next_sequence += 1
+
+
+def _encode_all(boards):
+    """
+    Number and encode the input boards lazily.
+    :param boards: Iterable of Boards, 2D lists or encoded board strings.
+    :return: Generator of (index, encoded board).
+    """
+    for index, board in enumerate(boards):
+        if isinstance(board, Board):
+            board = str(board)
+        yield index, board if isinstance(board, str) else encode_board(board)
+
+
+def _chunked(items, chunksize):
+    """
+    Split an iterator into lists of at most ``chunksize`` items.
+    :return: Iterator of lists.
+    """
+    items = iter(items)
+    return iter(lambda: list(islice(items, chunksize)) or None, None)
+
+
+def _collect(chunk, outcomes):
+    """
+    Pair worker outcomes with the puzzles they belong to.
+    :param chunk: List of (index, puzzle) sent to the worker.
+    :param outcomes: List of (solution, error) returned by the worker.
+    :return: List of BatchResult.
+    """
+    return [
+        BatchResult(index, puzzle, solution, error)
+        for (index, puzzle), (solution, error) in zip(chunk, outcomes)
+    ]
+
+
+def _solve_chunk(chunk, strategy):
+    """
+    Solve a chunk of encoded boards. Runs in a worker process.
+    :param chunk: List of (index, puzzle string).
+    :param strategy: Solver backend passed to SudokuSolver.solve.
+    :return: List of (solution string or None, error message or None).
+    """
+    outcomes = []
+    for _, puzzle in chunk:
+        try:
+            board = Board.from_string(puzzle)
+            if not SudokuSolver.is_valid_sudoku(board):
+                outcomes.append((None, "invalid board"))
+            elif SudokuSolver.solve(board, strategy=strategy):
+                outcomes.append((str(board), None))
+            else:
+                outcomes.append((None, "no solution"))
+        except Exception as error:  # Report the failure for this puzzle and keep the batch going.
+            outcomes.append((None, f"{type(error).__name__}: {error}"))
+    return outcomes
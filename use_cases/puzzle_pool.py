@@ -0,0 +1,176 @@
+import logging
+import os
+import threading
+from collections import deque
+
+from config.settings import BOARD_SIZE, PUZZLE_POOL_BLANKS, PUZZLE_POOL_CAPACITY, PUZZLE_POOL_MAX_FAILURES
+from core.entities.board import Board
+from puzzles.io import COMMENT_PREFIX, parse_line
+from use_cases.sudoku_generator import SudokuGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzlePool:
+    """
+    Keeps a few generated puzzles ready per difficulty, so a new game starts instantly.
+
+    A daemon thread tops every difficulty up to ``capacity`` puzzles and then sleeps
+    until one is taken. A difficulty the generator fails to reach
+    PUZZLE_POOL_MAX_FAILURES times in a row is no longer refilled; pop() still
+    generates one on the spot. When ``path`` is given, the remaining puzzles are
+    saved on close and loaded again on the next start, so even the first game of a
+    run is ready at once.
+    """
+
+    def __init__(self, blanks=PUZZLE_POOL_BLANKS, capacity=PUZZLE_POOL_CAPACITY, grid_size=BOARD_SIZE, path=None):
+        """
+        Initialize the pool. Call start() to begin refilling it in the background.
+        :param blanks: Dict of difficulty (see DIFFICULTIES) to the number of blanks of its puzzles.
+        :param capacity: Puzzles kept ready per difficulty.
+        :param grid_size: Size of the Sudoku grid.
+        :param path: Optional file the pool is loaded from and saved to.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.generators = {
+            difficulty: SudokuGenerator(grid_size, count, difficulty=difficulty) for difficulty, count in blanks.items()
+        }
+        self.capacity = capacity
+        self.grid_size = grid_size
+        self.path = path
+        self._puzzles = {difficulty: deque() for difficulty in blanks}
+        # Consecutive generator failures per difficulty; refilling stops at PUZZLE_POOL_MAX_FAILURES.
+        self._failures = dict.fromkeys(blanks, 0)
+        self._changed = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def start(self):
+        """Start the background refill thread."""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._refill, name="puzzle-pool", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the refill thread, waiting for the puzzle in progress, and save the pool if it has a path."""
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.path is not None:
+            self._save()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pop(self, difficulty, generate=True):
+        """
+        Take a ready puzzle, or generate one on the spot if the pool has run dry.
+        :param difficulty: One of the difficulties the pool was created with.
+        :param generate: False to return None instead of generating when none is ready.
+        :return: Board with the puzzle.
+        :raises ValueError: If the pool does not keep this difficulty.
+        """
+        if difficulty not in self._puzzles:
+            raise ValueError(f"The pool keeps no {difficulty!r} puzzles.")
+        with self._changed:
+            if self._puzzles[difficulty]:
+                puzzle = self._puzzles[difficulty].popleft()
+                self._changed.notify_all()
+                return Board.from_string(puzzle)
+        if not generate:
+            return None
+
+        logger.info("Puzzle pool has no %s puzzle ready; generating one now.", difficulty)
+        generator = SudokuGenerator(self.grid_size, self.generators[difficulty].blanks_count, difficulty=difficulty)
+        generator.generate_board()
+        return generator.puzzle
+
+    def ready(self):
+        """
+        Count the ready puzzles.
+        :return: Dict of difficulty to number of puzzles.
+        """
+        with self._changed:
+            return {difficulty: len(puzzles) for difficulty, puzzles in self._puzzles.items()}
+
+    def _next_difficulty(self):
+        """Pick the difficulty with the fewest ready puzzles, or None when all are full."""
+        missing = [
+            (len(puzzles), difficulty) for difficulty, puzzles in self._puzzles.items()
+            if len(puzzles) < self.capacity and self._failures[difficulty] < PUZZLE_POOL_MAX_FAILURES
+        ]
+        return min(missing)[1] if missing else None
+
+    def _refill(self):
+        """Body of the refill thread."""
+        while True:
+            with self._changed:
+                while not self._stopping and self._next_difficulty() is None:
+                    self._changed.wait()
+                if self._stopping:
+                    return
+                difficulty = self._next_difficulty()
+
+            generator = self.generators[difficulty]
+            try:
+                generator.generate_board()
+            except RuntimeError as error:
+                # Rare bands can take several rounds of attempts, but not forever.
+                with self._changed:
+                    self._failures[difficulty] += 1
+                    failures = self._failures[difficulty]
+                if failures < PUZZLE_POOL_MAX_FAILURES:
+                    logger.debug("Puzzle pool refill: %s", error)
+                else:
+                    logger.warning(
+                        "Puzzle pool stops refilling %s puzzles after %d failures in a row: %s",
+                        difficulty, failures, error,
+                    )
+                continue
+
+            with self._changed:
+                self._failures[difficulty] = 0
+                self._puzzles[difficulty].append(str(generator.puzzle))
+                self._changed.notify_all()
+
+    def _load(self):
+        """Read saved puzzles, skipping any that no longer match the pool's settings."""
+        with open(self.path, encoding="ascii") as stream:
+            for line in stream:
+                if line.startswith(COMMENT_PREFIX) or not line.strip():
+                    continue
+                fields = line.split()
+                try:
+                    puzzle = parse_line(fields[0])
+                except ValueError:
+                    continue
+                difficulty = fields[1] if len(fields) > 1 else None
+                generator = self.generators.get(difficulty)
+                if (
+                    generator is not None
+                    and len(puzzle) == self.grid_size * self.grid_size
+                    and puzzle.count("0") == generator.blanks_count
+                    and len(self._puzzles[difficulty]) < self.capacity
+                ):
+                    self._puzzles[difficulty].append(puzzle)
+
+    def _save(self):
+        """Write the ready puzzles, one "puzzle difficulty" line each, replacing the file atomically."""
+        with self._changed:
+            lines = [f"{puzzle} {difficulty}\n" for difficulty, puzzles in self._puzzles.items() for puzzle in puzzles]
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="ascii") as stream:
+            stream.write(f"{COMMENT_PREFIX} Ready puzzles of the puzzle pool: puzzle difficulty\n")
+            stream.writelines(lines)
+        os.replace(temporary, self.path)
@@ -0,0 +1,392 @@
+import asyncio
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from config.settings import (
+    BLANK_COUNT, BOARD_SIZE, SERVICE_BATCH_SIZE, SERVICE_GENERATE_SIZES, SERVICE_MAX_COUNT_LIMIT,
+    SERVICE_MAX_IN_FLIGHT, SERVICE_MAX_LINE_BYTES
+)
+from core.entities.board import Board
+from core.logic.sudoku_solver import SudokuSolver
+
+logger = logging.getLogger(__name__)
+
+SOLVE = "solve"
+COUNT = "count"
+VALIDATE = "validate"
+GENERATE = "generate"
+OPERATIONS = (SOLVE, COUNT, VALIDATE, GENERATE)
+
+
+class SolveService:
+    """
+    Line-delimited JSON service for solving, counting, validating and generating puzzles.
+
+    Every request is one JSON object per line, such as
+    ``{"id": 1, "op": "solve", "puzzle": "53..7...."}``, and gets one response line,
+    ``{"id": 1, "ok": true, "result": {...}}`` or ``{"id": 1, "ok": false, "error": "..."}``.
+    A connection may send many requests without waiting; responses come back as
+    they finish, so match them by ``id``.
+
+    Every request is bounded: ``count`` stops at its ``limit`` (default 2, at most
+    SERVICE_MAX_COUNT_LIMIT), and ``generate`` only builds boards of the sizes in
+    SERVICE_GENERATE_SIZES.
+
+    Solving, counting and generating run in worker processes, so the event loop only
+    parses and routes lines; validation is cheap and answered on the loop. While a
+    worker is idle, a request is sent to it at once. While all are busy, requests
+    of the same operation queue up and go out together, up to ``batch_size`` per
+    batch, so the per-batch overhead shrinks exactly when the load is high.
+
+    At most ``max_in_flight`` requests are accepted at a time over all connections;
+    past that, the server stops reading from sockets until a request finishes, so
+    busy clients are slowed down by TCP itself rather than queued without bound.
+    """
+
+    def __init__(self, workers=None, batch_size=SERVICE_BATCH_SIZE, max_in_flight=SERVICE_MAX_IN_FLIGHT):
+        """
+        Initialize the service. Call start_tcp() or start_unix() inside a running event loop.
+        :param workers: Number of worker processes (None for one per CPU).
+        :param batch_size: Most requests sent to a worker at once.
+        :param max_in_flight: Most requests accepted but not yet answered.
+        """
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("batch_size and max_in_flight must be at least 1.")
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.served = 0
+        self.failed = 0
+        self._pool = None
+        self._server = None
+        self._unix_path = None
+        self._slots = None
+        self._batches = {}
+        self._running = 0
+        self._tasks = set()
+        # Handler task of each open connection, to its writer.
+        self._connections = {}
+
+    async def start_tcp(self, host, port):
+        """
+        Start listening on a TCP port.
+        :param port: Port number, or 0 for any free port.
+        :return: The (host, port) actually bound.
+        """
+        self._start_pool()
+        self._server = await asyncio.start_server(self._handle, host, port, limit=SERVICE_MAX_LINE_BYTES)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """
+        Start listening on a Unix socket.
+        :param path: Socket path.
+        """
+        self._start_pool()
+        self._server = await asyncio.start_unix_server(self._handle, path, limit=SERVICE_MAX_LINE_BYTES)
+        self._unix_path = path
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop accepting connections, answer the requests already accepted, close the
+        connections and shut the worker pool down.
+        """
+        if self._server is not None:
+            self._server.close()
+        for operation in list(self._batches):
+            self._flush(operation)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for writer in self._connections.values():
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        if self._unix_path is not None:
+            os.unlink(self._unix_path)
+            self._unix_path = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _start_pool(self):
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    async def _handle(self, reader, writer):
+        """Serve one connection: read request lines, and answer each as soon as it finishes."""
+        lock = asyncio.Lock()
+        pending = set()
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                # Waiting for a slot before reading is what pushes back on clients.
+                await self._slots.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError) as error:
+                    self._slots.release()
+                    logger.debug("Dropping connection: %s", error)
+                    break
+                if not line:
+                    self._slots.release()
+                    break
+                task = asyncio.create_task(self._answer(line, writer, lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _answer(self, line, writer, lock):
+        """Run one request and write its response line."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object.")
+            request_id = request.get("id")
+            response = {"id": request_id, "ok": True, "result": await self._run(request)}
+            self.served += 1
+        except Exception as error:  # Report the failure for this request and keep the connection going.
+            response = {"id": request_id, "ok": False, "error": _describe(error)}
+            self.failed += 1
+        finally:
+            self._slots.release()
+
+        async with lock:
+            try:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _run(self, request):
+        """
+        Route a request to its operation.
+        :return: Result dict of the operation.
+        :raises ValueError: If the request is malformed.
+        """
+        operation = request.get("op")
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown op {operation!r}; expected one of {', '.join(OPERATIONS)}.")
+        if operation == VALIDATE:
+            return _validate(request)
+        future = asyncio.get_running_loop().create_future()
+        queued = self._batches.setdefault(operation, [])
+        queued.append((request, future))
+        if self._running < self.workers or len(queued) >= self.batch_size:
+            self._flush(operation)
+        return await future
+
+    def _flush(self, operation):
+        """Send the queued requests of an operation to the worker pool as one batch."""
+        batch = self._batches.pop(operation, None)
+        if batch:
+            self._running += 1
+            task = asyncio.create_task(self._run_batch(operation, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, operation, batch):
+        """Run a batch in a worker process, hand every request its outcome, and send the next queued batch."""
+        requests = [request for request, _ in batch]
+        try:
+            outcomes = await asyncio.get_running_loop().run_in_executor(self._pool, _run_batch, operation, requests)
+        except Exception as error:  # A broken pool fails the whole batch, not the server.
+            outcomes = [(None, _describe(error))] * len(batch)
+        finally:
+            self._running -= 1
+        if self._batches:
+            # The longest queue has waited the longest on average.
+            self._flush(max(self._batches, key=lambda queued: len(self._batches[queued])))
+        for (_, future), (result, error) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError(error))
+
+
+class ServiceClient:
+    """
+    Client for SolveService. Requests are pipelined over one connection: many can
+    be awaited at the same time, and each gets its own response.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = {}
+        self._next_id = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port, limit=SERVICE_MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_unix(cls, path):
+        reader, writer = await asyncio.open_unix_connection(path, limit=SERVICE_MAX_LINE_BYTES)
+        return cls(reader, writer)
+
+    async def request(self, operation, **params):
+        """
+        Send one request and wait for its result.
+        :param operation: One of OPERATIONS.
+        :param params: Fields of the request, such as ``puzzle``.
+        :return: Result dict.
+        :raises ServiceError: If the service answered with an error.
+        :raises ConnectionError: If the connection closed first.
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, "op": operation, **params}).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _receive(self):
+        """Hand each response line to the request waiting for it."""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response.get("ok"):
+                    future.set_result(response["result"])
+                else:
+                    future.set_exception(ServiceError(response.get("error")))
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The service closed the connection."))
+            self._waiting.clear()
+
+
+class ServiceError(Exception):
+    """An error response from SolveService."""
+
+
+def _describe(error):
+    return str(error) if isinstance(error, ValueError) else f"{type(error).__name__}: {error}"
+
+
+def _init_worker():
+    # Forked workers share the parent's random state; give each its own.
+    random.seed()
+
+
+def _run_batch(operation, requests):
+    """
+    Run a batch of requests of one operation. Runs in a worker process.
+    :return: List of (result dict or None, error message or None).
+    """
+    handler = _HANDLERS[operation]
+    outcomes = []
+    for request in requests:
+        try:
+            outcomes.append((handler(request), None))
+        except Exception as error:  # Report the failure for this request and keep the batch going.
+            outcomes.append((None, _describe(error)))
+    return outcomes
+
+
+def _is_int(value):
+    # JSON true and false arrive as bools, which are ints to isinstance().
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _board(request):
+    """
+    Read the "puzzle" of a request.
+    :raises ValueError: If it is missing or not a valid board string.
+    """
+    puzzle = request.get("puzzle")
+    if not isinstance(puzzle, str):
+        raise ValueError('A "puzzle" string is required.')
+    return Board.from_string(puzzle)
+
+
+def _solve(request):
+    board = _board(request)
+    if not SudokuSolver.is_valid_sudoku(board):
+        return {"solution": None, "reason": "invalid board"}
+    if not SudokuSolver.solve(board):
+        return {"solution": None, "reason": "no solution"}
+    return {"solution": str(board)}
+
+
+def _count(request):
+    limit = request.get("limit", 2)
+    if not _is_int(limit) or not 1 <= limit <= SERVICE_MAX_COUNT_LIMIT:
+        raise ValueError(f'"limit" must be an integer from 1 to {SERVICE_MAX_COUNT_LIMIT}.')
+    board = _board(request)
+    if not SudokuSolver.is_valid_sudoku(board):
+        return {"count": 0, "reason": "invalid board"}
+    return {"count": SudokuSolver.count_solutions(board, limit=limit)}
+
+
+def _validate(request):
+    board = _board(request)
+    return {"valid": SudokuSolver.is_valid_sudoku(board), "complete": not board.empty_cells()}
+
+
+def _generate(request):
+    size = request.get("size", BOARD_SIZE)
+    blanks = request.get("blanks", BLANK_COUNT)
+    if not _is_int(size) or not _is_int(blanks):
+        raise ValueError('"size" and "blanks" must be integers.')
+    if size not in SERVICE_GENERATE_SIZES:
+        raise ValueError(f'"size" must be one of {", ".join(map(str, SERVICE_GENERATE_SIZES))}.')
+    generator = _generator(size, blanks, request.get("difficulty"), bool(request.get("seeded", False)))
+    generator.generate_board()
+    return {"puzzle": str(generator.puzzle)}
+
+
+@lru_cache(maxsize=32)
+def _generator(size, blanks, difficulty, seeded):
+    """Build a generator once per worker and setting, since seeded ones grade their seeds up front."""
+    from use_cases.sudoku_generator import SudokuGenerator, load_seed_puzzles
+
+    return SudokuGenerator(size, blanks, seeds=load_seed_puzzles() if seeded else None, difficulty=difficulty)
+
+
+_HANDLERS = {SOLVE: _solve, COUNT: _count, VALIDATE: _validate, GENERATE: _generate}
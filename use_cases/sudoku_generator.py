@@ -1,42 +1,175 @@
 import math
 import random
-from core.logic.sudoku_solver import SudokuSolver
+
+from config.settings import DIFFICULTY_BANDS, GENERATOR_MAX_ATTEMPTS, GENERATOR_STEER_MOVES, SEED_PUZZLES_PATH
+from core.entities.board import Board
+from core.logic.canonical import Transform
+from core.logic.grader import DIFFICULTIES, Grader
+from core.logic.sudoku_solver import MINIMUM_CLUES, SudokuSolver
+from puzzles.io import read_puzzles
 from utils.helpers import print_board
 
 
+def load_seed_puzzles(path=SEED_PUZZLES_PATH):
+    """
+    Read a seed set for symmetry-based generation.
+    :param path: Puzzle file, one puzzle per line; every puzzle must have a unique solution.
+    :return: List of puzzle strings.
+    """
+    return list(read_puzzles(path))
+
+
 class SudokuGenerator:
     """
     A class to represent the Sudoku generator.
     """
 
-    def __init__(self, grid_size, blanks_count):
+    def __init__(self, grid_size, blanks_count, seeds=None, difficulty=None):
         """
         Initialize the Sudoku game.
         :param grid_size: Size of the Sudoku grid (e.g., 9 for a 9x9 grid).
         :param blanks_count: Number of blank cells to remove for the puzzle.
+        :param seeds: Optional puzzles (strings, Boards or 2D lists) with a unique solution.
+            When given, each puzzle is a random symmetric variant of a seed with
+            ``blanks_count`` blanks, so it keeps the seed's unique solution and difficulty.
+        :param difficulty: Optional difficulty band (see DIFFICULTIES) every puzzle must grade into.
+        :raises ValueError: If the difficulty is unknown or no seed has this grid size,
+            blanks count and difficulty.
         """
         if not math.isqrt(grid_size) ** 2 == grid_size:
             raise ValueError("Grid size must be a perfect square (e.g., 4, 9, 16).")
-        if not (0 <= blanks_count <= grid_size * grid_size - 17):
-            raise ValueError("Blanks count must be between 0 and the total number of cells minus 17.")
+        minimum_clues = MINIMUM_CLUES.get(grid_size, 0)
+        if not (0 <= blanks_count <= grid_size * grid_size - minimum_clues):
+            raise ValueError(
+                f"Blanks count must be between 0 and the total number of cells minus {minimum_clues}."
+            )
+
+        if difficulty is not None and difficulty not in DIFFICULTIES:
+            raise ValueError(f"Difficulty must be one of {', '.join(DIFFICULTIES)}.")
 
         self.grid_size = grid_size
         self.blanks_count = blanks_count
+        self.difficulty = difficulty
+        self.grader = Grader()
         self.board = None
+        self.puzzle = None
+        # Solved board of the current random attempt, for steering it toward the band.
+        self._solution = None
+        self.seeds = None if seeds is None else self._matching_seeds(seeds)
 
     def generate_board(self):
-        while True:
+        """
+        Generate a puzzle with exactly ``blanks_count`` blanks and a unique solution,
+        in the requested difficulty band if there is one.
+        The puzzle is stored both as a Board in ``self.puzzle`` and as a 2D list in ``self.board``.
+        :raises RuntimeError: If no attempt gave a puzzle with enough blanks, a unique solution
+            and the requested difficulty.
+        """
+        if self.seeds is not None:
+            self._generate_from_seed()
+            self.board = self.puzzle.to_rows()
+            return
+
+        for _ in range(GENERATOR_MAX_ATTEMPTS):
             self._generate_random_board()
-            if SudokuSolver.solve([row[:] for row in self.board]):
-                break
+            if len(self.blank_positions) == self.blanks_count and self._steer_to_difficulty():
+                self.board = self.puzzle.to_rows()
+                return
+
+        band = f", rated {self.difficulty}," if self.difficulty else ""
+        raise RuntimeError(
+            f"Could not generate a puzzle with {self.blanks_count} blanks{band} and a unique solution "
+            f"after {GENERATOR_MAX_ATTEMPTS} attempts."
+        )
+
+    def _has_difficulty(self, puzzle):
+        """
+        Check whether a puzzle grades into the requested difficulty band.
+        :param puzzle: Board to grade.
+        :return: True if it does, or if no band was requested.
+        """
+        return self.difficulty is None or self.grader.grade(puzzle).difficulty == self.difficulty
+
+    def _steer_to_difficulty(self):
+        """
+        Move the puzzle into the requested difficulty band by swapping blanks and clues.
+        Each move fills a random blank from the solution and empties a random clue, so the
+        blanks count stays the same. A move is kept if the puzzle still has a unique
+        solution and its rating is no further from the band than before.
+        :return: True once the puzzle grades into the band (always, if no band was requested).
+        """
+        if self.difficulty is None:
+            return True
+        distance = self._band_distance(self.grader.grade(self.puzzle).rating)
+        cells = self.puzzle.cells
+        for _ in range(GENERATOR_STEER_MOVES):
+            if distance == (False, 0.0):
+                self.blank_positions = [divmod(cell, self.grid_size) for cell in self.puzzle.empty_cells()]
+                return True
+            blank = random.choice(self.puzzle.empty_cells())
+            clue = random.choice([cell for cell, value in enumerate(cells) if value])
+            cells[blank], cells[clue], value = self._solution.cells[blank], 0, cells[clue]
+            if SudokuSolver.count_solutions(self.puzzle, limit=2) == 1:
+                moved = self._band_distance(self.grader.grade(self.puzzle).rating)
+                if moved <= distance:
+                    distance = moved
+                    continue
+            cells[blank], cells[clue] = 0, value
+        return distance == (False, 0.0)
+
+    def _band_distance(self, rating):
+        """
+        How far a rating is from the requested band.
+        :return: Tuple (outside the band, rating gap to its nearest edge); (False, 0.0) inside it.
+        """
+        low, high = _band_bounds(self.difficulty)
+        if rating <= low:
+            return True, low - rating
+        if rating > high:
+            return True, rating - high
+        return False, 0.0
+
+    def _matching_seeds(self, seeds):
+        """
+        Keep the seeds with this generator's grid size, blanks count and difficulty.
+        Symmetric variants grade the same as their seed, so each seed is graded once.
+        :return: List of Boards.
+        """
+        matching = []
+        for seed in seeds:
+            if isinstance(seed, str):
+                seed = Board.from_string(seed)
+            elif not isinstance(seed, Board):
+                seed = Board.from_rows(seed)
+            if (
+                seed.size == self.grid_size
+                and len(seed.empty_cells()) == self.blanks_count
+                and self._has_difficulty(seed)
+            ):
+                matching.append(seed)
+        if not matching:
+            band = f" rated {self.difficulty}" if self.difficulty else ""
+            raise ValueError(
+                f"No seed puzzle is {self.grid_size}x{self.grid_size} with {self.blanks_count} blanks{band}."
+            )
+        return matching
+
+    def _generate_from_seed(self):
+        """
+        Generate a Sudoku puzzle by applying a random symmetry to a random seed.
+        """
+        seed = random.choice(self.seeds)
+        self.puzzle = Board(self.grid_size, Transform.random(self.grid_size).apply(seed.cells))
+        self.blank_positions = [divmod(cell, self.grid_size) for cell in self.puzzle.empty_cells()]
 
     def _generate_random_board(self):
         """
         Generate a Sudoku puzzle by filling the board and removing blanks.
         """
-        self.board = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        self.puzzle = Board(self.grid_size)
         self._fill_diagonal_subgrids()
         self._fill_remaining_cells()
+        self._solution = self.puzzle.copy()
         self._remove_blank_cells()
 
     def _fill_diagonal_subgrids(self):
@@ -58,29 +191,33 @@ class SudokuGenerator:
         random.shuffle(nums)
         for i in range(subgrid_size):
             for j in range(subgrid_size):
-                self.board[start_row + i][start_col + j] = nums.pop()
+                self.puzzle[start_row + i, start_col + j] = nums.pop()
 
     def _fill_remaining_cells(self):
         """
         Fill the remaining cells of the Sudoku board using the solver.
         """
-        SudokuSolver.solve(self.board)
+        SudokuSolver.solve(self.puzzle)
 
     def _remove_blank_cells(self):
         """
         Remove a specified number of cells to create the puzzle, ensuring
-        that blanks are evenly distributed across the board.
+        that blanks are evenly distributed across the board and that the
+        puzzle keeps a unique solution. A removal that would allow a second
+        solution is undone and the region tries its next cell; any shortfall
+        is carried over to the following regions, and finally to the whole board.
         """
         region_size = int(self.grid_size ** 0.5)
         blanks_per_region = self.blanks_count // (region_size * region_size)
         extra_blanks = self.blanks_count % (region_size * region_size)
 
         blanks = set()
+        carried_blanks = 0
 
         # Distribute blanks evenly across regions
         for region_row in range(region_size):
             for region_col in range(region_size):
-                region_blanks = blanks_per_region
+                region_blanks = blanks_per_region + carried_blanks
                 if extra_blanks > 0:
                     region_blanks += 1
                     extra_blanks -= 1
@@ -92,10 +229,32 @@ class SudokuGenerator:
                 ]
                 random.shuffle(region_cells)
 
-                for _ in range(region_blanks):
+                while region_blanks > 0 and region_cells:
                     row, col = region_cells.pop()
-                    self.board[row][col] = 0
+                    value = self.puzzle[row, col]
+                    self.puzzle[row, col] = 0
+                    if SudokuSolver.count_solutions(self.puzzle, limit=2) == 1:
+                        blanks.add((row, col))
+                        region_blanks -= 1
+                    else:
+                        self.puzzle[row, col] = value
+
+                carried_blanks = region_blanks
+
+        # Blanks the last regions could not take are tried anywhere on the board.
+        if carried_blanks:
+            clues = [divmod(cell, self.grid_size) for cell in range(self.grid_size * self.grid_size)]
+            clues = [cell for cell in clues if cell not in blanks]
+            random.shuffle(clues)
+            while carried_blanks > 0 and clues:
+                row, col = clues.pop()
+                value = self.puzzle[row, col]
+                self.puzzle[row, col] = 0
+                if SudokuSolver.count_solutions(self.puzzle, limit=2) == 1:
                     blanks.add((row, col))
+                    carried_blanks -= 1
+                else:
+                    self.puzzle[row, col] = value
 
         self.blank_positions = list(blanks)
 
@@ -103,4 +262,17 @@ class SudokuGenerator:
         """
         Print the Sudoku board in a readable format.
         """
-        print_board(self.board)
\ No newline at end of file
+        print_board(self.board)
+
+
+def _band_bounds(difficulty):
+    """
+    Get the ratings a difficulty band covers.
+    :return: Tuple (low, high): the band holds ratings above low and up to high.
+    """
+    low = 0.0
+    for name, high in DIFFICULTY_BANDS:
+        if name == difficulty:
+            return low, high
+        low = high
+    raise ValueError(f"Unknown difficulty {difficulty!r}.")
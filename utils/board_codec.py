@@ -0,0 +1,84 @@
+from core.logic.units import BOARD_SIZES
+
+BLANK_CHARACTERS = "0."
+# Digits above 9 are written as letters, so every cell is one character up to 25x25.
+DIGIT_SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+# Encoded length of each supported board size (16 for 4x4, 81 for 9x9, ...).
+ENCODED_LENGTHS = {size * size: size for size in BOARD_SIZES}
+
+
+def encode_board(board) -> str:
+    """
+    Encode a board as a string of one character per cell, row by row, with "0" for blanks.
+    A 9x9 board becomes the usual 81-digit string; digits 10-25 are written as "A"-"P".
+    :param board: 2D list representing the Sudoku board.
+    :return: String of ``size * size`` characters.
+    """
+    return "".join(DIGIT_SYMBOLS[value - 1] if value else "0" for row in board for value in row)
+
+
+def decode_board(text: str):
+    """
+    Decode a string of one character per cell into a board. Blanks may be "0" or ".".
+    The board size follows from the length: 16, 81, 256 or 625 characters.
+    :param text: Cell characters, row by row; letters may be upper or lower case.
+    :return: 2D list representing the Sudoku board.
+    :raises ValueError: If the length is not a supported board size or a character is not a valid cell.
+    """
+    size = ENCODED_LENGTHS.get(len(text))
+    if size is None:
+        raise ValueError(
+            f"Expected {', '.join(map(str, ENCODED_LENGTHS))} characters, got {len(text)}."
+        )
+
+    cells = []
+    for char in text.upper():
+        if char in BLANK_CHARACTERS:
+            cells.append(0)
+            continue
+        value = DIGIT_SYMBOLS.find(char) + 1
+        if not 0 < value <= size:
+            raise ValueError(f"Invalid character {char!r} in board string.")
+        cells.append(value)
+    return [cells[row * size:(row + 1) * size] for row in range(size)]
+
+
+def pack_board(text: str) -> bytes:
+    """
+    Pack a board string into bytes: the board size, then the cells read as one base
+    ``size + 1`` number. A 9x9 board takes 35 bytes instead of 81 characters.
+    :param text: Cell characters as written by encode_board; "." also counts as blank.
+    :return: Packed bytes; equal boards always pack to equal bytes.
+    :raises ValueError: If the length is not a supported board size or a character is not a valid cell.
+    """
+    size = ENCODED_LENGTHS.get(len(text))
+    if size is None:
+        raise ValueError(f"Expected {', '.join(map(str, ENCODED_LENGTHS))} characters, got {len(text)}.")
+    symbols = BLANK_CHARACTERS + DIGIT_SYMBOLS[:size]
+    if not set(text.upper()) <= set(symbols):
+        raise ValueError("Invalid character in board string.")
+    # Cell symbols are exactly the digits of base size + 1: 1-9, then A for 10 and on.
+    number = int(text.replace(".", "0"), size + 1)
+    return bytes([size]) + number.to_bytes(_packed_length(size), "big")
+
+
+def unpack_board(data: bytes) -> str:
+    """
+    Unpack bytes written by pack_board.
+    :param data: Packed board.
+    :return: Board string with "0" for blanks.
+    """
+    size = data[0]
+    number = int.from_bytes(data[1:], "big")
+    if size == 9:
+        return str(number).zfill(81)
+    symbols = []
+    for _ in range(size * size):
+        number, value = divmod(number, size + 1)
+        symbols.append(DIGIT_SYMBOLS[value - 1] if value else "0")
+    return "".join(reversed(symbols))
+
+
+def _packed_length(size):
+    """Bytes needed for the cells of a size x size board in base size + 1."""
+    return (((size + 1) ** (size * size) - 1).bit_length() + 7) // 8
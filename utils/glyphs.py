@@ -0,0 +1,27 @@
+from functools import lru_cache
+
+import pygame
+
+from config.settings import FONT_NAME, FONT_SIZE
+
+
+@lru_cache(maxsize=None)
+def get_font(name=FONT_NAME, size=FONT_SIZE):
+    """
+    Get a system font, loading it once. Fonts are only valid while pygame is initialized.
+    :param name: Font name.
+    :param size: Font size in points.
+    :return: pygame Font.
+    """
+    return pygame.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=256)
+def render_glyph(text, color, name=FONT_NAME, size=FONT_SIZE):
+    """
+    Render a short, frequently drawn text (a digit, a label) once and reuse the surface.
+    :param text: Text to render.
+    :param color: RGB color tuple.
+    :return: pygame Surface; do not draw on it.
+    """
+    return get_font(name, size).render(text, True, color)
@@ -1,7 +1,5 @@
-from tkinter import messagebox
-import tkinter as tk
-
 from config.settings import TK_TOPMOST_ATTRIBUTE
+from core.logic.units import board_layout
 
 
 def format_time(seconds: int) -> str:
@@ -20,6 +18,10 @@ def show_message_box(subject: str, content: str):
     :param subject: Title of the message box.
     :param content: Content of the message box.
     """
+    # Imported here so headless code that only needs the board helpers never loads Tk.
+    import tkinter as tk
+    from tkinter import messagebox
+
     root = tk.Tk()
     root.attributes(TK_TOPMOST_ATTRIBUTE, True)
     root.withdraw()  # Hide the root window
@@ -38,21 +40,12 @@ def is_safe_to_place(board, num, position):
     :return: True if safe, False otherwise.
     """
     row, col = position
+    layout = board_layout(len(board))
 
-    # Check row
-    if num in board[row]:
-        return False
-
-    # Check column
-    if num in [board[i][col] for i in range(len(board))]:
-        return False
-
-    # Check 3x3 box
-    box_start_row, box_start_col = 3 * (row // 3), 3 * (col // 3)
-    for i in range(box_start_row, box_start_row + 3):
-        for j in range(box_start_col, box_start_col + 3):
-            if board[i][j] == num:
-                return False
+    # Check the row, column and box through the cell's precomputed peers
+    for r, c in layout.peer_positions[row * layout.size + col]:
+        if board[r][c] == num:
+            return False
 
     return True
 
@@ -62,15 +55,18 @@ def print_board(board):
     Print the Sudoku board in a readable format.
     :param board: 2D list representing the Sudoku board.
     """
-    for row in range(len(board)):
-        if row % 3 == 0 and row != 0:
-            print("-" * 21)
+    size = len(board)
+    box_size = board_layout(size).box_size
+    width = len(str(size))
+    for row in range(size):
+        if row % box_size == 0 and row != 0:
+            print("-" * ((width + 1) * size + 2 * (box_size - 1) - 1))
 
-        for col in range(len(board[0])):
-            if col % 3 == 0 and col != 0:
+        for col in range(size):
+            if col % box_size == 0 and col != 0:
                 print(" | ", end="")
 
-            if col == 8:
-                print(board[row][col])
+            if col == size - 1:
+                print(f"{board[row][col]:>{width}}")
             else:
-                print(f"{board[row][col]} ", end="")
\ No newline at end of file
+                print(f"{board[row][col]:>{width}} ", end="")
\ No newline at end of file